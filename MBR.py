@@ -9,7 +9,7 @@ class MBR:
     Προσφέρει διάφορες χωρικές πράξεις (έλεγχος τομής, απόστασης κ.λπ.).
     """
 
-    def __init__(self, id, xmin, ymin, xmax, ymax):
+    def __init__(self, id, xmin, ymin, xmax, ymax, attrs=None):
         """
         Αρχικοποιεί ένα MBR.
 
@@ -18,12 +18,15 @@ class MBR:
         :param ymin: Ελάχιστη τιμή y.
         :param xmax: Μέγιστη τιμή x.
         :param ymax: Μέγιστη τιμή y.
+        :param attrs: (Προαιρετικά) tuple χαρακτηριστικών για πολυδιάστατα ερωτήματα
+                      (π.χ. Skyline), της μορφής (xmin, ymin, attr_1, ..., attr_k).
         """
         self.id = id
         self.xmin = xmin
         self.ymin = ymin
         self.xmax = xmax
         self.ymax = ymax
+        self.attrs = attrs
 
     def intersects(self, other):
         """
@@ -72,6 +75,28 @@ class MBR:
         dy = max(self.ymin - y, 0, y - self.ymax)
         return math.sqrt(dx**2 + dy**2)
 
+    def area(self):
+        """
+        Υπολογίζει το εμβαδόν του MBR.
+
+        :return: Εμβαδόν σε float.
+        """
+        return (self.xmax - self.xmin) * (self.ymax - self.ymin)
+
+    def intersection_area(self, other):
+        """
+        Υπολογίζει το εμβαδόν της τομής με ένα άλλο MBR, χωρίς να δημιουργεί
+        νέο αντικείμενο MBR (σε αντίθεση με την intersection_mbr).
+
+        :param other: Το άλλο MBR.
+        :return: Εμβαδόν της τομής (0 αν δεν τέμνονται ή αν η τομή είναι ακμή/σημείο).
+        """
+        dx = min(self.xmax, other.xmax) - max(self.xmin, other.xmin)
+        dy = min(self.ymax, other.ymax) - max(self.ymin, other.ymin)
+        if dx <= 0 or dy <= 0:
+            return 0.0
+        return dx * dy
+
     def intersection_mbr(self, other):
         """
         Υπολογίζει το MBR που αντιστοιχεί στην τομή με ένα άλλο MBR,
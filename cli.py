@@ -0,0 +1,268 @@
+# cli.py
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import sys
+import time
+
+from grid import Grid
+from kNN import kNN  # kNN.knn() / kNN.knn_batch() -> (results, stats_str)
+from linearScan import LinearScan  # ls.knn() -> (results, stats_str)
+from spatialJoinPBSM import SpatialJoinPBSM  # pbsmsj.execute_join() -> (results, stats_str)
+from naiveSpatialJoin import NaiveSpatialJoin  # naive_sj.execute_join() -> (results, stats_str)
+from skyline_query import SkylineQuery  # sq.sky_query() -> (results, sky_stats)
+from joinSink import CountSink
+from resultExport import ResultExport
+
+
+class BatchRunner:
+    """
+    Headless εκτέλεση ερωτημάτων (χωρίς Streamlit) από ένα αρχείο εργασιών JSON.
+
+    Το Grid φτιάχνεται και τα datasets φορτώνονται μία φορά· όλα τα ερωτήματα του αρχείου
+    τρέχουν πάνω στο ίδιο ("ζεστό") Grid. Το αρχείο έχει τη μορφή:
+
+        {
+          "grid": {"xL": 0, "yL": 0, "xU": 100, "yU": 100, "m": 10, "curve": "row"},
+          "datasets": {"A": "A.csv", "B": "B.csv", "default": "points.bin"},
+          "queries": [
+            {"type": "knn", "x": 10, "y": 10, "k": 3},
+            {"type": "knn", "points": [[10, 10], [50, 50]], "k": 3},
+            {"type": "linear_scan", "x": 10, "y": 10, "k": 3, "dataset": "default"},
+            {"type": "pbsm"},
+            {"type": "naive", "blocked": true, "memory_mb": 64, "count_only": true},
+            {"type": "skyline", "dims": 2, "method": "grid"}
+          ]
+        }
+
+    Τα αρχεία .bin φορτώνονται με Grid.load_binary, τα υπόλοιπα ως CSV. Οι σχετικές
+    διαδρομές λύνονται ως προς τον φάκελο του αρχείου εργασιών. Κάθε ερώτημα μπορεί να
+    έχει και "name", που χρησιμοποιείται στο όνομα του αρχείου αποτελεσμάτων.
+    """
+
+    SKYLINE_METHODS = ('grid', 'sorted', 'vectorised')
+
+    def __init__(self, spec, base_dir=".", output_dir=None, fmt='txt', quiet=False):
+        """
+        :param spec: Το περιεχόμενο του αρχείου εργασιών (dict).
+        :param base_dir: Φάκελος ως προς τον οποίο λύνονται οι σχετικές διαδρομές των datasets.
+        :param output_dir: (Προαιρετικά) φάκελος για τα αρχεία αποτελεσμάτων· αν λείπει,
+                           τυπώνεται μόνο η σύνοψη κάθε ερωτήματος.
+        :param fmt: Μορφή αρχείων αποτελεσμάτων (μία από τις ResultExport.FORMATS).
+        :param quiet: Αν True, δεν τυπώνονται τα μηνύματα των αλγορίθμων.
+        """
+        self.spec = spec
+        self.base_dir = base_dir
+        self.output_dir = output_dir
+        self.fmt = fmt
+        self.quiet = quiet
+        self.grid = None
+        self.paths = {}
+        self.linear_scans = {}
+
+    def resolve(self, path):
+        """
+        :return: Η διαδρομή path, σχετική ως προς το self.base_dir αν δεν είναι απόλυτη.
+        """
+        return path if os.path.isabs(path) else os.path.join(self.base_dir, path)
+
+    def quietly(self):
+        """
+        :return: Context manager που κρύβει την έξοδο των αλγορίθμων όταν self.quiet.
+        """
+        return contextlib.redirect_stdout(io.StringIO()) if self.quiet else contextlib.nullcontext()
+
+    def load(self):
+        """
+        Δημιουργεί το Grid και φορτώνει όλα τα datasets του αρχείου εργασιών.
+
+        :raises ValueError: Αν κάποιο dataset δεν φορτώθηκε.
+        """
+        settings = self.spec.get('grid', {})
+        self.grid = Grid(settings.get('xL', 0.0), settings.get('yL', 0.0),
+                         settings.get('xU', 100.0), settings.get('yU', 100.0),
+                         settings.get('m', 10), curve=settings.get('curve', 'row'))
+
+        with self.quietly():
+            for label, path in self.spec.get('datasets', {}).items():
+                self.paths[label] = self.resolve(path)
+                if path.endswith('.bin'):
+                    self.grid.load_binary(self.paths[label], dataset_label=label)
+                else:
+                    self.grid.load(self.paths[label], dataset_label=label)
+
+        missing = [label for label in self.paths if label not in self.grid.datasets]
+        if missing:
+            raise ValueError(f"Δεν φορτώθηκαν τα datasets: {', '.join(missing)}")
+
+    def require(self, *labels):
+        """
+        :param labels: Οι ετικέτες των datasets που χρειάζεται ένα ερώτημα.
+        :raises ValueError: Αν κάποια δεν είναι φορτωμένη στο Grid.
+        """
+        missing = [label for label in labels if label not in self.grid.datasets]
+        if missing:
+            raise ValueError(f"Λείπουν τα datasets: {', '.join(missing)} "
+                             f"(φορτωμένα: {', '.join(self.grid.datasets) or '-'}).")
+
+    def run_query(self, query):
+        """
+        Εκτελεί ένα ερώτημα του αρχείου εργασιών πάνω στο φορτωμένο Grid.
+
+        :param query: Λεξικό με "type" και τις παραμέτρους του ερωτήματος.
+        :return: (algorithm_name, results, stats_str). Με "count_only" στα joins,
+                 results είναι το πλήθος των ζευγών.
+        :raises ValueError: Για άγνωστο τύπο ή μέθοδο, για dataset που δεν φορτώθηκε και
+                            για Skyline με περισσότερες διαστάσεις από τις στήλες του dataset.
+        """
+        kind = query.get('type')
+
+        if kind == 'knn':
+            self.require('default')
+            if 'points' in query:
+                queries = [(float(x), float(y)) for x, y in query['points']]
+                return ('k-NN Batch',) + kNN.knn_batch(self.grid, queries, query.get('k', 1))
+            return ('k-NN',) + kNN.knn(self.grid, query['x'], query['y'], query.get('k', 1))
+
+        if kind == 'linear_scan':
+            label = query.get('dataset', 'default')
+            self.require(label)
+            path = self.paths[label]
+            if path.endswith('.bin'):
+                raise ValueError("Το Linear Scan διαβάζει μόνο CSV datasets.")
+            if label not in self.linear_scans:
+                self.linear_scans[label] = LinearScan(path)
+            return ('Linear Scan',) + self.linear_scans[label].knn(query['x'], query['y'], query.get('k', 1))
+
+        if kind in ('pbsm', 'naive'):
+            self.require('A', 'B')
+            if kind == 'pbsm':
+                name, execute_join = 'PBSM', SpatialJoinPBSM(self.grid).execute_join
+            else:
+                name = 'Naive'
+                naive_sj = NaiveSpatialJoin(self.grid.get_dataset('A'), self.grid.get_dataset('B'))
+                if query.get('blocked', True):
+                    execute_join = functools.partial(naive_sj.execute_join_blocked, query.get('memory_mb', 64))
+                else:
+                    execute_join = naive_sj.execute_join
+            if query.get('count_only'):
+                return (name,) + execute_join(sink=CountSink())
+            return (name,) + execute_join()
+
+        if kind == 'skyline':
+            method = query.get('method', 'grid')
+            self.require('default')
+            # Η SkylineQuery πετάει ValueError αν οι dims ξεπερνούν τις στήλες του dataset
+            sq = SkylineQuery(self.grid, query.get('dims', 2))
+            if method == 'grid':
+                return ('Skyline',) + sq.sky_query()
+            if method == 'sorted':
+                return ('Skyline',) + sq.sky_query_sorted()
+            if method == 'vectorised':
+                return ('Skyline',) + sq.sky_query_vectorised()
+            raise ValueError(f"Άγνωστη μέθοδος Skyline '{method}'. Επιτρεπτές: {self.SKYLINE_METHODS}")
+
+        raise ValueError(f"Άγνωστος τύπος ερωτήματος '{kind}'.")
+
+    def run(self):
+        """
+        Φορτώνει τα datasets και εκτελεί όλα τα ερωτήματα με τη σειρά. Ένα ερώτημα που
+        αποτυγχάνει καταγράφεται και η εκτέλεση συνεχίζει με το επόμενο.
+
+        :return: Λίστα από λεξικά σύνοψης (index, type, count, seconds, output, error).
+        """
+        start_time = time.perf_counter()
+        self.load()
+        print(f"[cli] Grid m={self.grid.m}, datasets: "
+              + ", ".join(f"{label}={len(data)}" for label, data in self.grid.datasets.items())
+              + f" ({time.perf_counter() - start_time:.4f} δευτ.)")
+
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+
+        summary = []
+        for index, query in enumerate(self.spec.get('queries', []), start=1):
+            entry = {'index': index, 'type': query.get('type'), 'count': None,
+                     'seconds': 0.0, 'output': None, 'error': None}
+            query_start = time.perf_counter()
+            try:
+                with self.quietly():
+                    name, results, stats = self.run_query(query)
+                entry['seconds'] = time.perf_counter() - query_start
+                entry['count'] = results if isinstance(results, int) else len(results)
+                if self.output_dir and not isinstance(results, int):
+                    exporter = ResultExport(name, self.fmt)
+                    label = query.get('name', query.get('type'))
+                    entry['output'] = os.path.join(self.output_dir, f"{index:03d}_{label}.{self.fmt}")
+                    exporter.write(results, entry['output'], stats=stats)
+            except Exception as e:
+                entry['seconds'] = time.perf_counter() - query_start
+                entry['error'] = str(e)
+                print(f"[cli] Σφάλμα στο ερώτημα {index} ({entry['type']}): {e}", file=sys.stderr)
+                summary.append(entry)
+                continue
+
+            print(f"[cli] {index}. {entry['type']}: {entry['count']} αποτελέσματα "
+                  f"σε {entry['seconds']:.4f} δευτ."
+                  + (f" -> {entry['output']}" if entry['output'] else ""))
+            summary.append(entry)
+
+        print(f"[cli] Ολοκληρώθηκαν {len(summary)} ερωτήματα σε "
+              f"{time.perf_counter() - start_time:.4f} δευτ.")
+        return summary
+
+
+def main(argv=None):
+    """
+    Σημείο εισόδου της γραμμής εντολών:
+
+        python cli.py jobs.json [--output-dir out] [--format csv.gz] [--quiet] [--summary s.json]
+
+    :param argv: Ορίσματα (προεπιλογή: sys.argv[1:]).
+    :return: Κωδικός εξόδου: 0 αν όλα πέτυχαν, 1 αν απέτυχε κάποιο ερώτημα,
+             2 αν δεν διαβάστηκε το αρχείο εργασιών ή δεν φορτώθηκαν τα datasets.
+    """
+    parser = argparse.ArgumentParser(
+        description="Headless εκτέλεση k-NN, Linear Scan, PBSM, Naive Join και Skyline "
+                    "από αρχείο εργασιών JSON, πάνω σε ένα Grid που φορτώνεται μία φορά.")
+    parser.add_argument("jobs", help="Αρχείο εργασιών JSON ('-' για stdin).")
+    parser.add_argument("--output-dir", help="Φάκελος για τα αρχεία αποτελεσμάτων.")
+    parser.add_argument("--format", choices=ResultExport.FORMATS, default='txt',
+                        help="Μορφή αρχείων αποτελεσμάτων (προεπιλογή: txt).")
+    parser.add_argument("--quiet", action="store_true",
+                        help="Χωρίς τα μηνύματα των αλγορίθμων· μόνο η σύνοψη.")
+    parser.add_argument("--summary", help="Αρχείο JSON για τη σύνοψη των ερωτημάτων.")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.jobs == '-':
+            spec, base_dir = json.load(sys.stdin), "."
+        else:
+            with open(args.jobs, encoding='utf-8') as file:
+                spec = json.load(file)
+            base_dir = os.path.dirname(os.path.abspath(args.jobs))
+    except (OSError, ValueError) as e:
+        print(f"[cli] Σφάλμα ανάγνωσης του αρχείου εργασιών '{args.jobs}': {e}", file=sys.stderr)
+        return 2
+
+    runner = BatchRunner(spec, base_dir=base_dir, output_dir=args.output_dir,
+                         fmt=args.format, quiet=args.quiet)
+    try:
+        summary = runner.run()
+    except ValueError as e:
+        print(f"[cli] {e}", file=sys.stderr)
+        return 2
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as file:
+            json.dump(summary, file, ensure_ascii=False, indent=2)
+
+    return 1 if any(entry['error'] for entry in summary) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
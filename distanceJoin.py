@@ -0,0 +1,120 @@
+# distanceJoin.py
+
+import time
+from utils import Utils
+from joinSink import ListSink
+
+class DistanceJoin:
+    """
+    Υλοποιεί Distance Join (ε-join) πάνω σε ένα Grid: βρίσκει όλα τα ζεύγη (a, b),
+    a ∈ A και b ∈ B, των οποίων η ελάχιστη απόσταση είναι το πολύ ε.
+
+    Δεν "φουσκώνουμε" τα ορθογώνια κατά ε ούτε τα αναθέτουμε ξανά στο Grid.
+    Κάθε a εξετάζεται μία φορά (στο "αρχικό" του κελί, αυτό που περιέχει το (xmin, ymin)),
+    και συγκρίνεται μόνο με τα B των κελιών που απέχουν το πολύ ε από αυτό.
+    Για τον έλεγχο ζεύγους χρησιμοποιείται η Utils.mindist_mbr_squared.
+    """
+
+    def __init__(self, grid, epsilon):
+        """
+        Αρχικοποιεί το Distance Join πάνω σε ένα Grid με φορτωμένα τα σύνολα 'A' και 'B'.
+
+        :param grid: Ένα αντικείμενο Grid με τα datasets 'A' και 'B'.
+        :param epsilon: Η μέγιστη απόσταση ε (>= 0).
+        """
+        self.grid = grid
+        self.epsilon = epsilon
+        self.results = []
+        self.cells_examined = 0
+        self.pairs_checked = 0
+
+    def iter_join(self):
+        """
+        Generator που επιστρέφει ένα-ένα τα ζεύγη (a, b) με απόσταση <= ε.
+
+        Βήματα για κάθε a (στο αρχικό του κελί):
+          1. Υπολογίζουμε το εύρος κελιών που καλύπτει το a διευρυμένο κατά ε.
+          2. Παραλείπουμε τα κελιά του εύρους που απέχουν από το a περισσότερο από ε
+             (π.χ. τις γωνίες του εύρους).
+          3. Για κάθε b στα υπόλοιπα κελιά, ελέγχουμε αν mindist(a, b) <= ε.
+          4. Επειδή το b μπορεί να ανήκει σε πολλά κελιά, κρατάμε το ζεύγος μόνο στο
+             κελί που περιέχει το σημείο του b που είναι πλησιέστερο στο a (reference point).
+
+        :return: Generator από tuples (a, b).
+        """
+        self.cells_examined = 0
+        self.pairs_checked = 0
+
+        grid = self.grid
+        eps = self.epsilon
+        eps_sq = eps * eps
+
+        for i, j, cell in grid.iter_cells():
+            for a in cell.objects.get('A', []):
+                # Κάθε a εξετάζεται μόνο στο αρχικό του κελί
+                if grid.cell_index(a.xmin, a.ymin) != (i, j):
+                    continue
+
+                i_min, i_max, j_min, j_max = grid.cell_range(
+                    a.xmin - eps, a.ymin - eps, a.xmax + eps, a.ymax + eps
+                )
+                for p in range(i_min, i_max + 1):
+                    for q in range(j_min, j_max + 1):
+                        cell_B = grid.cells[p][q]
+                        objects_B = cell_B.objects.get('B', [])
+                        if not objects_B or Utils.mindist_mbr_squared(a, cell_B.mbr) > eps_sq:
+                            continue
+
+                        self.cells_examined += 1
+                        for b in objects_B:
+                            self.pairs_checked += 1
+                            if Utils.mindist_mbr_squared(a, b) > eps_sq:
+                                continue
+
+                            # Reference point: το σημείο του b πλησιέστερο στο a
+                            ref_x = min(max(a.xmin, b.xmin), b.xmax)
+                            ref_y = min(max(a.ymin, b.ymin), b.ymax)
+                            if grid.cell_index(ref_x, ref_y) == (p, q):
+                                yield (a, b)
+
+    def execute_join(self, sink=None):
+        """
+        Εκτελεί το Distance Join και στέλνει τα ζεύγη στο sink.
+
+        :param sink: (Προαιρετικά) ένα JoinSink (π.χ. CSVPairSink, CountSink, AggregateSink).
+                     Αν δεν δοθεί, τα ζεύγη κρατούνται σε λίστα (self.results).
+        :return: Ένα tuple (results, stats_str), όπου results είναι λίστα ζευγών (a, b)
+                 ή το sink.result(), και stats_str κείμενο με στατιστικά.
+        """
+        if 'A' not in self.grid.datasets or 'B' not in self.grid.datasets:
+            msg = "[DistanceJoin] Τα σύνολα 'A' και 'B' πρέπει να φορτωθούν πριν εκτελεστεί το Distance Join."
+            print(msg)
+            if sink is not None:
+                sink.close()
+                return sink.result(), msg
+            return [], msg
+
+        if sink is None:
+            self.results = []
+            sink = ListSink(self.results)
+
+        start_time = time.time()
+
+        for a, b in self.iter_join():
+            sink.emit(a, b)
+        sink.close()
+
+        elapsed = time.time() - start_time
+
+        stats_str = (
+            "[DistanceJoin] Στατιστικά:\n"
+            f" • Απόσταση ε: {self.epsilon}\n"
+            f" • Συνολικά κελιά στο grid: {self.grid.m * self.grid.m}\n"
+            f" • Ζεύγη (αντικείμενο A, κελί) εξετάστηκαν: {self.cells_examined}\n"
+            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {self.pairs_checked}\n"
+            f" • Ζεύγη με απόσταση <= ε: {sink.count}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return sink.result(), stats_str
@@ -0,0 +1,197 @@
+# dominanceQuery.py
+
+import heapq
+import time
+
+class DominanceQuery:
+    """
+    Ερωτήματα κατάταξης με βάση την κυριαρχία (2D, (xmin, ymin)) πάνω σε ένα Grid:
+
+      - k-skyband: τα αντικείμενα που κυριαρχούνται από λιγότερα από k άλλα
+        (για k = 1 είναι το Skyline).
+      - top-k dominating: τα k αντικείμενα που κυριαρχούν τα περισσότερα άλλα.
+
+    Κάθε αντικείμενο μετράει μία φορά, στο αρχικό του κελί (αυτό που περιέχει το (xmin, ymin)).
+    Επειδή ο δείκτης κελιού είναι αύξουσα συνάρτηση της συντεταγμένης, κάθε αντικείμενο
+    ενός κελιού (i', j') με i' < i και j' < j κυριαρχεί αυστηρά κάθε αντικείμενο του (i, j).
+    Έτσι, με prefix / suffix αθροίσματα των πληθών ανά κελί:
+      - τα κελιά "κάτω-αριστερά" μετρούν ως κυρίαρχοι χωρίς καμία σύγκριση,
+      - τα κελιά "πάνω-δεξιά" μετρούν ως κυριαρχούμενα χωρίς καμία σύγκριση,
+    και συγκρίνουμε ένα-ένα μόνο με τα αντικείμενα της ίδιας γραμμής / στήλης κελιών.
+    Αυτό ισχύει και για αντικείμενα εκτός ορίων (που ανατίθενται στα ακριανά κελιά).
+    """
+
+    def __init__(self, grid):
+        """
+        :param grid: Ένα αντικείμενο Grid με φορτωμένο το σύνολο 'default'.
+        """
+        self.grid = grid
+        self.comparisons = 0
+        self.pruned_cells = 0
+
+    @staticmethod
+    def dominates(p, q):
+        """
+        :return: True αν το p κυριαρχεί το q στις 2 διαστάσεις (xmin, ymin).
+        """
+        return p.xmin <= q.xmin and p.ymin <= q.ymin and (p.xmin < q.xmin or p.ymin < q.ymin)
+
+    def home_cells(self):
+        """
+        Ομαδοποιεί τα αντικείμενα του 'default' ανά αρχικό κελί.
+
+        :return: Tuple (homes, counts): homes[i][j] λίστα αντικειμένων, counts[i][j] το πλήθος τους.
+        """
+        m = self.grid.m
+        homes = [[[] for _ in range(m)] for _ in range(m)]
+        for obj in self.grid.get_dataset('default'):
+            i, j = self.grid.cell_index(obj.xmin, obj.ymin)
+            homes[i][j].append(obj)
+        counts = [[len(homes[i][j]) for j in range(m)] for i in range(m)]
+        return homes, counts
+
+    def count_dominators(self, p, i, j, homes, lower_left, limit):
+        """
+        Μετρά πόσα αντικείμενα κυριαρχούν το p (του κελιού (i, j)), σταματώντας στο limit.
+
+        :param lower_left: Πλήθος αντικειμένων στα κελιά (i' < i, j' < j).
+        :return: Το πλήθος κυρίαρχων (ή limit, αν το ξεπεράσει).
+        """
+        count = lower_left
+        strip = [(i2, j) for i2 in range(i + 1)] + [(i, j2) for j2 in range(j)]
+        for i2, j2 in strip:
+            for q in homes[i2][j2]:
+                self.comparisons += 1
+                if self.dominates(q, p):
+                    count += 1
+                    if count >= limit:
+                        return count
+        return count
+
+    def count_dominated(self, p, i, j, homes, upper_right):
+        """
+        Μετρά πόσα αντικείμενα κυριαρχεί το p (του κελιού (i, j)).
+
+        :param upper_right: Πλήθος αντικειμένων στα κελιά (i' > i, j' > j).
+        :return: Το πλήθος των κυριαρχούμενων αντικειμένων.
+        """
+        m = self.grid.m
+        count = upper_right
+        strip = [(i2, j) for i2 in range(i, m)] + [(i, j2) for j2 in range(j + 1, m)]
+        for i2, j2 in strip:
+            for q in homes[i2][j2]:
+                self.comparisons += 1
+                if self.dominates(p, q):
+                    count += 1
+        return count
+
+    def k_skyband(self, k):
+        """
+        Βρίσκει το k-skyband: όλα τα αντικείμενα που κυριαρχούνται από λιγότερα από k άλλα.
+        Ένα κελί παραλείπεται ολόκληρο αν τα κελιά αυστηρά κάτω-αριστερά του έχουν
+        ήδη τουλάχιστον k αντικείμενα.
+
+        :param k: Το όριο (k >= 1).
+        :return: (results, stats_str), όπου results λίστα (πλήθος κυρίαρχων, MBR)
+                 ταξινομημένη κατά αύξον πλήθος κυρίαρχων.
+        """
+        start_time = time.perf_counter()
+        self.comparisons = 0
+        self.pruned_cells = 0
+
+        m = self.grid.m
+        homes, counts = self.home_cells()
+
+        # prefix[i][j] = πλήθος αντικειμένων στα κελιά (i' < i, j' < j)
+        prefix = [[0] * (m + 1) for _ in range(m + 1)]
+        for i in range(m):
+            for j in range(m):
+                prefix[i + 1][j + 1] = counts[i][j] + prefix[i][j + 1] + prefix[i + 1][j] - prefix[i][j]
+
+        results = []
+        for i, j, _ in self.grid.iter_cells():
+            if not homes[i][j]:
+                continue
+            lower_left = prefix[i][j]
+            if lower_left >= k:
+                self.pruned_cells += 1
+                continue
+            for p in homes[i][j]:
+                dominators = self.count_dominators(p, i, j, homes, lower_left, k)
+                if dominators < k:
+                    results.append((dominators, p))
+
+        results.sort(key=lambda r: r[0])
+        elapsed_time = time.perf_counter() - start_time
+
+        stats_str = (
+            "[DominanceQuery k-skyband] Στατιστικά:\n"
+            f" • k: {k}\n"
+            f" • Συνολικά αντικείμενα: {len(self.grid.get_dataset('default'))}\n"
+            f" • Κελιά που παραλείφθηκαν (>= k κυρίαρχοι): {self.pruned_cells}\n"
+            f" • Συγκρίσεις κυριαρχίας: {self.comparisons}\n"
+            f" • Αντικείμενα στο k-skyband: {len(results)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+
+        print(stats_str)
+        return results, stats_str
+
+    def top_k_dominating(self, k):
+        """
+        Βρίσκει τα k αντικείμενα που κυριαρχούν τα περισσότερα άλλα. Για κάθε κελί,
+        το πλήθος των αντικειμένων στα κελιά (i' >= i, j' >= j) είναι άνω φράγμα του
+        σκορ των αντικειμένων του. Εξετάζουμε τα κελιά κατά φθίνον άνω φράγμα και
+        σταματάμε μόλις το k-οστό καλύτερο σκορ φτάσει το φράγμα του επόμενου κελιού.
+
+        :param k: Πλήθος αποτελεσμάτων.
+        :return: (results, stats_str), όπου results λίστα (σκορ, MBR) κατά φθίνον σκορ.
+        """
+        start_time = time.perf_counter()
+        self.comparisons = 0
+        self.pruned_cells = 0
+
+        m = self.grid.m
+        homes, counts = self.home_cells()
+
+        # suffix[i][j] = πλήθος αντικειμένων στα κελιά (i' >= i, j' >= j)
+        suffix = [[0] * (m + 1) for _ in range(m + 1)]
+        for i in range(m - 1, -1, -1):
+            for j in range(m - 1, -1, -1):
+                suffix[i][j] = counts[i][j] + suffix[i + 1][j] + suffix[i][j + 1] - suffix[i + 1][j + 1]
+
+        # Κελιά κατά φθίνον άνω φράγμα (χωρίς το ίδιο το αντικείμενο)
+        cells = sorted(
+            ((suffix[i][j] - 1, i, j) for i, j, _ in self.grid.iter_cells() if homes[i][j]),
+            reverse=True
+        )
+
+        best = []  # min-heap (σκορ, σειρά, MBR) με τα k καλύτερα
+        order = 0
+        for position, (bound, i, j) in enumerate(cells):
+            if len(best) >= k and best[0][0] >= bound:
+                self.pruned_cells = len(cells) - position
+                break
+            upper_right = suffix[i + 1][j + 1]
+            for p in homes[i][j]:
+                score = self.count_dominated(p, i, j, homes, upper_right)
+                order += 1
+                if len(best) < k:
+                    heapq.heappush(best, (score, -order, p))
+                elif score > best[0][0]:
+                    heapq.heappushpop(best, (score, -order, p))
+
+        results = [(score, p) for score, _, p in sorted(best, reverse=True)]
+        elapsed_time = time.perf_counter() - start_time
+
+        stats_str = (
+            "[DominanceQuery top-k dominating] Στατιστικά:\n"
+            f" • k: {k}\n"
+            f" • Συνολικά αντικείμενα: {len(self.grid.get_dataset('default'))}\n"
+            f" • Κελιά που παραλείφθηκαν (φράγμα <= k-οστό σκορ): {self.pruned_cells}\n"
+            f" • Συγκρίσεις κυριαρχίας: {self.comparisons}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+
+        print(stats_str)
+        return results, stats_str
@@ -1,7 +1,11 @@
 # grid.py
 
+import sys
+from array import array
 from MBR import MBR
 from cell import Cell
+from spaceFillingCurve import SpaceFillingCurve
+from utils import Utils
 
 class Grid:
     """
@@ -10,7 +14,10 @@ class Grid:
     μέσα στην περιοχή [xL, xU] x [yL, yU].
     """
 
-    def __init__(self, xL, yL, xU, yU, m):
+    # Ανάλυση (bits ανά άξονα) της καμπύλης με την οποία ταξινομούνται τα αντικείμενα
+    OBJECT_CURVE_BITS = 16
+
+    def __init__(self, xL, yL, xU, yU, m, curve='row'):
         """
         Αρχικοποιεί το Grid, δημιουργώντας m x m κελιά για την περιοχή
         [xL, xU] x [yL, yU].
@@ -20,6 +27,9 @@ class Grid:
         :param xU: Μέγιστο x-όριο όλου του πλέγματος.
         :param yU: Μέγιστο y-όριο όλου του πλέγματος.
         :param m:  Πλήθος κελιών ανά άξονα. Το τελικό Grid θα έχει m x m κελιά.
+        :param curve: Διάταξη κελιών και αντικειμένων: 'row' (αρχική), 'z' (Z-order)
+                      ή 'hilbert'. Με 'z' / 'hilbert' τα κελιά διατρέχονται (iter_cells)
+                      και τα αντικείμενα αποθηκεύονται με τη σειρά της καμπύλης.
         """
         self.xL = xL
         self.yL = yL
@@ -27,57 +37,102 @@ class Grid:
         self.yU = yU
         self.m = m
 
-        # Δημιουργία 2D λίστας κελιών (m x m).
-        self.cells = [
-            [
-                Cell(
-                    xL + i * (xU - xL) / m,
-                    yL + j * (yU - yL) / m,
-                    xL + (i + 1) * (xU - xL) / m,
-                    yL + (j + 1) * (yU - yL) / m
-                )
-                for j in range(m)
-            ]
-            for i in range(m)
-        ]
+        # Σειρά διάσχισης των κελιών πάνω στην καμπύλη πλήρωσης χώρου
+        self.curve = curve
+        curve_key = SpaceFillingCurve.key_function(curve)
+        bits = SpaceFillingCurve.bits_for(m)
+        self.cell_order = sorted(
+            ((i, j) for i in range(m) for j in range(m)),
+            key=lambda ij: curve_key(ij[0], ij[1], bits)
+        )
+        # Θέση κάθε κελιού (i, j) πάνω στην καμπύλη, για διάσχιση υποσυνόλων κελιών
+        # (π.χ. γειτονιά του k-NN) με την ίδια σειρά
+        self.cell_rank = [[0] * m for _ in range(m)]
+        for rank, (i, j) in enumerate(self.cell_order):
+            self.cell_rank[i][j] = rank
+
+        # Δημιουργία 2D λίστας κελιών (m x m). Τα κελιά δημιουργούνται με τη σειρά
+        # της καμπύλης, ώστε διαδοχικά κελιά της iter_cells να είναι και διαδοχικά στη μνήμη.
+        self.cells = [[None] * m for _ in range(m)]
+        for i, j in self.cell_order:
+            self.cells[i][j] = Cell(
+                xL + i * (xU - xL) / m,
+                yL + j * (yU - yL) / m,
+                xL + (i + 1) * (xU - xL) / m,
+                yL + (j + 1) * (yU - yL) / m
+            )
 
         # Λεξικό για την αποθήκευση των datasets (π.χ. {'A': [...], 'B': [...]}).
         self.datasets = {}
 
+        # Ονόματα επιπλέον αριθμητικών στηλών ανά dataset και (lazy) πίνακες χαρακτηριστικών
+        self.attribute_names = {}
+        self.attributes = {}
+
     def load(self, filename, dataset_label='default'):
         """
-        Φορτώνει ένα dataset από ένα CSV αρχείο και το αποθηκεύει στο λεξικό
+        Φορτώνει ένα dataset από ένα CSV και το αποθηκεύει στο λεξικό
         self.datasets[dataset_label]. Στη συνέχεια καλεί τη μέθοδο assign_to_cells
         για να τοποθετήσει τα MBRs στα αντίστοιχα κελιά του Grid.
 
-        :param filename: Όνομα του αρχείου CSV (με γραμμές: ID,xmin,ymin,xmax,ymax).
+        Αν η επικεφαλίδα έχει επιπλέον αριθμητικές στήλες μετά τις ID,xmin,ymin,xmax,ymax
+        (π.χ. price,rating), κάθε MBR παίρνει attrs = (xmin, ymin, price, rating, ...)
+        για πολυδιάστατα ερωτήματα, και τα ονόματα των στηλών κρατούνται στο
+        self.attribute_names[dataset_label].
+
+        :param filename: Όνομα του αρχείου CSV (με γραμμές: ID,xmin,ymin,xmax,ymax[,attr_1,...]),
+                         ή bytes / file-like με το ίδιο περιεχόμενο (βλ. Utils.read_mbrs).
         :param dataset_label: Ετικέτα (string) για το συγκεκριμένο dataset.
         """
         if dataset_label in self.datasets:
             print(f"Το σύνολο '{dataset_label}' υπάρχει ήδη. Θα αντικατασταθεί.")
 
-        data = []
+        name = Utils.source_name(filename)
         try:
-            with open(filename, 'r') as file:
-                header = next(file, None)  # Παράκαμψη επικεφαλίδας, αν υπάρχει
-                for line in file:
-                    parts = line.strip().split(',')
-                    if len(parts) != 5:
-                        continue  # Αγνόηση μη έγκυρων γραμμών
-
-                    id_str, xmin_str, ymin_str, xmax_str, ymax_str = parts
-                    try:
-                        xmin = float(xmin_str)
-                        ymin = float(ymin_str)
-                        xmax = float(xmax_str)
-                        ymax = float(ymax_str)
+            data, extra_names = Utils.read_mbrs(filename)
+        except FileNotFoundError:
+            print(f"Το αρχείο '{name}' δεν βρέθηκε.")
+            return
+        except Exception as e:
+            print(f"Σφάλμα κατά τη φόρτωση του αρχείου '{name}': {e}")
+            return
+
+        self.add_dataset(data, dataset_label)
+        self.attribute_names[dataset_label] = ['xmin', 'ymin'] + extra_names
+        print(f"Φορτώθηκε το dataset '{dataset_label}' από το αρχείο '{name}' με {len(data)} ορθογώνια.")
+
+    def load_binary(self, filename, dataset_label='default', id_prefix=None, chunk_size=1_000_000):
+        """
+        Φορτώνει ένα dataset από δυαδικό αρχείο της PointGeneratorUnif.generate_rectangles_chunked
+        (4 little-endian float64 ανά ορθογώνιο: xmin, ymin, xmax, ymax). Τα IDs
+        προκύπτουν από τη σειρά: id_prefix + αύξων αριθμός (από 1), όπως στο CSV.
+
+        :param filename: Όνομα του δυαδικού αρχείου.
+        :param dataset_label: Ετικέτα (string) για το συγκεκριμένο dataset.
+        :param id_prefix: Πρόθεμα των IDs (προεπιλογή: το dataset_label).
+        :param chunk_size: Πλήθος ορθογωνίων που διαβάζονται ανά κομμάτι.
+        """
+        if dataset_label in self.datasets:
+            print(f"Το σύνολο '{dataset_label}' υπάρχει ήδη. Θα αντικατασταθεί.")
 
+        prefix = dataset_label if id_prefix is None else id_prefix
+        data = []
+        row = 0
+        try:
+            with open(filename, 'rb') as file:
+                while True:
+                    values = array('d')
+                    values.frombytes(file.read(32 * chunk_size))
+                    if not values:
+                        break
+                    if sys.byteorder == 'big':
+                        values.byteswap()
+                    for k in range(0, len(values) - 3, 4):
+                        row += 1
+                        xmin, ymin, xmax, ymax = values[k:k + 4]
                         if xmin > xmax or ymin > ymax:
                             continue
-                        data.append(MBR(id_str, xmin, ymin, xmax, ymax))
-                    except ValueError:
-                        # Αγνοούμε γραμμή αν δεν μετατρέπεται σε float
-                        continue
+                        data.append(MBR(f"{prefix}{row}", xmin, ymin, xmax, ymax))
         except FileNotFoundError:
             print(f"Το αρχείο '{filename}' δεν βρέθηκε.")
             return
@@ -85,9 +140,32 @@ class Grid:
             print(f"Σφάλμα κατά τη φόρτωση του αρχείου '{filename}': {e}")
             return
 
+        self.add_dataset(data, dataset_label)
+        self.attribute_names[dataset_label] = ['xmin', 'ymin']
+        print(f"Φορτώθηκε το dataset '{dataset_label}' από το αρχείο '{filename}' με {len(data)} ορθογώνια.")
+
+    def add_dataset(self, data, dataset_label='default'):
+        """
+        Καταχωρεί μια ήδη φορτωμένη λίστα MBRs ως dataset και την αναθέτει στα κελιά.
+
+        Αν το Grid έχει καμπύλη 'z' ή 'hilbert', τα αντικείμενα ταξινομούνται κατά το key
+        του κέντρου τους, ώστε το dataset και οι λίστες κάθε κελιού να ακολουθούν την καμπύλη.
+
+        Αν υπάρχει ήδη dataset με την ίδια ετικέτα, αντικαθίσταται: τα παλιά αντικείμενα
+        αφαιρούνται πρώτα από τα κελιά, ώστε να μη μένουν διπλότυπα.
+
+        :param data: Λίστα με MBR αντικείμενα.
+        :param dataset_label: Ετικέτα (string) για το συγκεκριμένο dataset.
+        """
+        if dataset_label in self.datasets:
+            for _, _, cell in self.iter_cells():
+                cell.objects.pop(dataset_label, None)
+        if self.curve != 'row':
+            data = sorted(data, key=self.curve_key)
         self.datasets[dataset_label] = data
+        self.attributes.pop(dataset_label, None)
+        self.attribute_names.pop(dataset_label, None)
         self.assign_to_cells(data, dataset_label)
-        print(f"Φορτώθηκε το dataset '{dataset_label}' από το αρχείο '{filename}' με {len(data)} ορθογώνια.")
 
     def assign_to_cells(self, data, dataset_label):
         """
@@ -100,19 +178,8 @@ class Grid:
         if self.m == 0:
             return  # Σε περίπτωση που m=0, δεν δημιουργούνται κελιά
 
-        cell_size_x = (self.xU - self.xL) / self.m
-        cell_size_y = (self.yU - self.yL) / self.m
-
         for mbr in data:
-            i_min = int((mbr.xmin - self.xL) // cell_size_x)
-            i_max = int((mbr.xmax - self.xL) // cell_size_x)
-            j_min = int((mbr.ymin - self.yL) // cell_size_y)
-            j_max = int((mbr.ymax - self.yL) // cell_size_y)
-
-            i_min = max(0, min(i_min, self.m - 1))
-            i_max = max(0, min(i_max, self.m - 1))
-            j_min = max(0, min(j_min, self.m - 1))
-            j_max = max(0, min(j_max, self.m - 1))
+            i_min, i_max, j_min, j_max = self.cell_range(mbr.xmin, mbr.ymin, mbr.xmax, mbr.ymax)
 
             for i in range(i_min, i_max + 1):
                 for j in range(j_min, j_max + 1):
@@ -120,6 +187,199 @@ class Grid:
                     if cell.mbr.intersects(mbr):
                         cell.add_object(mbr, dataset_label)
 
+    def insert(self, mbr, dataset_label='default'):
+        """
+        Προσθέτει ένα νέο MBR σε ένα dataset και στα κελιά που τέμνει.
+        (Με καμπύλη 'z' / 'hilbert', το νέο αντικείμενο μπαίνει στο τέλος των λιστών.)
+
+        :param mbr: Το νέο αντικείμενο MBR.
+        :param dataset_label: Ετικέτα (string) του dataset.
+        """
+        self.datasets.setdefault(dataset_label, []).append(mbr)
+        self.attributes.pop(dataset_label, None)
+        self.assign_to_cells([mbr], dataset_label)
+
+    def delete(self, mbr, dataset_label='default'):
+        """
+        Αφαιρεί ένα MBR (το ίδιο αντικείμενο, όχι απλώς ίδιο ID) από ένα dataset
+        και από όλα τα κελιά στα οποία είχε ανατεθεί.
+
+        :param mbr: Το αντικείμενο MBR προς διαγραφή.
+        :param dataset_label: Ετικέτα (string) του dataset.
+        :return: True αν το αντικείμενο βρέθηκε και διαγράφηκε, αλλιώς False.
+        """
+        data = self.datasets.get(dataset_label, [])
+        for pos, obj in enumerate(data):
+            if obj is mbr:
+                del data[pos]
+                break
+        else:
+            return False
+        self.attributes.pop(dataset_label, None)
+
+        i_min, i_max, j_min, j_max = self.cell_range(mbr.xmin, mbr.ymin, mbr.xmax, mbr.ymax)
+        for i in range(i_min, i_max + 1):
+            for j in range(j_min, j_max + 1):
+                objects = self.cells[i][j].objects.get(dataset_label, [])
+                for pos, obj in enumerate(objects):
+                    if obj is mbr:
+                        del objects[pos]
+                        break
+        return True
+
+    @staticmethod
+    def axis_index(value, low, high, m):
+        """
+        Υπολογίζει τον δείκτη κελιού μιας τιμής σε έναν άξονα του Grid,
+        περιορισμένο στο διάστημα [0, m-1].
+
+        :param value: Η τιμή (x ή y) για την οποία ζητάμε δείκτη.
+        :param low: Το κάτω όριο του άξονα (xL ή yL).
+        :param high: Το άνω όριο του άξονα (xU ή yU).
+        :param m: Πλήθος κελιών ανά άξονα.
+        :return: Ακέραιος δείκτης κελιού.
+        """
+        index = int((value - low) // ((high - low) / m))
+        return max(0, min(index, m - 1))
+
+    def cell_range(self, xmin, ymin, xmax, ymax):
+        """
+        Επιστρέφει το εύρος δεικτών κελιών (i_min, i_max, j_min, j_max) που καλύπτει
+        ένα ορθογώνιο [xmin, xmax] x [ymin, ymax].
+
+        :param xmin: Ελάχιστη τιμή x του ορθογωνίου.
+        :param ymin: Ελάχιστη τιμή y του ορθογωνίου.
+        :param xmax: Μέγιστη τιμή x του ορθογωνίου.
+        :param ymax: Μέγιστη τιμή y του ορθογωνίου.
+        :return: Tuple (i_min, i_max, j_min, j_max).
+        """
+        return (
+            Grid.axis_index(xmin, self.xL, self.xU, self.m),
+            Grid.axis_index(xmax, self.xL, self.xU, self.m),
+            Grid.axis_index(ymin, self.yL, self.yU, self.m),
+            Grid.axis_index(ymax, self.yL, self.yU, self.m)
+        )
+
+    def cell_index(self, x, y):
+        """
+        Επιστρέφει τους δείκτες (i, j) του κελιού στο οποίο αντιστοιχεί το σημείο (x, y),
+        με τον ίδιο τρόπο που η assign_to_cells αναθέτει τα MBRs. Σημεία εκτός ορίων
+        αντιστοιχίζονται στο πλησιέστερο ακριανό κελί.
+
+        :param x: Συντεταγμένη x του σημείου.
+        :param y: Συντεταγμένη y του σημείου.
+        :return: Tuple (i, j).
+        """
+        return (
+            Grid.axis_index(x, self.xL, self.xU, self.m),
+            Grid.axis_index(y, self.yL, self.yU, self.m)
+        )
+
+    def curve_key(self, mbr):
+        """
+        Υπολογίζει το key ενός MBR πάνω στην καμπύλη του Grid, με βάση το κέντρο του
+        σε ένα λεπτό πλέγμα 2^OBJECT_CURVE_BITS x 2^OBJECT_CURVE_BITS.
+
+        :param mbr: Ένα αντικείμενο MBR.
+        :return: Ακέραιο key.
+        """
+        bits = Grid.OBJECT_CURVE_BITS
+        resolution = 1 << bits
+        i = Grid.axis_index((mbr.xmin + mbr.xmax) / 2, self.xL, self.xU, resolution)
+        j = Grid.axis_index((mbr.ymin + mbr.ymax) / 2, self.yL, self.yU, resolution)
+        return SpaceFillingCurve.key_function(self.curve)(i, j, bits)
+
+    def iter_cells(self):
+        """
+        Generator που επιστρέφει όλα τα κελιά ως (i, j, cell), με τη σειρά της
+        καμπύλης του Grid (self.cell_order), ώστε διαδοχικά κελιά να είναι γειτονικά.
+
+        :return: Generator από tuples (i, j, Cell).
+        """
+        for i, j in self.cell_order:
+            yield i, j, self.cells[i][j]
+
+    def cell_counts(self, dataset_label='default'):
+        """
+        Μετρά τα αντικείμενα ενός dataset ανά κελί, μετρώντας κάθε αντικείμενο μία φορά,
+        στο κελί που περιέχει το (xmin, ymin) (π.χ. για heatmap).
+
+        :param dataset_label: Ετικέτα dataset (string).
+        :return: Λίστα m x m με counts[i][j] το πλήθος αντικειμένων του κελιού (i, j).
+        """
+        m = self.m
+        counts = [[0] * m for _ in range(m)]
+        # Ίδιος υπολογισμός με την axis_index, inline για μεγάλα datasets
+        cell_w = (self.xU - self.xL) / m
+        cell_h = (self.yU - self.yL) / m
+        for obj in self.get_dataset(dataset_label):
+            i = min(max(int((obj.xmin - self.xL) // cell_w), 0), m - 1)
+            j = min(max(int((obj.ymin - self.yL) // cell_h), 0), m - 1)
+            counts[i][j] += 1
+        return counts
+
+    def sample_objects(self, dataset_label='default', max_points=2000, window=None):
+        """
+        Επιστρέφει ένα δείγμα το πολύ ~max_points αντικειμένων, ομοιόμορφα κατανεμημένο
+        στα κελιά (ίδιος "προϋπολογισμός" ανά μη κενό κελί), ώστε πυκνές περιοχές να μην
+        καλύπτουν τις αραιές. Με window εξετάζονται μόνο τα κελιά του παραθύρου: όσο
+        μικρότερο το παράθυρο (zoom), τόσο περισσότερα σημεία ανά κελί.
+
+        :param dataset_label: Ετικέτα dataset (string).
+        :param max_points: Μέγιστο (περίπου) πλήθος αντικειμένων στο δείγμα.
+        :param window: (Προαιρετικά) tuple (xmin, ymin, xmax, ymax): κρατάμε μόνο
+                       αντικείμενα με (xmin, ymin) μέσα στο παράθυρο.
+        :return: Λίστα από MBR αντικείμενα.
+        """
+        if window is None:
+            window = (self.xL, self.yL, self.xU, self.yU)
+        wx_min, wy_min, wx_max, wy_max = window
+        i_min, i_max, j_min, j_max = self.cell_range(wx_min, wy_min, wx_max, wy_max)
+
+        # Κάθε αντικείμενο ανήκει στο πρώτο κελί του παραθύρου όπου εμφανίζεται
+        seen = set()
+        per_cell = []
+        for i, j, cell in self.iter_cells():
+            if not (i_min <= i <= i_max and j_min <= j <= j_max):
+                continue
+            candidates = []
+            for obj in cell.objects.get(dataset_label, []):
+                if id(obj) in seen:
+                    continue
+                seen.add(id(obj))
+                if wx_min <= obj.xmin <= wx_max and wy_min <= obj.ymin <= wy_max:
+                    candidates.append(obj)
+            if candidates:
+                per_cell.append(candidates)
+
+        if not per_cell:
+            return []
+        budget = max(1, max_points // len(per_cell))
+        sample = []
+        for candidates in per_cell:
+            step = -(-len(candidates) // budget)  # ceil, ώστε να πάρουμε <= budget
+            sample.extend(candidates[::step])
+        return sample
+
+    def attribute_matrix(self, dataset_label='default'):
+        """
+        Επιστρέφει τα χαρακτηριστικά (attrs, ή (xmin, ymin) αν δεν υπάρχουν) όλων των
+        αντικειμένων ενός dataset ως συμπαγή πίνακα array('d') κατά γραμμές, με τη σειρά
+        του self.datasets[dataset_label]. Ο πίνακας δημιουργείται την πρώτη φορά που
+        ζητείται και ακυρώνεται όταν το dataset αλλάξει (add_dataset / insert / delete).
+
+        :param dataset_label: Ετικέτα (string) του dataset.
+        :return: Tuple (values, width): values array('d') μήκους n * width.
+        """
+        if dataset_label not in self.attributes:
+            data = self.get_dataset(dataset_label)
+            width = min((len(obj.attrs) if obj.attrs else 2 for obj in data), default=2)
+            values = array('d')
+            for obj in data:
+                values.extend(obj.attrs[:width] if obj.attrs else (obj.xmin, obj.ymin))
+            self.attributes[dataset_label] = (values, width)
+        return self.attributes[dataset_label]
+
     def get_dataset(self, dataset_label):
         """
         Επιστρέφει όλα τα MBRs που ανήκουν στο dataset με ετικέτα dataset_label.
@@ -160,37 +420,31 @@ class Grid:
         """
         Βρίσκει όλα τα κελιά που βρίσκονται σε ακτίνα 'hop' γύρω από το κελί
         που περιέχει το σημείο (qx, qy). Η ακτίνα ορίζεται σε επίπεδο index
-        (π.χ. cell_i ± hop).
+        (π.χ. cell_i ± hop). Τα κελιά επιστρέφονται με τη σειρά της καμπύλης του Grid
+        (self.cell_rank), ώστε η διάσχιση να ακολουθεί τη διάταξή τους στη μνήμη.
 
         :param qx: Συντεταγμένη x του σημείου αναζήτησης.
         :param qy: Συντεταγμένη y του σημείου αναζήτησης.
         :param hop: Απόσταση σε μονάδες κελιών (integer).
         :return: Λίστα από Cell που βρίσκονται εντός αυτής της περιοχής.
         """
-        initial_cell = self.find_cell(qx, qy)
-        if not initial_cell:
+        if not self.cells:
             return []
-
-        cell_i, cell_j = -1, -1
-        for i in range(self.m):
-            for j in range(self.m):
-                if self.cells[i][j] == initial_cell:
-                    cell_i, cell_j = i, j
-                    break
-            if cell_i != -1:
-                break
-
-        if cell_i == -1:
+        if not (self.xL <= qx <= self.xU and self.yL <= qy <= self.yU):
             return []
 
-        neighbor_cells = []
-        for i in range(cell_i - hop, cell_i + hop + 1):
-            for j in range(cell_j - hop, cell_j + hop + 1):
-                if 0 <= i < self.m and 0 <= j < self.m:
-                    if i == cell_i and j == cell_j:
-                        continue
-                    neighbor_cells.append(self.cells[i][j])
-        return neighbor_cells
+        # Ίδιος υπολογισμός δεικτών με τη find_cell
+        cell_i = min(int((qx - self.xL) / ((self.xU - self.xL) / self.m)), self.m - 1)
+        cell_j = min(int((qy - self.yL) / ((self.yU - self.yL) / self.m)), self.m - 1)
+
+        neighbors = []
+        for i in range(max(0, cell_i - hop), min(self.m, cell_i + hop + 1)):
+            for j in range(max(0, cell_j - hop), min(self.m, cell_j + hop + 1)):
+                if i == cell_i and j == cell_j:
+                    continue
+                neighbors.append((self.cell_rank[i][j], i, j))
+        neighbors.sort()
+        return [self.cells[i][j] for _, i, j in neighbors]
 
     def get_object_by_id(self, obj_id):
         """
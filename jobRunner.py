@@ -0,0 +1,199 @@
+# jobRunner.py
+
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class JobCancelled(Exception):
+    """
+    Εξαίρεση που σηκώνεται μέσα σε μια εργασία όταν ο χρήστης ζητήσει ακύρωση.
+    """
+
+
+class Job:
+    """
+    Μια εργασία (π.χ. Spatial Join, Skyline) που εκτελείται στο παρασκήνιο από τον JobRunner.
+
+    Η συνάρτηση της εργασίας δέχεται παράμετρο progress (βλ. report): οι αλγόριθμοι την
+    καλούν με (done, total), π.χ. κελιά που επεξεργάστηκαν / συνολικά κελιά. Η ακύρωση είναι
+    συνεργατική: μετά την cancel(), η επόμενη κλήση της progress σηκώνει JobCancelled.
+    """
+
+    def __init__(self, job_id, name, owner=None):
+        """
+        :param job_id: Αύξων αριθμός της εργασίας.
+        :param name: Περιγραφή της εργασίας (π.χ. "PBSM").
+        :param owner: (Προαιρετικά) ταυτότητα του κατόχου (π.χ. συνεδρίας Streamlit).
+        """
+        self.job_id = job_id
+        self.name = name
+        self.owner = owner
+        self.done = 0
+        self.total = 0
+        self.status = 'queued'
+        self.result = None
+        self.stats = ""
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+        self.cancel_event = threading.Event()
+
+    def report(self, done, total):
+        """
+        Callback προόδου που περνάει στον αλγόριθμο.
+
+        :param done: Μονάδες (π.χ. κελιά) που ολοκληρώθηκαν.
+        :param total: Συνολικές μονάδες.
+        :raises JobCancelled: Αν έχει ζητηθεί ακύρωση.
+        """
+        self.done = done
+        self.total = total
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    @property
+    def fraction(self):
+        """
+        :return: Πρόοδος στο [0, 1].
+        """
+        if self.status == 'done':
+            return 1.0
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+    @property
+    def elapsed(self):
+        """
+        :return: Χρόνος εκτέλεσης μέχρι τώρα (ή συνολικός, αν τελείωσε), σε δευτερόλεπτα.
+        """
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    @property
+    def finished(self):
+        """
+        :return: True αν η εργασία έχει τελειώσει (με επιτυχία, ακύρωση ή σφάλμα).
+        """
+        return self.status in ('done', 'cancelled', 'failed')
+
+    def cancel(self):
+        """
+        Ζητά ακύρωση: αν η εργασία δεν έχει ξεκινήσει, αφαιρείται από την ουρά,
+        αλλιώς σταματά στην επόμενη αναφορά προόδου.
+        """
+        self.cancel_event.set()
+        if self.future is not None and self.future.cancel():
+            self.status = 'cancelled'
+            self.finished_at = time.time()
+
+    def __repr__(self):
+        return f"Job(#{self.job_id} {self.name}, {self.status}, {self.done}/{self.total})"
+
+
+class JobRunner:
+    """
+    Εκτελεί εργασίες σε ένα pool από threads (ThreadPoolExecutor), ώστε η εφαρμογή να
+    παραμένει διαδραστική όσο τρέχει ένας μεγάλος αλγόριθμος. Οι εργασίες κρατούνται
+    στο self.jobs με τη σειρά υποβολής.
+
+    Ένας JobRunner μπορεί να εξυπηρετεί πολλούς κατόχους (π.χ. όλες τις συνεδρίες μιας
+    εφαρμογής): το max_workers είναι τότε το συνολικό όριο ταυτόχρονων εργασιών, και
+    κάθε κάτοχος βλέπει μόνο τις δικές του (jobs_for). Ολοκληρωμένες εργασίες παλαιότερες
+    από retention δευτερόλεπτα αφαιρούνται, ώστε εγκαταλελειμμένες συνεδρίες να μην
+    κρατούν για πάντα τα αποτελέσματά τους.
+    """
+
+    def __init__(self, max_workers=2, retention=3600):
+        """
+        :param max_workers: Μέγιστο πλήθος εργασιών που εκτελούνται ταυτόχρονα.
+        :param retention: Δευτερόλεπτα που κρατιέται μια ολοκληρωμένη εργασία (και το αποτέλεσμά της).
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.retention = retention
+        self.jobs = []
+        self.counter = itertools.count(1)
+        self.lock = threading.Lock()
+
+    def submit(self, name, fn, *args, owner=None, **kwargs):
+        """
+        Υποβάλλει μια εργασία. Η fn καλείται ως fn(*args, progress=job.report, **kwargs)
+        και πρέπει να επιστρέφει (results, stats_str), όπως όλοι οι αλγόριθμοι.
+
+        :param name: Περιγραφή της εργασίας.
+        :param fn: Η συνάρτηση του αλγορίθμου (π.χ. SpatialJoinPBSM(grid).execute_join).
+        :param owner: (Προαιρετικά) ο κάτοχος της εργασίας (βλ. jobs_for).
+        :return: Το αντικείμενο Job.
+        """
+        self.prune()
+        with self.lock:
+            job = Job(next(self.counter), name, owner)
+            self.jobs.append(job)
+        job.future = self.executor.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    @staticmethod
+    def _run(job, fn, args, kwargs):
+        """
+        Εκτελείται στο worker thread: τρέχει την fn και καταγράφει το αποτέλεσμα στο job.
+        """
+        job.status = 'running'
+        job.started_at = time.time()
+        try:
+            if job.cancel_event.is_set():
+                raise JobCancelled()
+            job.result, job.stats = fn(*args, progress=job.report, **kwargs)
+            status = 'done'
+        except JobCancelled:
+            status = 'cancelled'
+        except Exception as e:
+            job.error = e
+            status = 'failed'
+        # Το finished_at πριν από το status: μόλις το status δείξει τέλος, η prune
+        # (από άλλη συνεδρία) πρέπει να βλέπει και τη χρονική στιγμή του.
+        job.finished_at = time.time()
+        job.status = status
+
+    def jobs_for(self, owner):
+        """
+        :return: Λίστα με τις εργασίες του owner, με τη σειρά υποβολής.
+        """
+        return [job for job in self.jobs if job.owner == owner]
+
+    def active_jobs(self, owner=None):
+        """
+        :param owner: (Προαιρετικά) μόνο οι εργασίες αυτού του κατόχου.
+        :return: Λίστα με τις εργασίες που δεν έχουν τελειώσει.
+        """
+        return [job for job in self.jobs
+                if not job.finished and (owner is None or job.owner == owner)]
+
+    def clear_finished(self, owner=None):
+        """
+        Αφαιρεί από τη λίστα τις εργασίες που έχουν τελειώσει.
+
+        :param owner: (Προαιρετικά) μόνο οι εργασίες αυτού του κατόχου.
+        """
+        with self.lock:
+            self.jobs = [job for job in self.jobs
+                         if not job.finished or (owner is not None and job.owner != owner)]
+
+    def prune(self):
+        """
+        Αφαιρεί τις εργασίες που τελείωσαν πριν από περισσότερα από self.retention δευτερόλεπτα.
+        """
+        limit = time.time() - self.retention
+        with self.lock:
+            self.jobs = [job for job in self.jobs
+                         if not job.finished or job.finished_at is None or job.finished_at > limit]
+
+    def shutdown(self):
+        """
+        Ακυρώνει όλες τις εργασίες και σταματά το pool.
+        """
+        for job in self.jobs:
+            job.cancel()
+        self.executor.shutdown(wait=False)
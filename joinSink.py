@@ -0,0 +1,212 @@
+# joinSink.py
+
+import struct
+
+
+class JoinSink:
+    """
+    Βασική κλάση για τους "αποδέκτες" (sinks) αποτελεσμάτων ενός Spatial Join.
+    Οι αλγόριθμοι join (NaiveSpatialJoin, SpatialJoinPBSM, PlaneSweep κ.λπ.) καλούν
+    την emit(a, b) για κάθε ζεύγος που τέμνεται, αντί να συσσωρεύουν όλα τα ζεύγη
+    σε μια λίστα στη μνήμη. Κάθε υποκλάση αποφασίζει τι θα κάνει με το ζεύγος.
+    """
+
+    def __init__(self):
+        """
+        Αρχικοποιεί τον μετρητή ζευγών που έχουν περάσει από το sink.
+        """
+        self.count = 0
+
+    def emit(self, a, b):
+        """
+        Δέχεται ένα ζεύγος (a, b) που τέμνεται.
+
+        :param a: MBR του πρώτου συνόλου.
+        :param b: MBR του δεύτερου συνόλου.
+        """
+        self.count += 1
+
+    def close(self):
+        """
+        Ολοκληρώνει την εγγραφή (π.χ. αδειάζει τον buffer και κλείνει αρχεία).
+        """
+        pass
+
+    def result(self):
+        """
+        Επιστρέφει το "αποτέλεσμα" του sink (π.χ. λίστα ζευγών ή όνομα αρχείου).
+        """
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class ListSink(JoinSink):
+    """
+    Sink που κρατά τα ζεύγη (a, b) σε λίστα στη μνήμη. Αντιστοιχεί στην
+    αρχική συμπεριφορά των αλγορίθμων join.
+    """
+
+    def __init__(self, pairs=None):
+        """
+        :param pairs: (Προαιρετικά) υπάρχουσα λίστα στην οποία θα προστίθενται τα ζεύγη.
+        """
+        super().__init__()
+        self.pairs = pairs if pairs is not None else []
+
+    def emit(self, a, b):
+        self.count += 1
+        self.pairs.append((a, b))
+
+    def result(self):
+        return self.pairs
+
+
+class CountSink(JoinSink):
+    """
+    Sink που απλώς μετρά τα ζεύγη που τέμνονται, χωρίς να κρατά κανένα ζεύγος.
+    Το result() επιστρέφει το συνολικό πλήθος.
+    """
+
+    def emit(self, a, b):
+        self.count += 1
+
+
+class AggregateSink(JoinSink):
+    """
+    Sink που υπολογίζει συγκεντρωτικά στοιχεία ανά αντικείμενο του πρώτου συνόλου (A):
+    πόσα αντικείμενα του B το τέμνουν και (προαιρετικά) το συνολικό εμβαδόν τομής.
+    Δεν κρατά κανένα ζεύγος, μόνο ένα λεξικό A_ID -> [πλήθος, εμβαδόν].
+    """
+
+    def __init__(self, with_area=True):
+        """
+        :param with_area: Αν True, αθροίζεται και το εμβαδόν τομής (MBR.intersection_area).
+        """
+        super().__init__()
+        self.with_area = with_area
+        self.per_object = {}
+
+    def emit(self, a, b):
+        self.count += 1
+        entry = self.per_object.get(a.id)
+        if entry is None:
+            entry = self.per_object[a.id] = [0, 0.0]
+        entry[0] += 1
+        if self.with_area:
+            entry[1] += a.intersection_area(b)
+
+    def result(self):
+        """
+        :return: Λεξικό A_ID -> (πλήθος τεμνόμενων B, συνολικό εμβαδόν τομής).
+        """
+        return {obj_id: (count, area) for obj_id, (count, area) in self.per_object.items()}
+
+
+class CSVPairSink(JoinSink):
+    """
+    Sink που γράφει σταδιακά τα IDs των ζευγών σε αρχείο CSV (A_ID,B_ID),
+    με περιορισμένο buffer στη μνήμη.
+    """
+
+    def __init__(self, filename, buffer_size=10000, header=True):
+        """
+        :param filename: Αρχείο εξόδου.
+        :param buffer_size: Πλήθος ζευγών που κρατάμε στη μνήμη πριν τα γράψουμε στο αρχείο.
+        :param header: Αν True, γράφεται επικεφαλίδα "A_ID,B_ID".
+        """
+        super().__init__()
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.file = open(filename, 'w')
+        if header:
+            self.file.write("A_ID,B_ID\n")
+
+    def emit(self, a, b):
+        self.count += 1
+        self.buffer.append(f"{a.id},{b.id}\n")
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Γράφει τα ζεύγη του buffer στο αρχείο και τον αδειάζει.
+        """
+        if self.buffer:
+            self.file.write("".join(self.buffer))
+            self.buffer.clear()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def result(self):
+        return self.filename
+
+
+class BinaryPairSink(JoinSink):
+    """
+    Sink που γράφει τα ζεύγη σε συμπαγές δυαδικό αρχείο. Κάθε εγγραφή είναι:
+      <μήκος A_ID: uint16><μήκος B_ID: uint16><A_ID σε UTF-8><B_ID σε UTF-8>
+    Το αρχείο διαβάζεται με τη read_binary_pairs().
+    """
+
+    def __init__(self, filename, buffer_size=10000):
+        """
+        :param filename: Αρχείο εξόδου.
+        :param buffer_size: Πλήθος ζευγών που κρατάμε στη μνήμη πριν τα γράψουμε στο αρχείο.
+        """
+        super().__init__()
+        self.filename = filename
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.file = open(filename, 'wb')
+
+    def emit(self, a, b):
+        self.count += 1
+        a_id = str(a.id).encode('utf-8')
+        b_id = str(b.id).encode('utf-8')
+        self.buffer.append(struct.pack('<HH', len(a_id), len(b_id)) + a_id + b_id)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Γράφει τα ζεύγη του buffer στο αρχείο και τον αδειάζει.
+        """
+        if self.buffer:
+            self.file.write(b"".join(self.buffer))
+            self.buffer.clear()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+    def result(self):
+        return self.filename
+
+
+def read_binary_pairs(filename):
+    """
+    Διαβάζει (ως generator) τα ζεύγη IDs από αρχείο που γράφτηκε με το BinaryPairSink.
+
+    :param filename: Το δυαδικό αρχείο ζευγών.
+    :return: Generator από tuples (A_ID, B_ID) ως strings.
+    """
+    header = struct.Struct('<HH')
+    with open(filename, 'rb') as file:
+        while True:
+            lengths = file.read(header.size)
+            if len(lengths) < header.size:
+                return
+            len_a, len_b = header.unpack(lengths)
+            data = file.read(len_a + len_b)
+            yield data[:len_a].decode('utf-8'), data[len_a:].decode('utf-8')
@@ -13,7 +13,7 @@ class kNN:
     """
 
     @staticmethod
-    def knn(grid, qx, qy, k):
+    def knn(grid, qx, qy, k, verbose=True):
         """
         Εκτελεί αναζήτηση k-κοντινότερων γειτόνων (k-NN) πάνω σε ένα Grid,
         ξεκινώντας από το κελί που καλύπτει το σημείο (qx, qy) και επεκτείνοντας
@@ -24,6 +24,7 @@ class kNN:
         :param qx: Η x-συντεταγμένη του σημείου ενδιαφέροντος (query point).
         :param qy: Η y-συντεταγμένη του σημείου ενδιαφέροντος (query point).
         :param k:  Ο αριθμός k γειτόνων που θέλουμε να επιστρέψουμε.
+        :param verbose: Αν False, δεν τυπώνονται μηνύματα (π.χ. σε knn_batch).
         :return: Δύο τιμές:
             1) results: Μια λίστα (απόσταση, MBR), ταξινομημένη κατά αύξουσα απόσταση.
             2) stats_str: Συμβολοσειρά που περιγράφει στατιστικά για την εκτέλεση, όπως:
@@ -48,15 +49,17 @@ class kNN:
                 f"[kNN] Το σημείο ({qx}, {qy}) είναι εκτός του πλέγματος.\n"
                 f"    Όρια Grid: xmin={grid.xL}, ymin={grid.yL}, xmax={grid.xU}, ymax={grid.yU}"
             )
-            print(msg_out_of_grid)
+            if verbose:
+                print(msg_out_of_grid)
             stats_str = (
                 "[kNN] ΔΕΝ έγινε αναζήτηση, γιατί το σημείο είναι εκτός grid.\n"
                 + msg_out_of_grid
             )
             return [], stats_str
 
-        print(f"[kNN] Αναζήτηση στο κελί: {initial_cell.mbr}, "
-              f"{len(initial_cell.objects.get('default', []))} αντικείμενα.")
+        if verbose:
+            print(f"[kNN] Αναζήτηση στο κελί: {initial_cell.mbr}, "
+                  f"{len(initial_cell.objects.get('default', []))} αντικείμενα.")
 
         processed_ids = set()       # Χρησιμοποιείται για να αποφύγουμε διπλό processing
         counter = itertools.count() # Χρησιμοποιείται για tie-breaking στο heap
@@ -109,14 +112,16 @@ class kNN:
 
         # Υπολογισμός χρόνου εκτέλεσης
         elapsed_time = time.time() - start_time
-        print(f"[kNN] Grid-based k-NN ολοκληρώθηκε σε {elapsed_time:.4f} δευτερόλεπτα.")
+        if verbose:
+            print(f"[kNN] Grid-based k-NN ολοκληρώθηκε σε {elapsed_time:.4f} δευτερόλεπτα.")
 
         # Μετατροπή των στοιχείων (αρνητική_απόσταση, counter, obj) σε (απόσταση, obj)
         results = sorted(
             [(-dist_sq, obj) for dist_sq, _, obj in pq],
             key=lambda x: x[0]
         )
-        print(f"[kNN] Βρέθηκαν {len(results)} κοντινότεροι γείτονες (επιστρέφουμε τους k={k}).")
+        if verbose:
+            print(f"[kNN] Βρέθηκαν {len(results)} κοντινότεροι γείτονες (επιστρέφουμε τους k={k}).")
 
         # Δημιουργούμε τη συμβολοσειρά stats_str για να αναφέρουμε τα στατιστικά
         stats_str = (
@@ -128,3 +133,43 @@ class kNN:
         )
 
         return results, stats_str
+
+    @staticmethod
+    def knn_batch(grid, queries, k, progress=None):
+        """
+        Εκτελεί k-NN για πολλά query points πάνω στο ίδιο Grid (π.χ. ως εργασία παρασκηνίου).
+
+        :param grid: Αντικείμενο Grid με φορτωμένο το σύνολο 'default'.
+        :param queries: Λίστα από σημεία (qx, qy).
+        :param k: Ο αριθμός k γειτόνων ανά σημείο.
+        :param progress: (Προαιρετικά) callback progress(done, total) με τα query points
+                         που ολοκληρώθηκαν / συνολικά (βλ. jobRunner.Job.report).
+        :return: Δύο τιμές:
+            1) results: Λίστα (αριθμός query, απόσταση, MBR) για όλα τα query points,
+               κατά query και αύξουσα απόσταση.
+            2) stats_str: Συμβολοσειρά με στατιστικά εκτέλεσης.
+        """
+        start_time = time.time()
+        results = []
+        outside = 0
+        for done, (qx, qy) in enumerate(queries):
+            if progress:
+                progress(done, len(queries))
+            neighbours, _ = kNN.knn(grid, qx, qy, k, verbose=False)
+            if not neighbours and not grid.find_cell(qx, qy):
+                outside += 1
+            results.extend((done + 1, dist, obj) for dist, obj in neighbours)
+        if progress:
+            progress(len(queries), len(queries))
+
+        elapsed_time = time.time() - start_time
+        stats_str = (
+            "[kNN batch] Στατιστικά:\n"
+            f" • Query points: {len(queries)} (εκτός grid: {outside})\n"
+            f" • k: {k}\n"
+            f" • Συνολικά αποτελέσματα: {len(results)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return results, stats_str
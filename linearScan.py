@@ -1,7 +1,6 @@
 # linearScan.py
 
 import time
-from MBR import MBR
 from utils import Utils
 
 class LinearScan:
@@ -13,52 +12,33 @@ class LinearScan:
     def __init__(self, filename):
         """
         Αρχικοποιεί τη δομή LinearScan, φορτώνοντας τα δεδομένα MBR
-        από το δοθέν αρχείο CSV.
+        από το δοθέν CSV.
 
-        :param filename: Το όνομα του CSV αρχείου που περιέχει τα δεδομένα.
+        :param filename: Το όνομα του CSV αρχείου που περιέχει τα δεδομένα, ή bytes /
+                         file-like με το ίδιο περιεχόμενο (βλ. Utils.read_mbrs).
         """
         self.filename = filename
         self.data = self.load_data()
 
     def load_data(self):
         """
-        Φορτώνει τα δεδομένα (MBRs) από ένα CSV αρχείο με μορφή γραμμών:
+        Φορτώνει τα δεδομένα (MBRs) από ένα CSV με μορφή γραμμών:
           ID,xmin,ymin,xmax,ymax
 
-        - Παραλείπει γραμμές που δεν περιέχουν ακριβώς 5 πεδία.
+        - Παραλείπει γραμμές που δεν έχουν τόσα πεδία όσα η επικεφαλίδα.
         - Αγνοεί γραμμές όπου xmin>xmax ή ymin>ymax, ή εφόσον δεν
           μπορούν να μετατραπούν σε float.
 
         :return: Μια λίστα από MBR αντικείμενα.
         """
         data = []
+        name = Utils.source_name(self.filename)
         try:
-            with open(self.filename, 'r') as file:
-                header = next(file, None)  # Παράκαμψη γραμμής επικεφαλίδων, αν υπάρχει
-                for line in file:
-                    parts = line.strip().split(',')
-                    if len(parts) != 5:
-                        continue
-
-                    id_str, xmin_str, ymin_str, xmax_str, ymax_str = parts
-                    try:
-                        xmin = float(xmin_str)
-                        ymin = float(ymin_str)
-                        xmax = float(xmax_str)
-                        ymax = float(ymax_str)
-
-                        # Αν τα όρια είναι ασύμβατα, αγνοούμε αυτή τη γραμμή
-                        if xmin > xmax or ymin > ymax:
-                            continue
-
-                        mbr = MBR(id_str, xmin, ymin, xmax, ymax)
-                        data.append(mbr)
-                    except ValueError:
-                        continue
+            data, _ = Utils.read_mbrs(self.filename)
         except FileNotFoundError:
-            print(f"[LinearScan] Το αρχείο '{self.filename}' δεν βρέθηκε.")
+            print(f"[LinearScan] Το αρχείο '{name}' δεν βρέθηκε.")
         except Exception as e:
-            print(f"[LinearScan] Σφάλμα κατά τη φόρτωση του αρχείου '{self.filename}': {e}")
+            print(f"[LinearScan] Σφάλμα κατά τη φόρτωση του αρχείου '{name}': {e}")
 
         return data
 
@@ -3,27 +3,71 @@
 import streamlit as st
 import os
 import pandas as pd
-import statistics
 import io
+import functools
+import time
+import tempfile
+import hashlib
+import shutil
+import uuid
 
 from pointGeneratorUnif import PointGeneratorUnif
 from grid import Grid
+from MBR import MBR
 from kNN import kNN  # kNN.knn() -> (results, stats_str)
 from linearScan import LinearScan  # ls.knn() -> (results, stats_str)
 from spatialJoinPBSM import SpatialJoinPBSM  # pbsmsj.execute_join() -> (results, stats_str)
+from parallelSpatialJoinPBSM import ParallelSpatialJoinPBSM  # ppbsm.execute_join() -> (results, stats_str)
 from naiveSpatialJoin import NaiveSpatialJoin  # naive_sj.execute_join() -> (results, stats_str)
 from skyline_query import SkylineQuery  # sq.sky_query() -> (results, sky_stats)
-
-import folium
-from streamlit_folium import st_folium
+from parallelSkylineQuery import ParallelSkylineQuery  # psq.sky_query() -> (results, sky_stats)
+from maintainedSkyline import MaintainedSkyline  # ms.insert() / ms.delete() -> (added, removed)
+from dominanceQuery import DominanceQuery  # dq.k_skyband() / dq.top_k_dominating() -> (results, stats_str)
+from distanceJoin import DistanceJoin  # dj.execute_join() -> (results, stats_str)
+from multiwaySpatialJoin import MultiwaySpatialJoin  # mwj.execute_join() -> (results, stats_str)
+from selfSpatialJoin import SelfSpatialJoin  # ssj.execute_join() -> (results, stats_str)
+from planeSweep import PlaneSweep  # PlaneSweep.spatial_join() -> results
+from rTree import RTree  # rtree.knn() / rtree.spatial_join() / rtree.sky_query() -> (results, stats_str)
+from queryOptimizer import QueryOptimizer  # opt.choose_join() -> (plan, report_str)
+from joinSink import CSVPairSink, CountSink, AggregateSink  # έξοδοι join χωρίς λίστα ζευγών
+from resultExport import ResultExport  # exporter.write() -> πλήθος γραμμών
+from jobRunner import JobRunner  # runner.submit() -> Job (εκτέλεση στο παρασκήνιο)
+
+
+# Τρόποι εξόδου ενός Spatial Join (βλ. joinSink.py)
+JOIN_OUTPUT_MODES = [
+    "Ζεύγη (λίστα στη μνήμη)",
+    "Streaming εγγραφή ζευγών σε αρχείο CSV",
+    "Μόνο πλήθος ζευγών",
+    "Ανά αντικείμενο A (πλήθος, εμβαδόν τομής)"
+]
+
+# Το st.download_button διαβάζει ολόκληρο το αρχείο στη μνήμη του server. Πάνω από
+# αυτό το μέγεθος, το αρχείο μένει στον φάκελο EXPORT_DIR του server (βλ. offer_file).
+MAX_DOWNLOAD_BYTES = 50 * 1024 * 1024
+EXPORT_DIR = os.environ.get("GRID_EXPORT_DIR", "exports")
+
+# Εργασίες παρασκηνίου (βλ. get_job_runner): ένα κοινό pool για όλες τις συνεδρίες.
+# Οι αλγόριθμοι είναι CPU-bound Python και μοιράζονται το GIL με τον server, γι' αυτό
+# το πλήθος των ταυτόχρονων εργασιών μένει μικρό.
+JOB_WORKERS = 2
+JOB_RETENTION = 3600  # δευτερόλεπτα που κρατιούνται τα αποτελέσματα μιας ολοκληρωμένης εργασίας
+
+# Τρόποι απόδοσης του χάρτη (βλ. display_map)
+MAP_RENDER_MODES = [
+    "Markers (δείγμα ανά κελί)",
+    "Cluster (FastMarkerCluster)",
+    "Heatmap (πλήθη ανά κελί)"
+]
 
 
 def save_results(results, algorithm_name, stats=None):
     """
     Αποθηκεύει τα αποτελέσματα ενός αλγορίθμου (π.χ. k-NN, PBSM, Naive Spatial Join, Skyline)
-    μαζί με τυχόν στατιστικά σε ένα αρχείο .txt, το οποίο προσφέρεται για download
-    μέσω Streamlit. Χρησιμοποιεί in-memory StringIO, ώστε να μη δημιουργεί φυσικό αρχείο
-    στον δίσκο.
+    μαζί με τυχόν στατιστικά σε ένα αρχείο. Η μορφή (txt, csv.gz, parquet) επιλέγεται στην
+    πλαϊνή μπάρα· οι γραμμές γράφονται σε κομμάτια από την ResultExport σε προσωρινό αρχείο,
+    ώστε να μη χτίζεται ολόκληρο το κείμενο στη μνήμη. Το αρχείο προσφέρεται για download
+    ή, αν είναι μεγάλο, μένει στον server (βλ. offer_file).
 
     :param results: Τα αποτελέσματα προς αποθήκευση (λίστα).
     :param algorithm_name: Το όνομα του αλγορίθμου (string).
@@ -33,82 +77,340 @@ def save_results(results, algorithm_name, stats=None):
         st.warning(f"Δεν υπάρχουν αποτελέσματα για αποθήκευση στον {algorithm_name}.")
         return
 
-    st.info(f"Αποθήκευση αποτελεσμάτων {algorithm_name} σε τοπικό αρχείο (.txt):")
+    exporter = ResultExport(algorithm_name, st.session_state.get("export_format", "txt"))
+    st.info(f"Αποθήκευση αποτελεσμάτων {algorithm_name} σε αρχείο (.{exporter.fmt}):")
+
+    fd, path = tempfile.mkstemp(prefix="results_", suffix=f".{exporter.fmt}")
+    os.close(fd)
+    try:
+        exporter.write(results, path, stats=stats)
+    except ImportError as e:
+        os.remove(path)
+        st.error(str(e))
+        return
+    offer_file(path, exporter.file_name, exporter.mime, "Κατέβασε το αρχείο αποτελεσμάτων")
+
+
+def offer_pair_file(filename, algorithm_name):
+    """
+    Προσφέρει ένα αρχείο ζευγών (A_ID,B_ID) που γράφτηκε σταδιακά από ένα CSVPairSink
+    (βλ. offer_file).
+
+    :param filename: Το αρχείο CSV με τα ζεύγη.
+    :param algorithm_name: Το όνομα του αλγορίθμου (string), για το όνομα του αρχείου.
+    """
+    offer_file(filename, f"results_{algorithm_name}.csv", "text/csv", "Κατέβασε το αρχείο ζευγών (CSV)")
+
+
+def offer_file(path, file_name, mime, label):
+    """
+    Προσφέρει ένα προσωρινό αρχείο εξόδου στον χρήστη και στη συνέχεια το απομακρύνει
+    από τον προσωρινό φάκελο.
+
+    Το st.download_button δεν κάνει streaming: διαβάζει όλο το αρχείο στη μνήμη του
+    server. Έτσι, μόνο αρχεία έως MAX_DOWNLOAD_BYTES προσφέρονται για download· τα
+    μεγαλύτερα μεταφέρονται στον φάκελο EXPORT_DIR του server και εμφανίζεται η διαδρομή τους.
+
+    :param path: Το προσωρινό αρχείο.
+    :param file_name: Το όνομα αρχείου για τον χρήστη (π.χ. "results_PBSM.csv.gz").
+    :param mime: Ο MIME τύπος του αρχείου.
+    :param label: Η ετικέτα του κουμπιού download.
+    """
+    size = os.path.getsize(path)
+    if size > MAX_DOWNLOAD_BYTES:
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        stem, dot, ext = file_name.partition(".")
+        fd, target = tempfile.mkstemp(prefix=f"{stem}_", suffix=f"{dot}{ext}", dir=EXPORT_DIR)
+        os.close(fd)
+        shutil.move(path, target)
+        target = os.path.abspath(target)
+        st.warning(f"Το αρχείο είναι {size / 2**20:.1f} MB, πάνω από το όριο download "
+                   f"({MAX_DOWNLOAD_BYTES / 2**20:.0f} MB). Αποθηκεύτηκε στον server: {target}")
+        return
+
+    try:
+        with open(path, "rb") as f:
+            st.download_button(label=label, data=f, file_name=file_name, mime=mime)
+    finally:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def new_pair_file():
+    """
+    Δημιουργεί ένα μοναδικό προσωρινό αρχείο για streaming εγγραφή ζευγών join.
+
+    :return: Το όνομα (path) του αρχείου.
+    """
+    fd, path = tempfile.mkstemp(prefix="pairs_", suffix=".csv")
+    os.close(fd)
+    return path
+
+
+def run_join_with_sink(execute_join, output_mode, algorithm_name, data_grid, labels=('A', 'B')):
+    """
+    Εκτελεί έναν Spatial Join (π.χ. SpatialJoinPBSM, NaiveSpatialJoin) με έξοδο
+    που δεν κρατά τα ζεύγη στη μνήμη, ανάλογα με το output_mode (βλ. JOIN_OUTPUT_MODES),
+    και εμφανίζει τα αποτελέσματα.
+
+    :param execute_join: Η μέθοδος εκτέλεσης του join (π.χ. pbsmsj.execute_join),
+                         που δέχεται παράμετρο sink και επιστρέφει (results, stats_str).
+    :param output_mode: Ένα από τα JOIN_OUTPUT_MODES[1:].
+    :param algorithm_name: Το όνομα του αλγορίθμου (string).
+    :param data_grid: Το Grid με τα φορτωμένα σύνολα (βλ. load_grid).
+    :param labels: Οι ετικέτες των συνόλων που χρειάζεται το join.
+    """
+    # Η Grid.load δεν πετάει εξαίρεση για αρχείο που δεν διαβάστηκε· χωρίς αυτόν τον έλεγχο
+    # θα δημιουργούσαμε sink (π.χ. αρχείο ζευγών) για ένα join που δεν μπορεί να τρέξει.
+    missing = [label for label in labels if label not in data_grid.datasets]
+    if missing:
+        st.error(f"Δεν φορτώθηκαν τα σύνολα {', '.join(missing)}· έλεγξε τα αρχεία CSV.")
+        return
+
+    if output_mode == JOIN_OUTPUT_MODES[1]:
+        pair_file, stats = execute_join(sink=CSVPairSink(new_pair_file()))
+        st.write(stats)
+        offer_pair_file(pair_file, algorithm_name)
+
+    elif output_mode == JOIN_OUTPUT_MODES[2]:
+        count, stats = execute_join(sink=CountSink())
+        st.write(f"Ζεύγη που τέμνονται ({algorithm_name}): {count}")
+        st.write(stats)
+
+    elif output_mode == JOIN_OUTPUT_MODES[3]:
+        per_object, stats = execute_join(sink=AggregateSink())
+        st.write(f"Αντικείμενα A με τουλάχιστον μία τομή: {len(per_object)}")
+        st.write(stats)
+        save_results(list(per_object.items()), "Join Aggregate", stats=stats)
+
+
+@st.cache_resource
+def get_job_runner():
+    """
+    :return: Ο JobRunner της εφαρμογής, κοινός για όλες τις συνεδρίες, ώστε το πλήθος
+             των worker threads να είναι σταθερό (JOB_WORKERS) όσες συνεδρίες κι αν ανοίξουν.
+             Κάθε συνεδρία βλέπει μόνο τις δικές της εργασίες (βλ. job_owner).
+    """
+    return JobRunner(max_workers=JOB_WORKERS, retention=JOB_RETENTION)
+
+
+def job_owner():
+    """
+    :return: Η ταυτότητα της τρέχουσας συνεδρίας στον κοινό JobRunner.
+    """
+    return st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+
+
+def submit_job(name, fn, *args, **kwargs):
+    """
+    Υποβάλλει έναν αλγόριθμο ως εργασία παρασκηνίου (βλ. jobRunner.py), ώστε η
+    εφαρμογή να μην μπλοκάρει μέχρι να τελειώσει. Δεν επιστρέφει: ξανατρέχει τη σελίδα
+    (st.rerun), ώστε η νέα εργασία να εμφανιστεί στο panel εργασιών της πλαϊνής μπάρας.
+
+    :param name: Το όνομα του αλγορίθμου, όπως στη save_results (π.χ. "PBSM").
+    :param fn: Η συνάρτηση του αλγορίθμου· δέχεται παράμετρο progress και
+               επιστρέφει (results, stats_str).
+    """
+    get_job_runner().submit(name, fn, *args, owner=job_owner(), **kwargs)
+    st.rerun()
+
+
+def jobs_panel():
+    """
+    Εμφανίζει τις εργασίες παρασκηνίου της συνεδρίας. Όσο υπάρχουν ενεργές εργασίες,
+    η λίστα ανανεώνεται κάθε δευτερόλεπτο ως st.fragment, χωρίς να ξανατρέχει όλη η σελίδα.
+    """
+    runner = get_job_runner()
+    owner = job_owner()
+    if not runner.jobs_for(owner):
+        return
+
+    st.header("Εργασίες παρασκηνίου")
+    live = bool(runner.active_jobs(owner))
+    st.fragment(run_every=1 if live else None)(show_jobs)(runner, owner, live)
 
-    output = io.StringIO()
 
-    # 1. Αν υπάρχουν στατιστικά, τα γράφουμε πρώτα
-    if stats:
-        output.write(stats)
-        output.write("\n")
+def show_jobs(runner, owner, live):
+    """
+    Σώμα του jobs_panel: μπάρα προόδου και ακύρωση για τις ενεργές εργασίες,
+    στατιστικά και αποθήκευση αποτελεσμάτων για όσες ολοκληρώθηκαν.
+
+    :param runner: Ο κοινός JobRunner.
+    :param owner: Η ταυτότητα της συνεδρίας (βλ. job_owner).
+    :param live: True αν το panel ανανεώνεται περιοδικά (υπάρχουν ενεργές εργασίες).
+    """
+    for job in runner.jobs_for(owner):
+        title = f"#{job.job_id} {job.name} · {job.elapsed:.1f} δευτ."
+        if not job.finished:
+            col1, col2 = st.columns([4, 1])
+            col1.progress(job.fraction, text=f"{title} · {job.status} ({job.done}/{job.total})")
+            if col2.button("Ακύρωση", key=f"cancel_job_{job.job_id}"):
+                job.cancel()
+        elif job.status == 'done':
+            with st.expander(f"{title} · ολοκληρώθηκε ({len(job.result)} αποτελέσματα)"):
+                st.write(job.stats)
+                if live:
+                    st.info("Η αποθήκευση θα είναι διαθέσιμη όταν τελειώσουν όλες οι εργασίες.")
+                elif st.button("Αποθήκευση αποτελεσμάτων", key=f"save_job_{job.job_id}"):
+                    # Η εξαγωγή γίνεται μόνο όταν ζητηθεί, όχι σε κάθε rerun της σελίδας
+                    save_results(job.result, job.name, stats=job.stats)
+        elif job.status == 'cancelled':
+            st.warning(f"{title} · ακυρώθηκε.")
+        else:
+            st.error(f"{title} · απέτυχε: {job.error}")
+
+    if live and not runner.active_jobs(owner):
+        # Όλες τελείωσαν: πλήρες rerun ώστε να σταματήσει η ανανέωση του panel
+        st.rerun()
+    if not live and st.button("Καθαρισμός ολοκληρωμένων εργασιών"):
+        runner.clear_finished(owner)
+        st.rerun()
+
+
+@st.cache_resource(show_spinner="Κατασκευή Grid...", max_entries=16)
+def build_grid(xL, yL, xU, yU, m, curve, file_keys, _uploads):
+    """
+    Κατασκευάζει ένα Grid και φορτώνει τα δοσμένα CSV. Το αποτέλεσμα αποθηκεύεται
+    στην cache του Streamlit (κοινή για όλες τις συνεδρίες) με κλειδί τα όρια, το m,
+    την καμπύλη και το hash του περιεχομένου κάθε αρχείου, ώστε νέα εκτέλεση ερωτήματος
+    πάνω στο ίδιο upload να μην ξαναδιαβάζει το CSV.
+
+    Το Grid που επιστρέφεται είναι κοινόχρηστο και δεν πρέπει να τροποποιείται
+    (insert / delete / load).
+
+    :param file_keys: Tuple από (dataset_label, sha256 του περιεχομένου).
+    :param _uploads: Λεξικό dataset_label -> αρχείο του st.file_uploader (δεν μπαίνει στο
+                     κλειδί της cache). Κάθε upload αναλύεται απευθείας από τη μνήμη.
+    :return: Το φορτωμένο Grid.
+    """
+    new_grid = Grid(xL, yL, xU, yU, m, curve=curve)
+    for label, _ in file_keys:
+        uploaded = _uploads[label]
+        uploaded.seek(0)
+        new_grid.load(uploaded, dataset_label=label)
+    return new_grid
 
-    # 2. Γράφουμε επικεφαλίδες
-    if algorithm_name in ['PBSM', 'Naive']:
-        output.write("Dataset_A_ID\tDataset_B_ID\n")
-    elif algorithm_name in ['k-NN', 'Linear Scan']:
-        output.write("Dataset_ID\tDistance\n")
-    elif algorithm_name == 'Skyline':
-        output.write("Skyline Points (ID, xmin, ymin, xmax, ymax):\n")
 
-    # 3. Γράφουμε τα αποτελέσματα γραμμή-γραμμή
-    for pair in results:
-        if algorithm_name in ['PBSM', 'Naive']:
-            a, b = pair
-            output.write(f"{a.id}\t{b.id}\n")
-        elif algorithm_name in ['k-NN', 'Linear Scan']:
-            dist, obj = pair
-            output.write(f"{obj.id}\t{dist:.4f}\n")
-        elif algorithm_name == 'Skyline':
-            obj = pair
-            output.write(f"{obj.id}, {obj.xmin}, {obj.ymin}, {obj.xmax}, {obj.ymax}\n")
+def load_grid(grid, uploads):
+    """
+    Επιστρέφει (από την cache, αν υπάρχει) ένα Grid με τις ρυθμίσεις του grid
+    (όρια, m, καμπύλη) και τα ανεβασμένα αρχεία φορτωμένα.
 
-    data_str = output.getvalue()
-    output.close()
+    :param grid: Το Grid του session, από το οποίο παίρνουμε τις ρυθμίσεις.
+    :param uploads: Λίστα από (dataset_label, αρχείο του st.file_uploader).
+    :return: Το φορτωμένο (κοινόχρηστο) Grid.
+    """
+    files = dict(uploads)
+    file_keys = tuple((label, upload_digest(uploaded)) for label, uploaded in files.items())
+    return build_grid(grid.xL, grid.yL, grid.xU, grid.yU, grid.m, grid.curve, file_keys, files)
 
-    default_filename = f"results_{algorithm_name}.txt"
 
-    st.download_button(
-        label="Κατέβασε το αρχείο αποτελεσμάτων",
-        data=data_str,
-        file_name=default_filename,
-        mime="text/plain"
-    )
+def unique_labels(names):
+    """
+    :param names: Ονόματα συνόλων (π.χ. ονόματα αρχείων), πιθανώς με επαναλήψεις.
+    :return: Λίστα μοναδικών ετικετών, με τη σειρά των names· κάθε επανάληψη παίρνει
+             κατάληξη _2, _3, ..., ώστε η load_grid να μη συγχωνεύσει δύο αρχεία σε ένα σύνολο.
+    """
+    labels = []
+    for name in names:
+        label, suffix = name, 2
+        while label in labels:
+            label, suffix = f"{name}_{suffix}", suffix + 1
+        labels.append(label)
+    return labels
 
 
-def display_map(all_points, skyline_points=None):
+def upload_digest(uploaded):
+    """
+    :param uploaded: Αρχείο του st.file_uploader.
+    :return: Το sha256 του περιεχομένου του, χωρίς αντίγραφο των bytes.
+    """
+    with uploaded.getbuffer() as view:
+        return hashlib.sha256(view).hexdigest()
+
+
+def display_map(all_points, skyline_points=None, grid=None, dataset_label='default'):
     """
     Δημιουργεί κι εμφανίζει έναν διαδραστικό χάρτη Folium μέσα σε Streamlit,
     επιτρέποντας οπτικοποίηση των MBR points και (προαιρετικά) των Skyline points
     σε διαφορετικό χρώμα.
 
+    Για μεγάλα σύνολα, ο χρήστης επιλέγει τρόπο απόδοσης:
+      - Markers: ένα marker ανά σημείο ενός δείγματος, ομοιόμορφου ανά κελί του Grid.
+      - Cluster: το ίδιο δείγμα ως FastMarkerCluster (ομαδοποίηση στον browser).
+      - Heatmap: ένα σημείο ανά κελί του Grid, με βάρος το πλήθος των αντικειμένων του.
+    Το δείγμα υπολογίζεται στον server (Grid.sample_objects) για το παράθυρο
+    (viewport) που ορίζει ο χρήστης, οπότε ο browser δέχεται το πολύ max_points σημεία.
+
     :param all_points: Λίστα με σημεία (MBRs) που εμφανίζονται ως μπλε markers.
     :param skyline_points: (Προαιρετικά) λίστα με Skyline points, που εμφανίζονται κόκκινα.
+    :param grid: (Προαιρετικά) Grid που περιέχει τα all_points, για δειγματοληψία ανά κελί
+                 και heatmap. Χωρίς Grid γίνεται απλή ομοιόμορφη δειγματοληψία.
+    :param dataset_label: Η ετικέτα των all_points στο grid.
     """
     if not all_points:
         st.info("Δεν υπάρχουν δεδομένα για εμφάνιση στον χάρτη.")
         return
 
-    lats = [p.ymin for p in all_points]
-    lons = [p.xmin for p in all_points]
-    center_lat = statistics.mean(lats)
-    center_lon = statistics.mean(lons)
-
-    folium_map = folium.Map(location=[center_lat, center_lon], zoom_start=12)
+    # Το Folium φορτώνεται μόνο όταν ζητηθεί χάρτης
+    import folium
+    from folium.plugins import FastMarkerCluster, HeatMap
+    from streamlit_folium import st_folium
+
+    render_mode = st.radio("Απόδοση χάρτη", MAP_RENDER_MODES, horizontal=True)
+    max_points = st.number_input("Μέγιστο πλήθος σημείων στον χάρτη", min_value=100,
+                                 value=2000, step=500)
+
+    xs = [p.xmin for p in all_points]
+    ys = [p.ymin for p in all_points]
+    with st.expander("Παράθυρο (viewport)"):
+        col1, col2, col3, col4 = st.columns(4)
+        view_xmin = col1.number_input("Viewport xmin", value=float(min(xs)))
+        view_ymin = col2.number_input("Viewport ymin", value=float(min(ys)))
+        view_xmax = col3.number_input("Viewport xmax", value=float(max(xs)))
+        view_ymax = col4.number_input("Viewport ymax", value=float(max(ys)))
+    window = (view_xmin, view_ymin, view_xmax, view_ymax)
+
+    folium_map = folium.Map(location=[(view_ymin + view_ymax) / 2, (view_xmin + view_xmax) / 2],
+                            zoom_start=12)
+    folium_map.fit_bounds([[view_ymin, view_xmin], [view_ymax, view_xmax]])
+
+    if render_mode == MAP_RENDER_MODES[2] and grid is not None:
+        # Heatmap από τα πλήθη ανά κελί (κέντρο κελιού, βάρος = πλήθος / μέγιστο πλήθος)
+        counts = grid.cell_counts(dataset_label)
+        max_count = max(max(row) for row in counts) or 1
+        heat = []
+        for i, j, cell in grid.iter_cells():
+            if counts[i][j]:
+                heat.append([(cell.mbr.ymin + cell.mbr.ymax) / 2, (cell.mbr.xmin + cell.mbr.xmax) / 2,
+                             counts[i][j] / max_count])
+        HeatMap(heat, radius=25).add_to(folium_map)
+        st.caption(f"Heatmap από {len(heat)} κελιά ({sum(map(sum, counts))} αντικείμενα).")
+    else:
+        if grid is not None:
+            sample = grid.sample_objects(dataset_label, max_points, window)
+        else:
+            inside = [p for p in all_points
+                      if view_xmin <= p.xmin <= view_xmax and view_ymin <= p.ymin <= view_ymax]
+            sample = inside[::-(-len(inside) // max_points) or 1]
+        st.caption(f"Εμφανίζονται {len(sample)} από {len(all_points)} σημεία.")
 
-    # Μπλε markers = all_points
-    for p in all_points:
-        lat = p.ymin
-        lon = p.xmin
-        popup_text = f"ID: {p.id}"
-        folium.Marker(
-            [lat, lon],
-            popup=popup_text,
-            icon=folium.Icon(color='blue', icon='info-sign')
-        ).add_to(folium_map)
+        if render_mode == MAP_RENDER_MODES[1]:
+            FastMarkerCluster([[p.ymin, p.xmin] for p in sample]).add_to(folium_map)
+        else:
+            # Μπλε markers = δείγμα των all_points
+            for p in sample:
+                folium.Marker(
+                    [p.ymin, p.xmin],
+                    popup=f"ID: {p.id}",
+                    icon=folium.Icon(color='blue', icon='info-sign')
+                ).add_to(folium_map)
 
     # Κόκκινα markers = skyline_points
     if skyline_points:
-        for sp in skyline_points:
+        for sp in skyline_points[:max_points]:
             lat = sp.ymin
             lon = sp.xmin
             popup_text = f"Skyline ID: {sp.id}"
@@ -118,7 +420,41 @@ def display_map(all_points, skyline_points=None):
                 icon=folium.Icon(color='red', icon='star')
             ).add_to(folium_map)
 
-    st_folium(folium_map, width=700, height=500)
+    st_folium(folium_map, width=700, height=500, returned_objects=[])
+
+
+def fresh_skyline_id(ms):
+    """
+    :param ms: Το MaintainedSkyline της συνεδρίας.
+    :return: Ένα ID της μορφής "new<n>" που δεν υπάρχει ακόμη στο Grid του.
+    """
+    existing = {obj.id for obj in ms.grid.get_dataset('default')}
+    n = 1
+    while f"new{n}" in existing:
+        n += 1
+    return f"new{n}"
+
+
+def insert_into_skyline():
+    """
+    Callback (on_click) του κουμπιού Insert στην ενημέρωση Skyline. Τρέχει πριν
+    ξανασχεδιαστεί η σελίδα, οπότε μετά από επιτυχή εισαγωγή το πεδίο ID δείχνει ήδη
+    νέο, αχρησιμοποίητο ID. Το μήνυμα (σφάλμα ή στατιστικά) αφήνεται στο
+    st.session_state["ms_message"] για να εμφανιστεί κάτω από το κουμπί.
+    """
+    state = st.session_state
+    ms = state["maintained_skyline"]
+    new_id = state["ms_new_id"]
+    xmin, ymin, xmax, ymax = state["ms_xmin"], state["ms_ymin"], state["ms_xmax"], state["ms_ymax"]
+
+    if xmin > xmax or ymin > ymax:
+        state["ms_message"] = ("error", "Μη έγκυρο ορθογώνιο (xmin > xmax ή ymin > ymax).")
+    elif any(obj.id == new_id for obj in ms.grid.get_dataset('default')):
+        state["ms_message"] = ("error", f"Υπάρχει ήδη ορθογώνιο με ID '{new_id}'.")
+    else:
+        ms.insert(MBR(new_id, xmin, ymin, xmax, ymax))
+        state["ms_message"] = ("info", ms.stats_str)
+        state["ms_new_id"] = fresh_skyline_id(ms)
 
 
 def main():
@@ -144,7 +480,14 @@ def main():
       4) **Spatial Join PBSM**: Ελέγχει τομή μεταξύ συνόλων A,B μέσω Partition Based Spatial Merge.
       5) **Naive Spatial Join**: Αφελής προσέγγιση για Join, εξετάζοντας κάθε ζεύγος (A,B).
       6) **Skyline Query με Grid**: Βρίσκει αντικείμενα που δεν κυριαρχούνται από κανένα άλλο.
+      7) **Distance Join (ε) με Grid**: Βρίσκει όλα τα ζεύγη (A,B) που απέχουν το πολύ ε.
+      8) **Αυτόματο Spatial Join**: Ο optimizer επιλέγει αλγόριθμο (Naive, Plane Sweep, PBSM) και m.
+      9) **Multi-way Spatial Join**: Βρίσκει k-άδες με κοινή τομή από 3 ή περισσότερα σύνολα.
+      10) **Self Spatial Join**: Βρίσκει τις επικαλύψεις μέσα σε ένα σύνολο (κάθε ζεύγος μία φορά).
+      11) **k-skyband / Top-k Dominating**: Αντικείμενα με λιγότερους από k κυρίαρχους / τα k που κυριαρχούν τα περισσότερα.
     
+    Για τα 3, 4 και 6 μπορούμε να επιλέξουμε από την πλαϊνή μπάρα ευρετήριο **Grid** ή **R-tree** (STR bulk loading).
+
     Σε κάθε επιλογή μπορούμε να **φορτώσουμε** ή **δημιουργήσουμε** datasets,
     να πάρουμε **αποτελέσματα** και **στατιστικά**, και προαιρετικά 
     να τα **κατεβάσουμε** ή να τα **προβάλουμε** πάνω σε διαδραστικό χάρτη (Folium).
@@ -158,9 +501,21 @@ def main():
         xU = st.number_input("xU", value=100.0)
         yU = st.number_input("yU", value=100.0)
         m = st.number_input("m (διαμερίσεις)", min_value=1, value=10)
+        curve = st.selectbox("Διάταξη κελιών / αντικειμένων", ["row", "z", "hilbert"],
+                             help="Z-order / Hilbert: γειτονικά κελιά και αντικείμενα αποθηκεύονται διαδοχικά.")
         if st.button("Create/Reset Grid"):
-            st.session_state["grid"] = Grid(xL, yL, xU, yU, m)
-            st.success(f"Δημιουργήθηκε νέο Grid με m={m} [{xL},{yL}] - [{xU},{yU}]")
+            st.session_state["grid"] = Grid(xL, yL, xU, yU, m, curve=curve)
+            st.success(f"Δημιουργήθηκε νέο Grid με m={m} [{xL},{yL}] - [{xU},{yU}], διάταξη '{curve}'")
+
+        st.header("Ευρετήριο")
+        index_type = st.selectbox("Τύπος ευρετηρίου (k-NN, PBSM, Skyline)", ["Grid", "R-tree"])
+        node_capacity = st.number_input("Χωρητικότητα κόμβου R-tree", min_value=2, value=16)
+
+        st.header("Εξαγωγή αποτελεσμάτων")
+        st.selectbox("Μορφή αρχείου", ResultExport.FORMATS, key="export_format",
+                     help="csv.gz: συμπιεσμένο CSV · parquet: στηλοθετημένη δυαδική μορφή (pyarrow).")
+
+        jobs_panel()
 
     # Αν δεν έχει οριστεί Grid στο session_state, δημιουργούμε ένα default
     if "grid" not in st.session_state:
@@ -175,7 +530,12 @@ def main():
         "3. Εκτέλεση k-NN Αναζήτησης με Grid",
         "4. Εκτέλεση Spatial Join με PBSM",
         "5. Εκτέλεση Naive Spatial Join",
-        "6. Εκτέλεση Skyline Query με Grid"
+        "6. Εκτέλεση Skyline Query με Grid",
+        "7. Εκτέλεση Distance Join (ε) με Grid",
+        "8. Αυτόματο Spatial Join (cost-based optimizer)",
+        "9. Εκτέλεση Multi-way Spatial Join με Grid",
+        "10. Εκτέλεση Self Spatial Join (επικαλύψεις σε ένα σύνολο)",
+        "11. k-skyband / Top-k Dominating με Grid"
     ]
     choice = st.selectbox("Επίλεξε ενέργεια:", menu)
 
@@ -189,24 +549,50 @@ def main():
         dataset_label = st.selectbox("Label dataset", ["A", "B", "default"])
         max_width = st.number_input("Μέγιστο πλάτος", min_value=0.0, value=1.0)
         max_height = st.number_input("Μέγιστο ύψος", min_value=0.0, value=1.0)
+        seed = st.number_input("Seed (0 = τυχαίο)", min_value=0, value=0, step=1)
+
+        distribution = st.selectbox("Κατανομή θέσεων", PointGeneratorUnif.DISTRIBUTIONS)
+        clusters, spread, zipf_s = 8, 0.05, 1.0
+        if distribution in ("gaussian", "zipf"):
+            clusters = st.number_input("Πλήθος συστάδων", min_value=1, value=8, step=1)
+        if distribution == "zipf":
+            zipf_s = st.number_input("Εκθέτης Zipf", min_value=0.0, value=1.0)
+        if distribution != "uniform":
+            spread = st.number_input("Διασπορά (ποσοστό του πλαισίου)", min_value=0.001, value=0.05, format="%.3f")
+
+        size_mix = None
+        if st.checkbox("Μίξη μεγεθών (μικρά + μεγάλα ορθογώνια)"):
+            large_share = st.slider("Ποσοστό μεγάλων ορθογωνίων", 0.0, 1.0, 0.1)
+            large_width = st.number_input("Μέγιστο πλάτος μεγάλων", min_value=0.0, value=max_width * 10)
+            large_height = st.number_input("Μέγιστο ύψος μεγάλων", min_value=0.0, value=max_height * 10)
+            size_mix = [(1 - large_share, max_width, max_height), (large_share, large_width, large_height)]
 
         if st.button("Δημιουργία & Λήψη"):
             # 1. Φτιάχνουμε generator όπως πριν, (μπορείς να αγνοήσεις το self.filename αν δε το χρησιμοποιείς)
             generator = PointGeneratorUnif(
                 filename="ignored.csv",  # ή απλά κάτι placeholder
                 xL=grid.xL, yL=grid.yL,
-                xU=grid.xU, yU=grid.yU
+                xU=grid.xU, yU=grid.yU,
+                seed=int(seed) or None
             )
 
             try:
-                # 2. Παίρνουμε το CSV σαν string από την in_memory μέθοδο
-                csv_data = generator.generate_rectangles_in_memory(
+                # 2. Παράγουμε το CSV σε κομμάτια (NumPy) μέσα σε ένα in-memory buffer
+                buffer = io.StringIO()
+                generator.generate_rectangles_chunked(
                     n=num_rect,
+                    target=buffer,
                     include_id=True,
                     dataset_label=dataset_label,
                     max_width=max_width,
-                    max_height=max_height
+                    max_height=max_height,
+                    distribution=distribution,
+                    clusters=int(clusters),
+                    spread=spread,
+                    zipf_s=zipf_s,
+                    size_mix=size_mix
                 )
+                csv_data = buffer.getvalue()
 
                 # 3. Ενημερώνουμε το χρήστη
                 st.success(f"Δημιουργήθηκαν {num_rect} ορθογώνια σε CSV μορφή in-memory.")
@@ -230,34 +616,22 @@ def main():
         st.subheader("Εκτέλεση Linear Scan k-NN")
         uploaded_file = st.file_uploader("Φόρτωσε CSV (ID,xmin,ymin,xmax,ymax)", type="csv")
         if uploaded_file:
-            temp_file = "temp_linear.csv"
-            with open(temp_file, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            st.success(f"Το αρχείο ανέβηκε ως {temp_file}.")
-
             qx = st.number_input("x (query)", value=10.0)
             qy = st.number_input("y (query)", value=10.0)
             k = st.number_input("k (κοντινότεροι γείτονες)", min_value=1, value=3)
 
             if st.button("Εκτέλεση Linear Scan"):
-                try:
-                    ls = LinearScan(temp_file)
-                    results, lscan_stats = ls.knn(qx, qy, k)
+                uploaded_file.seek(0)
+                ls = LinearScan(uploaded_file)
+                results, lscan_stats = ls.knn(qx, qy, k)
 
-                    st.write(f"Βρέθηκαν {len(results)} κοντινότεροι γείτονες:")
-                    st.write(lscan_stats)
+                st.write(f"Βρέθηκαν {len(results)} κοντινότεροι γείτονες:")
+                st.write(lscan_stats)
 
-                    for dist, obj in results:
-                        st.write(f"{obj} - dist={dist:.4f}")
+                for dist, obj in results:
+                    st.write(f"{obj} - dist={dist:.4f}")
 
-                    save_results(results, "Linear Scan", stats=lscan_stats)
-
-                finally:
-                    try:
-                        os.remove(temp_file)
-                        st.info(f"Διαγράφηκε προσωρινό αρχείο '{temp_file}'.")
-                    except FileNotFoundError:
-                        pass
+                save_results(results, "Linear Scan", stats=lscan_stats)
         else:
             st.info("Φόρτωσε ένα CSV για να κάνουμε Linear Scan.")
 
@@ -269,36 +643,50 @@ def main():
         uploaded_file = st.file_uploader("Φόρτωσε CSV (ID,xmin,ymin,xmax,ymax) για Grid", type="csv")
 
         if uploaded_file:
-            temp_file = "temp_knn.csv"
-            with open(temp_file, "wb") as f:
-                f.write(uploaded_file.getbuffer())
-            st.success(f"Το αρχείο ανέβηκε ως {temp_file}.")
-
             qx = st.number_input("x (query)", value=10.0)
             qy = st.number_input("y (query)", value=10.0)
             k = st.number_input("k γείτονες:", min_value=1, value=3)
+            background = st.checkbox("Εκτέλεση στο παρασκήνιο (batch πολλών query points, Grid)",
+                                     key="knn_background")
+            if background:
+                batch_text = st.text_area("Query points (x,y ανά γραμμή)", value=f"{qx},{qy}")
 
             if st.button("Φόρτωση + k-NN"):
-                try:
-                    grid.load(temp_file, dataset_label="default")
-                    st.success("Το dataset φορτώθηκε στο Grid (default).")
-
-                    results, knn_stats = kNN.knn(grid, qx, qy, k)
-
-                    st.write(f"Βρέθηκαν {len(results)} γείτονες:")
-                    st.write(knn_stats)
-
-                    for dist, obj in results:
-                        st.write(f"{obj} - dist={dist:.4f}")
+                data_grid = load_grid(grid, [("default", uploaded_file)])
+                st.success("Το dataset φορτώθηκε στο Grid (default).")
 
-                    save_results(results, "k-NN", stats=knn_stats)
-
-                finally:
+                if background:
                     try:
-                        os.remove(temp_file)
-                        st.info(f"Διαγράφηκε προσωρινό αρχείο '{temp_file}'.")
-                    except FileNotFoundError:
-                        pass
+                        queries = [tuple(float(v) for v in line.split(","))
+                                   for line in batch_text.splitlines() if line.strip()]
+                    except ValueError:
+                        st.error("Κάθε γραμμή πρέπει να έχει τη μορφή x,y.")
+                        st.stop()
+                    if any(len(q) != 2 for q in queries):
+                        st.error("Κάθε γραμμή πρέπει να έχει τη μορφή x,y.")
+                        st.stop()
+                    submit_job("k-NN Batch", kNN.knn_batch, data_grid, queries, k)
+
+                optimizer = QueryOptimizer(data_grid.xL, data_grid.yL, data_grid.xU, data_grid.yU)
+                plan, plan_report = optimizer.choose_knn(data_grid.get_dataset("default"), k)
+                if plan['m'] != data_grid.m:
+                    st.info(f"Ο optimizer προτείνει m={plan['m']} για αυτό το dataset (τρέχον m={data_grid.m}).")
+                st.write(plan_report)
+
+                if index_type == "R-tree":
+                    rtree = RTree(node_capacity)
+                    rtree.add_dataset(data_grid.get_dataset("default"), "default")
+                    results, knn_stats = rtree.knn(qx, qy, k)
+                else:
+                    results, knn_stats = kNN.knn(data_grid, qx, qy, k)
+
+                st.write(f"Βρέθηκαν {len(results)} γείτονες:")
+                st.write(knn_stats)
+
+                for dist, obj in results:
+                    st.write(f"{obj} - dist={dist:.4f}")
+
+                save_results(results, "k-NN", stats=knn_stats)
         else:
             st.info("Φόρτωσε CSV για k-NN με Grid.")
 
@@ -311,32 +699,45 @@ def main():
         fileB = st.file_uploader("CSV για σύνολο B", type="csv", key="pbsmB")
 
         if fileA and fileB:
-            tempA = "temp_pbsmA.csv"
-            tempB = "temp_pbsmB.csv"
-            with open(tempA, "wb") as f:
-                f.write(fileA.getbuffer())
-            with open(tempB, "wb") as f:
-                f.write(fileB.getbuffer())
-            st.success("Αρχεία A,B φορτώθηκαν προσωρινά.")
+            output_mode = st.selectbox("Έξοδος join", JOIN_OUTPUT_MODES, key="pbsm_output")
+            # Ο παράλληλος PBSM επιστρέφει μόνο λίστα ζευγών (όχι sink) και δεν αφορά το R-tree
+            parallel_allowed = output_mode == JOIN_OUTPUT_MODES[0] and index_type == "Grid"
+            workers = st.number_input("Workers (1 = σειριακός PBSM)", min_value=1,
+                                      value=1, max_value=os.cpu_count() or 1,
+                                      disabled=not parallel_allowed,
+                                      help="Διαθέσιμο μόνο με ευρετήριο Grid και έξοδο λίστα ζευγών.")
+            if not parallel_allowed:
+                workers = 1
+            background = st.checkbox("Εκτέλεση στο παρασκήνιο", key="pbsm_background",
+                                     help="Σειριακός PBSM με Grid και έξοδο λίστα ζευγών.")
 
             if st.button("Φόρτωση + PBSM"):
-                try:
-                    grid.load(tempA, dataset_label='A')
-                    grid.load(tempB, dataset_label='B')
-                    pbsmsj = SpatialJoinPBSM(grid)
-                    results, pbsm_stats = pbsmsj.execute_join()
+                data_grid = load_grid(grid, [('A', fileA), ('B', fileB)])
+                if background and index_type == "Grid" and workers == 1 and output_mode == JOIN_OUTPUT_MODES[0]:
+                    submit_job("PBSM", SpatialJoinPBSM(data_grid).execute_join)
+                elif background:
+                    st.warning("Στο παρασκήνιο εκτελείται μόνο ο σειριακός PBSM με Grid και "
+                               "έξοδο λίστα ζευγών· εκτέλεση τώρα.")
+
+                if index_type == "R-tree":
+                    rtree = RTree(node_capacity)
+                    rtree.add_dataset(data_grid.get_dataset('A'), 'A')
+                    rtree.add_dataset(data_grid.get_dataset('B'), 'B')
+                    execute_join = functools.partial(rtree.spatial_join, 'A', 'B')
+                elif workers > 1:
+                    execute_join = ParallelSpatialJoinPBSM(data_grid, workers=workers).execute_join
+                else:
+                    execute_join = SpatialJoinPBSM(data_grid).execute_join
+
+                if output_mode != JOIN_OUTPUT_MODES[0]:
+                    run_join_with_sink(execute_join, output_mode, "PBSM", data_grid)
+                else:
+                    results, pbsm_stats = execute_join()
 
                     st.write(f"Αποτελέσματα PBSM: {len(results)} ζεύγη.")
                     st.write(pbsm_stats)
 
                     save_results(results, "PBSM", stats=pbsm_stats)
-                finally:
-                    for tmp in [tempA, tempB]:
-                        try:
-                            os.remove(tmp)
-                            st.info(f"Διαγράφηκε προσωρινό αρχείο '{tmp}'.")
-                        except FileNotFoundError:
-                            pass
         else:
             st.info("Παρακαλώ φόρτωσε 2 αρχεία (A,B) για PBSM.")
 
@@ -349,33 +750,34 @@ def main():
         fileB = st.file_uploader("CSV για σύνολο B", type="csv", key="naiveB")
 
         if fileA and fileB:
-            tempA = "temp_naiveA.csv"
-            tempB = "temp_naiveB.csv"
-            with open(tempA, "wb") as f:
-                f.write(fileA.getbuffer())
-            with open(tempB, "wb") as f:
-                f.write(fileB.getbuffer())
-            st.success("Αρχεία A,B φορτώθηκαν προσωρινά.")
+            output_mode = st.selectbox("Έξοδος join", JOIN_OUTPUT_MODES, key="naive_output")
+            vectorised = st.checkbox("Vectorised block-nested-loop (NumPy)", value=True)
+            memory_budget = st.number_input("Μνήμη ανά μπλοκ σύγκρισης (MB)", min_value=1, value=64)
+            background = st.checkbox("Εκτέλεση στο παρασκήνιο", key="naive_background",
+                                     help="Μόνο με έξοδο λίστα ζευγών.")
 
             if st.button("Φόρτωση + Naive Join"):
-                try:
-                    grid.load(tempA, 'A')
-                    grid.load(tempB, 'B')
-                    naive_sj = NaiveSpatialJoin(grid.get_dataset('A'), grid.get_dataset('B'))
-                    results, naive_stats = naive_sj.execute_join()
+                data_grid = load_grid(grid, [('A', fileA), ('B', fileB)])
+                naive_sj = NaiveSpatialJoin(data_grid.get_dataset('A'), data_grid.get_dataset('B'))
+                if vectorised:
+                    execute_join = functools.partial(naive_sj.execute_join_blocked, memory_budget)
+                else:
+                    execute_join = naive_sj.execute_join
+
+                if background and output_mode == JOIN_OUTPUT_MODES[0]:
+                    submit_job("Naive", execute_join)
+                elif background:
+                    st.warning("Στο παρασκήνιο εκτελείται μόνο η έξοδος λίστα ζευγών· εκτέλεση τώρα.")
+
+                if output_mode != JOIN_OUTPUT_MODES[0]:
+                    run_join_with_sink(execute_join, output_mode, "Naive", data_grid)
+                else:
+                    results, naive_stats = execute_join()
 
                     st.write(f"Naive αποτελέσματα: {len(results)}")
                     st.write(naive_stats)
 
                     save_results(results, "Naive", stats=naive_stats)
-
-                finally:
-                    for tmp in [tempA, tempB]:
-                        try:
-                            os.remove(tmp)
-                            st.info(f"Διαγράφηκε προσωρινό αρχείο '{tmp}'.")
-                        except FileNotFoundError:
-                            pass
         else:
             st.info("Παρακαλώ φόρτωσε αρχεία για A,B.")
 
@@ -387,58 +789,289 @@ def main():
         fileSky = st.file_uploader("CSV για Skyline", type="csv")
 
         if fileSky:
-            temp_file = "temp_sky.csv"
-            with open(temp_file, "wb") as f:
-                f.write(fileSky.getbuffer())
-            st.success(f"CSV φορτώθηκε προσωρινά ως {temp_file}")
+            sky_method = st.radio("Αλγόριθμος Skyline (Grid)",
+                                  ["Grid (παράκαμψη κελιών)", "Sort-based (ταξινόμηση + σάρωση)",
+                                   "Progressive (BBS, εμφάνιση σημείων μόλις βρεθούν)",
+                                   "Parallel (partitions σε worker processes)",
+                                   "Vectorised (NumPy, κατά μπλοκ)"])
+            sky_dims = st.number_input("Διαστάσεις (2 = xmin, ymin· περισσότερες = επιπλέον στήλες του CSV)",
+                                       min_value=2, value=2)
+            use_window = st.checkbox("Skyline μόνο μέσα σε παράθυρο (viewport)")
+            if use_window:
+                col1, col2, col3, col4 = st.columns(4)
+                win_xmin = col1.number_input("Παράθυρο xmin", value=grid.xL)
+                win_ymin = col2.number_input("Παράθυρο ymin", value=grid.yL)
+                win_xmax = col3.number_input("Παράθυρο xmax", value=grid.xU)
+                win_ymax = col4.number_input("Παράθυρο ymax", value=grid.yU)
+            sky_workers = st.number_input("Workers (Parallel Skyline)", min_value=1,
+                                          value=os.cpu_count() or 1, max_value=os.cpu_count() or 1)
+            background = st.checkbox("Εκτέλεση στο παρασκήνιο", key="sky_background",
+                                     help="Αλγόριθμος Grid, με ευρετήριο Grid και χωρίς παράθυρο.")
 
             if st.button("Φόρτωση + Skyline"):
-                try:
-                    grid.load(temp_file, dataset_label='default')
-                    sq = SkylineQuery(grid)
+                data_grid = load_grid(grid, [('default', fileSky)])
+                available_dims = len(data_grid.attribute_names.get('default', [])) or 2
+                if sky_dims > available_dims:
+                    st.error(f"Το CSV έχει μόνο {available_dims} διαστάσεις για Skyline "
+                             f"({', '.join(data_grid.attribute_names.get('default', []))}).")
+                    st.stop()
+                if background and sky_method.startswith("Grid") and index_type == "Grid" and not use_window:
+                    submit_job("Skyline", SkylineQuery(data_grid, sky_dims).sky_query)
+                elif background:
+                    st.warning("Στο παρασκήνιο εκτελείται μόνο ο αλγόριθμος Grid (ευρετήριο Grid, "
+                               "χωρίς παράθυρο)· εκτέλεση τώρα.")
+
+                if use_window:
+                    skyline_points, sky_stats = SkylineQuery(data_grid, sky_dims).sky_query_window(
+                        win_xmin, win_ymin, win_xmax, win_ymax)
+                elif index_type == "R-tree" and sky_dims == 2:
+                    rtree = RTree(node_capacity)
+                    rtree.add_dataset(data_grid.get_dataset('default'), 'default')
+                    skyline_points, sky_stats = rtree.sky_query()
+                elif sky_method.startswith("Sort-based"):
+                    skyline_points, sky_stats = SkylineQuery(data_grid, sky_dims).sky_query_sorted()
+                elif sky_method.startswith("Vectorised"):
+                    skyline_points, sky_stats = SkylineQuery(data_grid, sky_dims).sky_query_vectorised()
+                elif sky_method.startswith("Parallel"):
+                    skyline_points, sky_stats = ParallelSkylineQuery(data_grid, workers=sky_workers, dims=sky_dims).sky_query()
+                elif sky_method.startswith("Progressive"):
+                    # Τα σημεία εμφανίζονται μόλις επιβεβαιωθούν, χωρίς αναμονή για το τέλος
+                    sq = SkylineQuery(data_grid, sky_dims)
+                    progress_placeholder = st.empty()
+                    table_placeholder = st.empty()
+                    skyline_points = []
+                    last_update = 0.0
+                    for sp in sq.iter_sky_query():
+                        skyline_points.append(sp)
+                        if time.time() - last_update > 0.2:
+                            last_update = time.time()
+                            progress_placeholder.write(f"Skyline points μέχρι στιγμής: {len(skyline_points)}")
+                            table_placeholder.dataframe(pd.DataFrame(
+                                [(p.id, p.xmin, p.ymin, p.xmax, p.ymax) for p in skyline_points],
+                                columns=["ID", "xmin", "ymin", "xmax", "ymax"]
+                            ))
+                    progress_placeholder.empty()
+                    table_placeholder.empty()
+                    sky_stats = sq.stats_str
+                else:
+                    sq = SkylineQuery(data_grid, sky_dims)
                     skyline_points, sky_stats = sq.sky_query()
 
-                    st.write(f"Βρέθηκαν {len(skyline_points)} σημεία Skyline:")
-                    st.write(sky_stats)
-
-                    for sp in skyline_points:
-                        st.write(str(sp))
-
-                    save_results(skyline_points, "Skyline", stats=sky_stats)
-
-                    # Αποθήκευση αντικειμένων για πιθανή προβολή σε χάρτη
-                    df = pd.read_csv(temp_file)
-                    pseudo_list = []
-                    for idx, row in df.iterrows():
-                        class PseudoObj:
-                            def __init__(self, id, xmin, ymin, xmax, ymax):
-                                self.id = id
-                                self.xmin = float(xmin)
-                                self.ymin = float(ymin)
-                                self.xmax = float(xmax)
-                                self.ymax = float(ymax)
-                        p = PseudoObj(row["ID"], row["xmin"], row["ymin"], row["xmax"], row["ymax"])
-                        pseudo_list.append(p)
-
-                    st.session_state["skyline_all_points"] = pseudo_list
-                    st.session_state["skyline_points"] = skyline_points
-
-                finally:
-                    try:
-                        os.remove(temp_file)
-                        st.info(f"Διαγράφηκε προσωρινό αρχείο '{temp_file}'.")
-                    except FileNotFoundError:
-                        pass
+                st.write(f"Βρέθηκαν {len(skyline_points)} σημεία Skyline:")
+                st.write(sky_stats)
+
+                for sp in skyline_points:
+                    st.write(str(sp))
+
+                save_results(skyline_points, "Skyline", stats=sky_stats)
+
+                # Αποθήκευση αντικειμένων για πιθανή προβολή σε χάρτη
+                st.session_state["skyline_all_points"] = data_grid.get_dataset('default')
+                st.session_state["skyline_grid"] = data_grid
+                st.session_state["skyline_points"] = skyline_points
+                if sky_dims == 2 and not use_window:
+                    # Το cached Grid είναι κοινόχρηστο: οι ενημερώσεις γίνονται σε δικό μας αντίγραφο
+                    own_grid = Grid(data_grid.xL, data_grid.yL, data_grid.xU, data_grid.yU,
+                                    data_grid.m, curve=data_grid.curve)
+                    own_grid.add_dataset(list(data_grid.get_dataset('default')), 'default')
+                    st.session_state["maintained_skyline"] = MaintainedSkyline(own_grid, skyline_points)
+                else:
+                    st.session_state.pop("maintained_skyline", None)
         else:
             st.info("Φόρτωσε ένα CSV για Skyline.")
 
+        if "maintained_skyline" in st.session_state:
+            with st.expander("Ενημέρωση Skyline (insert / delete χωρίς πλήρη επανυπολογισμό)"):
+                ms = st.session_state["maintained_skyline"]
+                if "ms_new_id" not in st.session_state:
+                    st.session_state["ms_new_id"] = fresh_skyline_id(ms)
+                st.text_input("ID νέου ορθογωνίου", key="ms_new_id")
+                col1, col2, col3, col4 = st.columns(4)
+                col1.number_input("xmin", value=0.0, key="ms_xmin")
+                col2.number_input("ymin", value=0.0, key="ms_ymin")
+                col3.number_input("xmax", value=1.0, key="ms_xmax")
+                col4.number_input("ymax", value=1.0, key="ms_ymax")
+                st.button("Insert", on_click=insert_into_skyline)
+                if "ms_message" in st.session_state:
+                    level, message = st.session_state.pop("ms_message")
+                    if level == "error":
+                        st.error(message)
+                    else:
+                        st.write(message)
+
+                delete_id = st.text_input("ID ορθογωνίου προς διαγραφή")
+                if st.button("Delete"):
+                    target = next((o for o in ms.grid.get_dataset('default') if o.id == delete_id), None)
+                    if target is None:
+                        st.warning(f"Δεν βρέθηκε ορθογώνιο με ID '{delete_id}'.")
+                    else:
+                        ms.delete(target)
+                        st.write(ms.stats_str)
+
+                st.session_state["skyline_points"] = ms.skyline
+                st.session_state["skyline_all_points"] = ms.grid.get_dataset('default')
+                st.session_state["skyline_grid"] = ms.grid
+                st.write(f"Τρέχον Skyline: {len(ms.skyline)} σημεία.")
+
         show_map = st.checkbox("Προβολή σε χάρτη")
         if show_map:
             if "skyline_all_points" in st.session_state and "skyline_points" in st.session_state:
-                display_map(st.session_state["skyline_all_points"], st.session_state["skyline_points"])
+                display_map(st.session_state["skyline_all_points"], st.session_state["skyline_points"],
+                            grid=st.session_state.get("skyline_grid"))
             else:
                 st.warning("Δεν υπάρχουν δεδομένα για εμφάνιση σε χάρτη.")
 
+    # ------------------------------------
+    # 7. Distance Join (ε)
+    # ------------------------------------
+    elif choice == menu[6]:
+        st.subheader("Distance Join (ε) με Grid")
+        fileA = st.file_uploader("CSV για σύνολο A", type="csv", key="distA")
+        fileB = st.file_uploader("CSV για σύνολο B", type="csv", key="distB")
+
+        if fileA and fileB:
+            epsilon = st.number_input("Απόσταση ε", min_value=0.0, value=1.0)
+            output_mode = st.selectbox("Έξοδος join", JOIN_OUTPUT_MODES, key="dist_output")
+
+            if st.button("Φόρτωση + Distance Join"):
+                data_grid = load_grid(grid, [('A', fileA), ('B', fileB)])
+                dj = DistanceJoin(data_grid, epsilon)
+                if output_mode != JOIN_OUTPUT_MODES[0]:
+                    run_join_with_sink(dj.execute_join, output_mode, "Distance Join", data_grid)
+                else:
+                    results, dist_stats = dj.execute_join()
+
+                    st.write(f"Ζεύγη με απόσταση <= {epsilon}: {len(results)}")
+                    st.write(dist_stats)
+
+                    save_results(results, "Distance Join", stats=dist_stats)
+        else:
+            st.info("Παρακαλώ φόρτωσε 2 αρχεία (A,B) για Distance Join.")
+
+    # ------------------------------------
+    # 8. Αυτόματο Spatial Join (optimizer)
+    # ------------------------------------
+    elif choice == menu[7]:
+        st.subheader("Αυτόματο Spatial Join (cost-based optimizer)")
+        fileA = st.file_uploader("CSV για σύνολο A", type="csv", key="autoA")
+        fileB = st.file_uploader("CSV για σύνολο B", type="csv", key="autoB")
+
+        if fileA and fileB:
+            if st.button("Εκτίμηση + Εκτέλεση"):
+                data_grid = load_grid(grid, [('A', fileA), ('B', fileB)])
+                data_A = data_grid.get_dataset('A')
+                data_B = data_grid.get_dataset('B')
+
+                optimizer = QueryOptimizer(grid.xL, grid.yL, grid.xU, grid.yU)
+                plan, plan_report = optimizer.choose_join(data_A, data_B)
+
+                if plan['algorithm'] == 'pbsm':
+                    auto_grid = Grid(grid.xL, grid.yL, grid.xU, grid.yU, plan['m'], curve=grid.curve)
+                    auto_grid.add_dataset(data_A, 'A')
+                    auto_grid.add_dataset(data_B, 'B')
+                    results, join_stats = SpatialJoinPBSM(auto_grid).execute_join()
+                elif plan['algorithm'] == 'naive':
+                    results, join_stats = NaiveSpatialJoin(data_A, data_B).execute_join_blocked()
+                else:
+                    start_time = time.time()
+                    results = PlaneSweep.spatial_join(data_A, data_B)
+                    join_stats = (
+                        "[PlaneSweep] Στατιστικά:\n"
+                        f" • Ζεύγη που τέμνονται: {len(results)}\n"
+                        f" • Χρόνος εκτέλεσης: {time.time() - start_time:.4f} δευτερόλεπτα.\n"
+                    )
+
+                col_estimate, col_actual = st.columns(2)
+                with col_estimate:
+                    st.write("**Εκτίμηση**")
+                    st.text(plan_report)
+                with col_actual:
+                    st.write("**Πραγματική εκτέλεση**")
+                    st.text(join_stats)
+
+                save_results(results, "Auto Join", stats=plan_report + "\n" + join_stats)
+        else:
+            st.info("Παρακαλώ φόρτωσε 2 αρχεία (A,B) για αυτόματο Spatial Join.")
+
+    # ------------------------------------
+    # 9. Multi-way Spatial Join
+    # ------------------------------------
+    elif choice == menu[8]:
+        st.subheader("Multi-way Spatial Join")
+        files = st.file_uploader("CSV αρχεία (ένα ανά σύνολο, η ετικέτα είναι το όνομα αρχείου)",
+                                 type="csv", accept_multiple_files=True, key="multiway")
+
+        if files and len(files) >= 2:
+            labels = unique_labels([os.path.splitext(f.name)[0] for f in files])
+            st.write(f"Σύνολα: {', '.join(labels)}")
+
+            if st.button("Φόρτωση + Multi-way Join"):
+                data_grid = load_grid(grid, list(zip(labels, files)))
+                mwj = MultiwaySpatialJoin(data_grid, labels)
+                results, mw_stats = mwj.execute_join()
+
+                st.write(f"k-άδες με κοινή τομή: {len(results)}")
+                st.write(mw_stats)
+
+                save_results(results, "Multi-way", stats=mw_stats)
+        else:
+            st.info("Φόρτωσε τουλάχιστον 2 αρχεία CSV για Multi-way Join.")
+
+    # ------------------------------------
+    # 10. Self Spatial Join
+    # ------------------------------------
+    elif choice == menu[9]:
+        st.subheader("Self Spatial Join")
+        fileSelf = st.file_uploader("CSV για Self Join", type="csv", key="selfjoin")
+
+        if fileSelf:
+            output_mode = st.selectbox("Έξοδος join", JOIN_OUTPUT_MODES, key="self_output")
+
+            if st.button("Φόρτωση + Self Join"):
+                data_grid = load_grid(grid, [('default', fileSelf)])
+                ssj = SelfSpatialJoin(data_grid, 'default')
+                if output_mode != JOIN_OUTPUT_MODES[0]:
+                    run_join_with_sink(ssj.execute_join, output_mode, "Self Join",
+                                       data_grid, labels=('default',))
+                else:
+                    results, self_stats = ssj.execute_join()
+
+                    st.write(f"Ζεύγη που επικαλύπτονται: {len(results)}")
+                    st.write(self_stats)
+
+                    save_results(results, "Self Join", stats=self_stats)
+        else:
+            st.info("Φόρτωσε ένα CSV για Self Join.")
+
+    # ------------------------------------
+    # 11. k-skyband / Top-k Dominating
+    # ------------------------------------
+    elif choice == menu[10]:
+        st.subheader("k-skyband / Top-k Dominating (Grid)")
+        fileDom = st.file_uploader("CSV για ερώτημα κυριαρχίας", type="csv", key="dominance")
+
+        if fileDom:
+            query_type = st.radio("Ερώτημα", ["k-skyband", "Top-k Dominating"])
+            k = st.number_input("k", min_value=1, value=3)
+
+            if st.button("Φόρτωση + Εκτέλεση"):
+                data_grid = load_grid(grid, [('default', fileDom)])
+                dq = DominanceQuery(data_grid)
+                if query_type == "k-skyband":
+                    results, dom_stats = dq.k_skyband(k)
+                    st.write(f"Αντικείμενα με λιγότερους από {k} κυρίαρχους: {len(results)}")
+                else:
+                    results, dom_stats = dq.top_k_dominating(k)
+                    st.write(f"Τα {len(results)} αντικείμενα που κυριαρχούν τα περισσότερα:")
+                st.write(dom_stats)
+
+                for count, obj in results:
+                    st.write(f"{obj} - {count}")
+
+                save_results(results, query_type, stats=dom_stats)
+        else:
+            st.info("Φόρτωσε ένα CSV για k-skyband / Top-k Dominating.")
+
 
 if __name__ == "__main__":
     main()
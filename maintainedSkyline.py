@@ -0,0 +1,139 @@
+# maintainedSkyline.py
+
+import time
+from skyline_query import SkylineQuery
+
+class MaintainedSkyline:
+    """
+    Skyline (2D, (xmin, ymin)) που ενημερώνεται σταδιακά όταν το σύνολο 'default'
+    του Grid αλλάζει, χωρίς να ξανατρέχει ολόκληρο το SkylineQuery:
+
+      - insert: το νέο σημείο συγκρίνεται μόνο με τα τρέχοντα Skyline points.
+        Αν δεν κυριαρχείται, μπαίνει στο Skyline και αφαιρούνται όσα κυριαρχεί.
+      - delete: αν το σημείο δεν ήταν στο Skyline, δεν αλλάζει τίποτα. Αν ήταν,
+        εξετάζουμε μόνο την περιοχή που κυριαρχούσε αποκλειστικά: τα κελιά πάνω-δεξιά
+        του σημείου, παραλείποντας όσα κυριαρχούνται από τα υπόλοιπα Skyline points.
+    """
+
+    def __init__(self, grid, skyline_points=None):
+        """
+        Υπολογίζει το αρχικό Skyline του συνόλου 'default'.
+
+        :param grid: Ένα αντικείμενο Grid με φορτωμένο το σύνολο 'default'.
+        :param skyline_points: (Προαιρετικά) ήδη υπολογισμένο Skyline του ίδιου Grid.
+        """
+        self.grid = grid
+        if skyline_points is None:
+            self.skyline, self.stats_str = SkylineQuery(grid).sky_query_sorted()
+        else:
+            self.skyline, self.stats_str = list(skyline_points), ""
+        self.cells_examined = 0
+        self.points_examined = 0
+
+    @staticmethod
+    def dominates(p, x, y):
+        """
+        :return: True αν το σημείο p κυριαρχεί το (x, y) στις 2 διαστάσεις.
+        """
+        return p.xmin <= x and p.ymin <= y and (p.xmin < x or p.ymin < y)
+
+    def is_dominated(self, x, y):
+        """
+        :return: True αν κάποιο τρέχον Skyline point κυριαρχεί το (x, y).
+        """
+        return any(self.dominates(sp, x, y) for sp in self.skyline)
+
+    def insert(self, obj):
+        """
+        Προσθέτει ένα αντικείμενο στο Grid και ενημερώνει το Skyline.
+
+        :param obj: Το νέο αντικείμενο MBR.
+        :return: (added, removed): λίστες με τα σημεία που μπήκαν / βγήκαν από το Skyline.
+        """
+        start_time = time.perf_counter()
+        self.cells_examined = 0
+        self.points_examined = 0
+        self.grid.insert(obj, 'default')
+
+        added, removed = [], []
+        if not self.is_dominated(obj.xmin, obj.ymin):
+            removed = [sp for sp in self.skyline if self.dominates(obj, sp.xmin, sp.ymin)]
+            self.skyline = [sp for sp in self.skyline if not self.dominates(obj, sp.xmin, sp.ymin)]
+            self.skyline.append(obj)
+            added = [obj]
+
+        self._update_stats("insert", obj, added, removed, time.perf_counter() - start_time)
+        return added, removed
+
+    def delete(self, obj):
+        """
+        Διαγράφει ένα αντικείμενο από το Grid και ενημερώνει το Skyline. Αν ήταν Skyline
+        point, νέα Skyline points μπορούν να προκύψουν μόνο από σημεία που κυριαρχούσε
+        (x >= obj.xmin, y >= obj.ymin) και δεν κυριαρχούνται από τα υπόλοιπα Skyline points.
+
+        :param obj: Το αντικείμενο MBR προς διαγραφή.
+        :return: (added, removed): λίστες με τα σημεία που μπήκαν / βγήκαν από το Skyline.
+        """
+        start_time = time.perf_counter()
+        self.cells_examined = 0
+        self.points_examined = 0
+
+        if not self.grid.delete(obj, 'default'):
+            return [], []
+
+        added, removed = [], []
+        if any(sp is obj for sp in self.skyline):
+            self.skyline = [sp for sp in self.skyline if sp is not obj]
+            removed = [obj]
+
+            # Κελιά πάνω-δεξιά του σημείου· τα ακριανά θεωρούνται ανοιχτά προς τα κάτω/αριστερά
+            grid = self.grid
+            inf = float('inf')
+            i_start, j_start = grid.cell_index(obj.xmin, obj.ymin)
+            candidates = []
+            seen = {id(sp) for sp in self.skyline}
+            for i in range(i_start, grid.m):
+                for j in range(j_start, grid.m):
+                    cell = grid.cells[i][j]
+                    corner_x = -inf if i == 0 else cell.mbr.xmin
+                    corner_y = -inf if j == 0 else cell.mbr.ymin
+                    if self.is_dominated(corner_x, corner_y):
+                        continue
+
+                    self.cells_examined += 1
+                    for point in cell.objects.get('default', []):
+                        if id(point) in seen:
+                            continue
+                        seen.add(id(point))
+                        self.points_examined += 1
+                        if (point.xmin >= obj.xmin and point.ymin >= obj.ymin
+                                and not self.is_dominated(point.xmin, point.ymin)):
+                            candidates.append(point)
+
+            # Skyline των υποψηφίων (ταξινόμηση + σάρωση)
+            min_y = inf
+            last = None
+            for point in sorted(candidates, key=lambda o: (o.xmin, o.ymin)):
+                if point.ymin < min_y or (point.ymin == min_y and last == (point.xmin, point.ymin)):
+                    min_y = point.ymin
+                    last = (point.xmin, point.ymin)
+                    added.append(point)
+            self.skyline.extend(added)
+
+        self._update_stats("delete", obj, added, removed, time.perf_counter() - start_time)
+        return added, removed
+
+    def _update_stats(self, operation, obj, added, removed, elapsed_time):
+        """
+        Ενημερώνει το self.stats_str με τα στατιστικά της τελευταίας ενημέρωσης.
+        """
+        self.stats_str = (
+            "[MaintainedSkyline] Στατιστικά:\n"
+            f" • Ενέργεια: {operation} {obj.id}\n"
+            f" • Κελιά εξετάστηκαν: {self.cells_examined}\n"
+            f" • Αντικείμενα εξετάστηκαν: {self.points_examined}\n"
+            f" • Νέα Skyline points: {len(added)}, αφαιρέθηκαν: {len(removed)}\n"
+            f" • Σημεία Skyline: {len(self.skyline)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+        print(self.stats_str)
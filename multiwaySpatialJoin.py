@@ -0,0 +1,120 @@
+# multiwaySpatialJoin.py
+
+import time
+
+class MultiwaySpatialJoin:
+    """
+    Υλοποιεί Multi-way Spatial Join πάνω σε ένα Grid: για k σύνολα (labels) βρίσκει όλες
+    τις k-άδες (o1, ..., ok), μία από κάθε σύνολο, που έχουν κοινή τομή
+    (π.χ. parcels ∩ flood zones ∩ zoning areas).
+
+    Όλα τα σύνολα εξετάζονται μαζί ανά κελί (όπως στον PBSM):
+      - Κελιά όπου κάποιο σύνολο είναι άδειο παραλείπονται.
+      - Σε κάθε κελί, οι k-άδες χτίζονται σταδιακά (backtracking) κρατώντας το ορθογώνιο
+        της κοινής τομής. Μόλις η τομή γίνει κενή, η μερική k-άδα απορρίπτεται.
+      - Μια k-άδα αναφέρεται μόνο στο κελί που περιέχει την κάτω-αριστερή γωνία
+        της κοινής τομής (reference point), ώστε να μην υπάρχουν διπλότυπα.
+    """
+
+    def __init__(self, grid, labels):
+        """
+        Αρχικοποιεί το Multi-way Join.
+
+        :param grid: Ένα αντικείμενο Grid με φορτωμένα όλα τα σύνολα των labels.
+        :param labels: Λίστα με τις ετικέτες των συνόλων (π.χ. ['parcels', 'flood', 'zoning']).
+                       Η σειρά τους καθορίζει τη σειρά των αντικειμένων σε κάθε k-άδα.
+        """
+        self.grid = grid
+        self.labels = list(labels)
+        self.results = []
+        self.skipped_cells = 0
+        self.processed_cells = 0
+        self.partial_checks = 0
+
+    def iter_join(self):
+        """
+        Generator που επιστρέφει μία-μία τις k-άδες με κοινή τομή, ως tuples με
+        τα αντικείμενα στη σειρά των self.labels.
+
+        :return: Generator από tuples (o1, ..., ok).
+        """
+        self.skipped_cells = 0
+        self.processed_cells = 0
+        self.partial_checks = 0
+
+        grid = self.grid
+        k = len(self.labels)
+
+        for i, j, cell in grid.iter_cells():
+            lists = [cell.objects.get(label, []) for label in self.labels]
+
+            # Αν κάποιο σύνολο δεν έχει αντικείμενα στο κελί, δεν υπάρχει k-άδα εδώ
+            if not all(lists):
+                self.skipped_cells += 1
+                continue
+
+            self.processed_cells += 1
+
+            # Ξεκινάμε από τα μικρότερα σύνολα, ώστε οι μερικές k-άδες να
+            # απορρίπτονται όσο νωρίτερα γίνεται.
+            order = sorted(range(k), key=lambda idx: len(lists[idx]))
+            chosen = [None] * k
+
+            def extend(depth, xmin, ymin, xmax, ymax):
+                if depth == k:
+                    if grid.cell_index(xmin, ymin) == (i, j):
+                        yield tuple(chosen)
+                    return
+
+                idx = order[depth]
+                for obj in lists[idx]:
+                    self.partial_checks += 1
+                    new_xmin = max(xmin, obj.xmin)
+                    new_ymin = max(ymin, obj.ymin)
+                    new_xmax = min(xmax, obj.xmax)
+                    new_ymax = min(ymax, obj.ymax)
+                    if new_xmin > new_xmax or new_ymin > new_ymax:
+                        continue
+                    chosen[idx] = obj
+                    yield from extend(depth + 1, new_xmin, new_ymin, new_xmax, new_ymax)
+
+            inf = float('inf')
+            yield from extend(0, -inf, -inf, inf, inf)
+
+    def execute_join(self):
+        """
+        Εκτελεί το Multi-way Spatial Join.
+
+        :return: Ένα tuple (results, stats_str), όπου results είναι λίστα από k-άδες
+                 (στη σειρά των labels) και stats_str κείμενο με στατιστικά.
+        """
+        missing = [label for label in self.labels if label not in self.grid.datasets]
+        if len(self.labels) < 2 or missing:
+            msg = (
+                "[MultiwaySpatialJoin] Χρειάζονται τουλάχιστον 2 φορτωμένα σύνολα. "
+                f"Λείπουν: {missing}"
+            )
+            print(msg)
+            return [], msg
+
+        start_time = time.time()
+
+        self.results = []
+        for combination in self.iter_join():
+            self.results.append(combination)
+
+        elapsed = time.time() - start_time
+
+        stats_str = (
+            "[MultiwaySpatialJoin] Στατιστικά:\n"
+            f" • Σύνολα: {', '.join(self.labels)}\n"
+            f" • Συνολικά κελιά στο grid: {self.grid.m * self.grid.m}\n"
+            f" • Παραλείφθηκαν (skipped) κελιά: {self.skipped_cells}\n"
+            f" • Επεξεργαστήκαμε κελιά: {self.processed_cells}\n"
+            f" • Μερικές k-άδες εξετάστηκαν: {self.partial_checks}\n"
+            f" • k-άδες με κοινή τομή: {len(self.results)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return self.results, stats_str
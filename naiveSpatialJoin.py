@@ -2,12 +2,14 @@
 
 import time
 from MBR import MBR
+from joinSink import ListSink
 
 class NaiveSpatialJoin:
     """
     Υλοποιεί τον αφελή (brute-force) Spatial Join μεταξύ δύο συνόλων ορθογωνίων (A και B).
     Χρησιμοποιεί διπλό βρόχο: για κάθε 'a' στο A, ελέγχει για κάθε 'b' στο B
-    αν τα δύο MBR τέμνονται. Αν ναι, προσθέτει το ζεύγος (a, b) στα αποτελέσματα.
+    αν τα δύο MBR τέμνονται. Αν ναι, προσθέτει το ζεύγος (a, b) στα αποτελέσματα
+    (ή το στέλνει σε ένα JoinSink, βλ. joinSink.py).
     """
 
     def __init__(self, data_A, data_B):
@@ -20,38 +22,168 @@ class NaiveSpatialJoin:
         self.data_A = data_A
         self.data_B = data_B
         self.results = []
+        self.total_checks = 0
 
-    def execute_join(self):
+    def join_row(self, a, emit):
+        """
+        Ελέγχει το a απέναντι σε κάθε b του B και καλεί emit(a, b) για όσα τέμνονται.
+        Κοινός πυρήνας των iter_join και execute_join.
+
+        :param a: Ένα MBR του συνόλου A.
+        :param emit: Συνάρτηση emit(a, b) (π.χ. JoinSink.emit).
+        """
+        for b in self.data_B:
+            if a.intersects(b):
+                emit(a, b)
+        self.total_checks += len(self.data_B)
+
+    def iter_join(self):
+        """
+        Generator που επιστρέφει ένα-ένα τα ζεύγη (a, b) που τέμνονται, χωρίς να τα
+        συσσωρεύει στη μνήμη (κρατούνται μόνο τα ζεύγη ενός a κάθε φορά). Το πλήθος
+        των ελέγχων καταγράφεται στο self.total_checks.
+
+        :return: Generator από tuples (a, b).
+        """
+        self.total_checks = 0
+        pairs = []
+
+        def emit(a, b):
+            pairs.append((a, b))
+
+        for a in self.data_A:
+            self.join_row(a, emit)
+            yield from pairs
+            pairs.clear()
+
+    def execute_join(self, sink=None, progress=None):
         """
         Εκτελεί το Naive Spatial Join με μέτρηση χρόνου εκτέλεσης και πλήθος ελέγχων:
 
         1. Διατρέχει κάθε MBR 'a' στη λίστα A.
         2. Για το καθένα, διατρέχει κάθε MBR 'b' στη λίστα B.
-        3. Ελέγχει αν a.intersects(b). Αν ναι, προσθέτει (a, b) στα αποτελέσματα.
-        4. Επιστρέφει την τελική λίστα αποτελεσμάτων μαζί με μια συμβολοσειρά στατιστικών.
+        3. Ελέγχει αν a.intersects(b). Αν ναι, στέλνει το (a, b) στο sink.
+        4. Επιστρέφει το αποτέλεσμα του sink μαζί με μια συμβολοσειρά στατιστικών.
 
-        :return: Ένα tuple (results_list, stats_str), όπου:
-            - results_list: λίστα (a, b) για όσα ζεύγη τέμνονται.
+        :param sink: (Προαιρετικά) ένα JoinSink που δέχεται τα ζεύγη, π.χ. CSVPairSink
+                     (εγγραφή σε αρχείο), CountSink (μόνο πλήθος) ή AggregateSink
+                     (πλήθος/εμβαδόν ανά αντικείμενο A). Αν δεν δοθεί, τα ζεύγη
+                     κρατούνται σε λίστα (self.results).
+        :param progress: (Προαιρετικά) callback progress(done, total) με τα αντικείμενα A
+                         που εξετάστηκαν / συνολικά (βλ. jobRunner.Job.report).
+        :return: Ένα tuple (results, stats_str), όπου:
+            - results: λίστα (a, b) για όσα ζεύγη τέμνονται, ή ό,τι επιστρέφει το sink.result()
+              (π.χ. το όνομα του αρχείου εξόδου).
             - stats_str: συμβολοσειρά με στατιστικά (π.χ. πλήθος ελέγχων, χρόνος).
         """
+        if sink is None:
+            self.results = []
+            sink = ListSink(self.results)
+
         start_time = time.time()
-        total_checks = 0  # Πόσα ζεύγη (a, b) εξετάστηκαν
 
-        for a in self.data_A:
-            for b in self.data_B:
-                total_checks += 1
-                if a.intersects(b):
-                    self.results.append((a, b))
+        # Η join_row καλεί απευθείας το sink.emit, ώστε οι λειτουργίες μέτρησης (CountSink,
+        # AggregateSink) να μη δημιουργούν καθόλου tuples ζευγών.
+        self.total_checks = 0
+        n_A = len(self.data_A)
+        for done, a in enumerate(self.data_A):
+            if progress:
+                progress(done, n_A)
+            self.join_row(a, sink.emit)
+        sink.close()
+        if progress:
+            progress(n_A, n_A)
 
         elapsed = time.time() - start_time
-        join_count = len(self.results)
+        join_count = sink.count
 
         stats_str = (
             "[NaiveSpatialJoin] Στατιστικά:\n"
-            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {total_checks}\n"
+            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {self.total_checks}\n"
             f" • Ζεύγη που τέμνονται: {join_count}\n"
             f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
         )
 
         print(stats_str)
-        return self.results, stats_str
+        return sink.result(), stats_str
+
+    def execute_join_blocked(self, memory_budget_mb=64, sink=None, progress=None):
+        """
+        Εκτελεί το ίδιο Naive Spatial Join ως vectorised block-nested-loop με NumPy.
+        Τα A και B μετατρέπονται σε πίνακες (xmin, ymin, xmax, ymax) και συγκρίνονται
+        ανά μπλοκ (μπλοκ του A × μπλοκ του B) με broadcasting, αντί για |A|·|B|
+        κλήσεις της intersects σε Python. Επιστρέφει τα ίδια ζεύγη με την execute_join.
+
+        Το μέγεθος των μπλοκ επιλέγεται ώστε οι ενδιάμεσοι boolean πίνακες
+        (μέγεθος block_A × block_B) να χωρούν στο memory_budget_mb.
+
+        :param memory_budget_mb: Μέγιστη μνήμη (MB) για τους ενδιάμεσους πίνακες σύγκρισης.
+        :param sink: (Προαιρετικά) ένα JoinSink που δέχεται τα ζεύγη. Αν δεν δοθεί,
+                     τα ζεύγη κρατούνται σε λίστα (self.results).
+        :param progress: (Προαιρετικά) callback progress(done, total) με τα αντικείμενα A
+                         που εξετάστηκαν / συνολικά.
+        :return: Ένα tuple (results, stats_str), όπως η execute_join.
+        """
+        import numpy as np  # μόνο εδώ, ώστε η execute_join να μη φορτώνει το NumPy
+
+        if sink is None:
+            self.results = []
+            sink = ListSink(self.results)
+
+        start_time = time.time()
+
+        n_A = len(self.data_A)
+        n_B = len(self.data_B)
+        coords_A = np.array([(a.xmin, a.ymin, a.xmax, a.ymax) for a in self.data_A],
+                            dtype=np.float64).reshape(n_A, 4)
+        coords_B = np.array([(b.xmin, b.ymin, b.xmax, b.ymax) for b in self.data_B],
+                            dtype=np.float64).reshape(n_B, 4)
+
+        # Περίπου 8 bytes ανά σύγκριση (4 boolean πίνακες + η τελική μάσκα)
+        max_cells = max(1, int(memory_budget_mb * 1024 * 1024 // 8))
+        block_B = max(1, min(n_B, max_cells))
+        block_A = max(1, min(n_A, max_cells // block_B))
+
+        emit = sink.emit
+        blocks = 0
+        for a_start in range(0, n_A, block_A):
+            if progress:
+                progress(a_start, n_A)
+            a_block = coords_A[a_start:a_start + block_A]
+            a_xmin = a_block[:, 0, None]
+            a_ymin = a_block[:, 1, None]
+            a_xmax = a_block[:, 2, None]
+            a_ymax = a_block[:, 3, None]
+
+            for b_start in range(0, n_B, block_B):
+                b_block = coords_B[b_start:b_start + block_B]
+                blocks += 1
+
+                # Ίδια συνθήκη με την MBR.intersects, για όλα τα ζεύγη του μπλοκ μαζί
+                mask = (
+                    (a_xmax >= b_block[:, 0]) &
+                    (a_xmin <= b_block[:, 2]) &
+                    (a_ymax >= b_block[:, 1]) &
+                    (a_ymin <= b_block[:, 3])
+                )
+
+                rows, cols = np.nonzero(mask)
+                for ia, ib in zip(rows.tolist(), cols.tolist()):
+                    emit(self.data_A[a_start + ia], self.data_B[b_start + ib])
+        sink.close()
+        if progress:
+            progress(n_A, n_A)
+
+        self.total_checks = n_A * n_B
+        elapsed = time.time() - start_time
+
+        stats_str = (
+            "[NaiveSpatialJoin] Στατιστικά (vectorised block-nested-loop):\n"
+            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {self.total_checks}\n"
+            f" • Μέγεθος μπλοκ: {block_A} (A) × {block_B} (B), μπλοκ: {blocks}\n"
+            f" • Ζεύγη που τέμνονται: {sink.count}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return sink.result(), stats_str
@@ -0,0 +1,151 @@
+# parallelSkylineQuery.py
+
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from skyline_query import SkylineQuery
+
+
+def _local_skyline(coords):
+    """
+    Υπολογίζει το Skyline μιας λίστας σημείων με προ-ταξινόμηση (όπως η
+    SkylineQuery.sky_query_sorted): σάρωση με το τρέχον ελάχιστο y στις 2 διαστάσεις,
+    Sort-Filter-Skyline για περισσότερες.
+
+    :param coords: Λίστα από tuples συντεταγμένων (ίδιου μήκους).
+    :return: Λίστα με τους δείκτες (στη λίστα coords) των Skyline σημείων.
+    """
+    if not coords:
+        return []
+
+    if len(coords[0]) == 2:
+        result = []
+        min_y = float('inf')
+        last = None
+        for idx in sorted(range(len(coords)), key=coords.__getitem__):
+            x, y = coords[idx]
+            if y < min_y or (y == min_y and last == (x, y)):
+                min_y = y
+                last = (x, y)
+                result.append(idx)
+        return result
+
+    result = []
+    for idx in sorted(range(len(coords)), key=lambda k: (sum(coords[k]), coords[k])):
+        p = coords[idx]
+        dominated = False
+        for s in result:
+            q = coords[s]
+            if q != p and all(a <= b for a, b in zip(q, p)):
+                dominated = True
+                break
+        if not dominated:
+            result.append(idx)
+    return result
+
+
+def _skyline_partition(task):
+    """
+    Εκτελείται σε worker process: υπολογίζει το τοπικό Skyline ενός partition.
+
+    :param task: Tuple (partition_id, coords).
+    :return: Tuple (partition_id, δείκτες των τοπικών Skyline σημείων).
+    """
+    partition_id, coords = task
+    return partition_id, _local_skyline(coords)
+
+
+class ParallelSkylineQuery:
+    """
+    Παράλληλο Skyline με διαίρεση-και-βασίλευση (divide and conquer) πάνω στο Grid:
+
+      1. Τα κελιά χωρίζονται σε blocks x blocks ορθογώνια partitions. Κάθε αντικείμενο
+         ανήκει στο partition του αρχικού του κελιού (αυτό που περιέχει το (xmin, ymin)),
+         ώστε να εξετάζεται μία μόνο φορά.
+      2. Ένα partition Q απορρίπτεται ολόκληρο αν η "πάνω" γωνία (μέγιστες συντεταγμένες)
+         ενός άλλου μη κενού partition P κυριαρχεί την "κάτω" γωνία (ελάχιστες
+         συντεταγμένες) του Q: τότε κάθε σημείο του P κυριαρχεί κάθε σημείο του Q.
+      3. Τα τοπικά Skylines των υπόλοιπων partitions υπολογίζονται σε worker processes.
+      4. Τα τοπικά Skylines συγχωνεύονται με ένα τελικό sort-based Skyline.
+    """
+
+    def __init__(self, grid, workers=None, blocks=None, dims=2):
+        """
+        :param grid: Ένα αντικείμενο Grid με φορτωμένο το σύνολο 'default'.
+        :param workers: Πλήθος worker processes (προεπιλογή: os.cpu_count()).
+        :param blocks: Partitions ανά άξονα (προεπιλογή: ώστε να υπάρχουν ~4 ανά worker).
+        :param dims: Πλήθος διαστάσεων, όπως στην SkylineQuery.
+        """
+        self.grid = grid
+        self.workers = workers or os.cpu_count() or 1
+        self.blocks = blocks or math.ceil(math.sqrt(4 * self.workers))
+        self.blocks = max(1, min(self.blocks, grid.m))
+        self.dims = dims
+
+    def partition_points(self):
+        """
+        Μοιράζει τα αντικείμενα του 'default' στα partitions του αρχικού τους κελιού.
+
+        :return: Λίστα από λίστες αντικειμένων (μία ανά partition, μόνο οι μη κενές).
+        """
+        m = self.grid.m
+        partitions = {}
+        for obj in self.grid.get_dataset('default'):
+            i, j = self.grid.cell_index(obj.xmin, obj.ymin)
+            key = (i * self.blocks // m, j * self.blocks // m)
+            partitions.setdefault(key, []).append(obj)
+        return list(partitions.values())
+
+    def sky_query(self):
+        """
+        Εκτελεί το παράλληλο Skyline.
+
+        :return: (skyline_points, stats_str)
+        """
+        start_time = time.perf_counter()
+        get_coords = SkylineQuery(self.grid, self.dims).get_coords
+
+        partitions = self.partition_points()
+        coords = [[tuple(get_coords(obj)) for obj in part] for part in partitions]
+
+        # Γωνίες κάθε partition, από τις πραγματικές τιμές των σημείων του
+        lows = [tuple(map(min, zip(*c))) for c in coords]
+        highs = [tuple(map(max, zip(*c))) for c in coords]
+
+        def corner_dominates(high, low):
+            return all(h <= l for h, l in zip(high, low)) and high != low
+
+        surviving = [
+            q for q in range(len(partitions))
+            if not any(p != q and corner_dominates(highs[p], lows[q]) for p in range(len(partitions)))
+        ]
+
+        tasks = [(q, coords[q]) for q in surviving]
+        if self.workers <= 1 or len(tasks) <= 1:
+            outcomes = [_skyline_partition(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+                outcomes = list(executor.map(_skyline_partition, tasks))
+
+        # Συγχώνευση των τοπικών Skylines
+        candidates = []
+        for q, local in outcomes:
+            candidates.extend(partitions[q][idx] for idx in local)
+        candidate_coords = [tuple(get_coords(obj)) for obj in candidates]
+        skyline_points = [candidates[idx] for idx in _local_skyline(candidate_coords)]
+
+        elapsed_time = time.perf_counter() - start_time
+
+        stats_str = (
+            "[ParallelSkylineQuery] Στατιστικά:\n"
+            f" • Workers: {self.workers}\n"
+            f" • Partitions ({self.blocks}x{self.blocks} blocks κελιών), μη κενά: {len(partitions)}\n"
+            f" • Απορρίφθηκαν (κυριαρχούνται) partitions: {len(partitions) - len(surviving)}\n"
+            f" • Υποψήφια σημεία από τοπικά Skylines: {len(candidates)}\n"
+            f" • Σημεία Skyline: {len(skyline_points)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+
+        print(stats_str)
+        return skyline_points, stats_str
@@ -0,0 +1,183 @@
+# parallelSpatialJoinPBSM.py
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from grid import Grid
+from joinSink import CSVPairSink
+
+
+def _join_cell_range(task):
+    """
+    Εκτελείται σε worker process: επεξεργάζεται ένα εύρος κελιών του PBSM.
+
+    Για να μην αναφέρεται το ίδιο ζεύγος από πολλά κελιά (ένα MBR μπορεί να
+    ανήκει σε περισσότερα κελιά), εφαρμόζουμε την τεχνική του reference point:
+    ένα ζεύγος (a, b) καταγράφεται μόνο στο κελί που περιέχει την κάτω-αριστερή
+    γωνία της τομής τους. Έτσι δεν χρειάζεται κοινό set μεταξύ των workers.
+
+    :param task: Tuple (worker_id, geometry, cells, output_file), όπου
+                 geometry = (xL, yL, xU, yU, m) και cells λίστα από
+                 (i, j, objects_A, objects_B).
+    :return: Tuple (worker_id, pairs, pairs_checked, join_count). Τα pairs είναι
+             τριάδες (θέση κελιού, δείκτης a, δείκτης b), ή κενή λίστα όταν
+             τα ζεύγη γράφονται στο output_file.
+    """
+    worker_id, geometry, cells, output_file = task
+    xL, yL, xU, yU, m = geometry
+
+    pairs = []
+    pairs_checked = 0
+    join_count = 0
+    sink = CSVPairSink(output_file) if output_file else None
+
+    try:
+        for pos, (i, j, objects_A, objects_B) in enumerate(cells):
+            for ia, a in enumerate(objects_A):
+                for ib, b in enumerate(objects_B):
+                    pairs_checked += 1
+                    if not a.intersects(b):
+                        continue
+
+                    # Reference point: κάτω-αριστερή γωνία της τομής
+                    ref_i = Grid.axis_index(max(a.xmin, b.xmin), xL, xU, m)
+                    ref_j = Grid.axis_index(max(a.ymin, b.ymin), yL, yU, m)
+                    if ref_i != i or ref_j != j:
+                        continue
+
+                    join_count += 1
+                    if sink:
+                        sink.emit(a, b)
+                    else:
+                        pairs.append((pos, ia, ib))
+    finally:
+        if sink:
+            sink.close()
+
+    return worker_id, pairs, pairs_checked, join_count
+
+
+class ParallelSpatialJoinPBSM:
+    """
+    Παράλληλη εκδοχή του SpatialJoinPBSM. Τα κελιά του Grid είναι ανεξάρτητες
+    μονάδες εργασίας, οπότε τα μοιράζουμε σε συνεχόμενα εύρη (ranges) σε worker
+    processes. Η κατανομή γίνεται με βάση το κόστος |A|·|B| κάθε κελιού και όχι
+    με βάση το πλήθος κελιών, ώστε ένα "γεμάτο" κελί να μη φορτώνει έναν μόνο worker.
+    """
+
+    def __init__(self, grid, workers=None, output_prefix=None):
+        """
+        Αρχικοποιεί τον παράλληλο PBSM πάνω σε ένα Grid με φορτωμένα τα σύνολα 'A' και 'B'.
+
+        :param grid: Ένα αντικείμενο Grid με τα datasets 'A' και 'B'.
+        :param workers: Πλήθος worker processes (προεπιλογή: os.cpu_count()).
+        :param output_prefix: (Προαιρετικά) πρόθεμα αρχείων. Αν δοθεί, κάθε worker
+                              γράφει τα ζεύγη του στο '<output_prefix>_<worker>.csv'
+                              αντί να τα επιστρέφει στη μνήμη.
+        """
+        self.grid = grid
+        self.workers = workers or os.cpu_count() or 1
+        self.output_prefix = output_prefix
+        self.results = []
+        self.output_files = []
+
+    def partition_cells(self):
+        """
+        Χωρίζει τα κελιά που έχουν αντικείμενα και από τα δύο σύνολα σε
+        self.workers συνεχόμενα εύρη (με τη σειρά grid.iter_cells), ώστε το άθροισμα
+        |A|·|B| κάθε εύρους να είναι περίπου ίσο.
+
+        :return: Λίστα από λίστες (i, j, objects_A, objects_B), μία ανά worker.
+        """
+        active = []
+        total_cost = 0
+        for i, j, cell in self.grid.iter_cells():
+            objects_A = cell.objects.get('A', [])
+            objects_B = cell.objects.get('B', [])
+            if objects_A and objects_B:
+                active.append((i, j, objects_A, objects_B))
+                total_cost += len(objects_A) * len(objects_B)
+
+        partitions = [[] for _ in range(self.workers)]
+        target = total_cost / self.workers
+        current = 0
+        accumulated = 0
+        for entry in active:
+            partitions[current].append(entry)
+            accumulated += len(entry[2]) * len(entry[3])
+            # Περνάμε στον επόμενο worker όταν ξεπεράσουμε το "μερίδιό" του
+            if accumulated >= target * (current + 1) and current < self.workers - 1:
+                current += 1
+
+        return [p for p in partitions if p]
+
+    def execute_join(self):
+        """
+        Εκτελεί τον παράλληλο PBSM:
+
+        1. Μοιράζει τα ενεργά κελιά σε εύρη ισορροπημένα κατά |A|·|B|.
+        2. Κάθε worker εκτελεί τον διπλό βρόχο στα κελιά του και κρατά μόνο τα
+           ζεύγη των οποίων το reference point ανήκει στο τρέχον κελί.
+        3. Συγχωνεύει τα αποτελέσματα των workers (ή επιστρέφει τα αρχεία τους).
+
+        :return: Ένα tuple (results, stats_str), όπου results είναι λίστα ζευγών (a, b),
+                 ή, αν έχει οριστεί output_prefix, λίστα με τα αρχεία που γράφτηκαν.
+        """
+        if 'A' not in self.grid.datasets or 'B' not in self.grid.datasets:
+            msg = "[ParallelSpatialJoinPBSM] Τα σύνολα 'A' και 'B' πρέπει να φορτωθούν πριν εκτελεστεί ο Spatial Join."
+            print(msg)
+            return [], msg
+
+        start_time = time.time()
+
+        partitions = self.partition_cells()
+        geometry = (self.grid.xL, self.grid.yL, self.grid.xU, self.grid.yU, self.grid.m)
+
+        tasks = []
+        for worker_id, cells in enumerate(partitions):
+            output_file = f"{self.output_prefix}_{worker_id}.csv" if self.output_prefix else None
+            tasks.append((worker_id, geometry, cells, output_file))
+
+        if len(tasks) <= 1:
+            outcomes = [_join_cell_range(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=len(tasks)) as executor:
+                outcomes = list(executor.map(_join_cell_range, tasks))
+
+        # Συγχώνευση: οι workers επιστρέφουν δείκτες, ώστε τα ζεύγη να αναφέρονται
+        # στα αρχικά αντικείμενα MBR του Grid και όχι σε αντίγραφα.
+        self.results = []
+        pairs_checked = 0
+        join_count = 0
+        worker_lines = []
+        for worker_id, pairs, checked, count in outcomes:
+            cells = partitions[worker_id]
+            for pos, ia, ib in pairs:
+                self.results.append((cells[pos][2][ia], cells[pos][3][ib]))
+            pairs_checked += checked
+            join_count += count
+            cost = sum(len(c[2]) * len(c[3]) for c in cells)
+            worker_lines.append(
+                f"   - Worker {worker_id}: {len(cells)} κελιά, κόστος |A|·|B|={cost}, ζεύγη={count}\n"
+            )
+
+        if self.output_prefix:
+            self.output_files = [task[3] for task in tasks]
+
+        elapsed = time.time() - start_time
+
+        stats_str = (
+            "[ParallelSpatialJoinPBSM] Στατιστικά:\n"
+            f" • Συνολικά κελιά στο grid: {self.grid.m * self.grid.m}\n"
+            f" • Επεξεργαστήκαμε κελιά: {sum(len(p) for p in partitions)}\n"
+            f" • Workers: {len(tasks)}\n"
+            + "".join(worker_lines) +
+            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {pairs_checked}\n"
+            f" • Τελικά ζεύγη που τέμνονται: {join_count}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        if self.output_prefix:
+            return self.output_files, stats_str
+        return self.results, stats_str
@@ -1,5 +1,7 @@
 # planeSweep.py
 
+from joinSink import ListSink
+
 class PlaneSweep:
     """
     Υλοποίηση Spatial Join με τη μέθοδο Plane Sweep. Η λογική βασίζεται κυρίως
@@ -8,9 +10,10 @@ class PlaneSweep:
     """
 
     @staticmethod
-    def spatial_join(rectangles_A, rectangles_B):
+    def iter_join(rectangles_A, rectangles_B):
         """
-        Εκτελεί το Plane Sweep για Spatial Join μεταξύ δύο συνόλων ορθογωνίων (A και B).
+        Εκτελεί το Plane Sweep για Spatial Join μεταξύ δύο συνόλων ορθογωνίων (A και B),
+        επιστρέφοντας (ως generator) τα ζεύγη που τέμνονται καθώς εντοπίζονται.
 
         Διαδικασία:
           1. Δημιουργούμε "events" για κάθε ορθογώνιο:
@@ -18,18 +21,21 @@ class PlaneSweep:
              - (A_end, xmax, rect)
              - (B_start, xmin, rect)
              - (B_end, xmax, rect)
-          2. Ταξινομούμε όλα τα events κατά x (και, δευτερευόντως, κατά τύπο event).
+          2. Ταξινομούμε όλα τα events κατά x και, στο ίδιο x, τα start πριν από τα end.
+             Έτσι ορθογώνια που απλώς εφάπτονται (a.xmax == b.xmin) βρίσκονται και τα δύο
+             ενεργά και μετρώνται ως τομή, όπως στην MBR.intersects, και ένα ορθογώνιο
+             μηδενικού πλάτους (xmin == xmax) μπαίνει στην ενεργή λίστα πριν αφαιρεθεί.
           3. Διατηρούμε δύο λίστες ενεργών ορθογωνίων (active_A, active_B).
           4. Για κάθε event:
              - Αν είναι A_start, προσθέτουμε το rect στην active_A, ελέγχοντας τομή με κάθε B στην active_B.
              - Αν είναι A_end, αφαιρούμε το rect από την active_A.
              - Αν είναι B_start, προσθέτουμε το rect στην active_B, ελέγχοντας τομή με κάθε A στην active_A.
              - Αν είναι B_end, αφαιρούμε το rect από την active_B.
-          5. Επιστρέφουμε όλα τα (rectA, rectB) ζεύγη που βρέθηκαν να τέμνονται.
+          5. Επιστρέφουμε (yield) κάθε ζεύγος (rectA, rectB) που βρέθηκε να τέμνεται.
 
         :param rectangles_A: Λίστα από MBRs (σύνολο A).
         :param rectangles_B: Λίστα από MBRs (σύνολο B).
-        :return: Λίστα με ζεύγη (rectA, rectB) που τέμνονται.
+        :return: Generator από ζεύγη (rectA, rectB) που τέμνονται.
         """
         events = []
 
@@ -43,12 +49,11 @@ class PlaneSweep:
             events.append(('B_start', rect.xmin, rect))
             events.append(('B_end', rect.xmax, rect))
 
-        # Ταξινόμηση των events κατά x (και δευτερευόντως κατά event_type)
-        events.sort(key=lambda event: (event[1], event[0]))
+        # Ταξινόμηση των events κατά x (και στο ίδιο x, πρώτα τα start και μετά τα end)
+        events.sort(key=lambda event: (event[1], event[0].endswith('_end')))
 
         active_A = []
         active_B = []
-        result = []
 
         for event in events:
             event_type, x, rect = event
@@ -58,7 +63,7 @@ class PlaneSweep:
                 # Έλεγχος τομής με όλα τα ενεργά B
                 for b in active_B:
                     if PlaneSweep.mbr_intersect(rect, b):
-                        result.append((rect, b))
+                        yield (rect, b)
 
             elif event_type == 'A_end':
                 # Αφαιρούμε το rect από την active_A
@@ -69,13 +74,31 @@ class PlaneSweep:
                 # Έλεγχος τομής με όλα τα ενεργά A
                 for a in active_A:
                     if PlaneSweep.mbr_intersect(a, rect):
-                        result.append((a, rect))
+                        yield (a, rect)
 
             elif event_type == 'B_end':
                 # Αφαιρούμε το rect από την active_B
                 active_B.remove(rect)
 
-        return result
+    @staticmethod
+    def spatial_join(rectangles_A, rectangles_B, sink=None):
+        """
+        Εκτελεί το Plane Sweep (βλ. iter_join) και στέλνει τα ζεύγη σε ένα JoinSink.
+
+        :param rectangles_A: Λίστα από MBRs (σύνολο A).
+        :param rectangles_B: Λίστα από MBRs (σύνολο B).
+        :param sink: (Προαιρετικά) ένα JoinSink (π.χ. CSVPairSink). Αν δεν δοθεί,
+                     τα ζεύγη επιστρέφονται σε λίστα.
+        :return: Λίστα με ζεύγη (rectA, rectB) που τέμνονται, ή το sink.result().
+        """
+        if sink is None:
+            sink = ListSink()
+
+        for a, b in PlaneSweep.iter_join(rectangles_A, rectangles_B):
+            sink.emit(a, b)
+        sink.close()
+
+        return sink.result()
 
     @staticmethod
     def mbr_intersect(rect1, rect2):
@@ -1,14 +1,25 @@
 import random
 import io
+import numpy as np
 
 class PointGeneratorUnif:
     """
     Κλάση που δημιουργεί τυχαία ορθογώνια (MBRs) εντός ενός ορθογωνίου πλαισίου
     [xL, xU] x [yL, yU], και τα αποθηκεύει σε αρχείο CSV ή τα επιστρέφει
     ως in-memory string (ανάλογα με τη μέθοδο που καλείται).
+
+    Με seed τα αποτελέσματα είναι αναπαραγώγιμα. Για μεγάλα benchmarks, η
+    generate_rectangles_chunked παράγει τα ορθογώνια σε κομμάτια με NumPy
+    και τα γράφει μαζικά (CSV ή δυαδικό αρχείο) με σταθερή μνήμη, είτε ομοιόμορφα
+    είτε με ασύμμετρες κατανομές (συστάδες, hotspots, (αντι-)συσχετισμένα) και μίξη μεγεθών.
     """
 
-    def __init__(self, filename, xL=0, yL=0, xU=1, yU=1):
+    # Δυαδική μορφή: κάθε ορθογώνιο είναι 4 little-endian float64 (xmin, ymin, xmax, ymax)
+    BINARY_DTYPE = '<f8'
+
+    DISTRIBUTIONS = ('uniform', 'gaussian', 'zipf', 'correlated', 'anticorrelated')
+
+    def __init__(self, filename, xL=0, yL=0, xU=1, yU=1, seed=None):
         """
         Αρχικοποιεί τη γεννήτρια τυχαίων MBRs.
 
@@ -17,12 +28,48 @@ class PointGeneratorUnif:
         :param yL: Ελάχιστη τιμή y.
         :param xU: Μέγιστη τιμή x.
         :param yU: Μέγιστη τιμή y.
+        :param seed: (Προαιρετικά) seed για αναπαραγώγιμα δεδομένα.
         """
         self.filename = filename
         self.xL = xL
         self.yL = yL
         self.xU = xU
         self.yU = yU
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def _rectangle(self, max_width, max_height):
+        """
+        Δημιουργεί ένα τυχαίο ορθογώνιο εντός των ορίων.
+
+        :return: Tuple (xmin, ymin, xmax, ymax).
+        """
+        w = self.rng.uniform(0, max_width)
+        h = self.rng.uniform(0, max_height)
+
+        if (self.xU - w) < self.xL or (self.yU - h) < self.yL:
+            w = max(0, self.xU - self.xL)
+            h = max(0, self.yU - self.yL)
+
+        xmin = self.rng.uniform(self.xL, self.xU - w)
+        ymin = self.rng.uniform(self.yL, self.yU - h)
+        return xmin, ymin, xmin + w, ymin + h
+
+    def _write_rectangles(self, file, n, include_id, dataset_label, max_width, max_height):
+        """
+        Γράφει επικεφαλίδα και n τυχαία ορθογώνια σε ένα ανοιχτό αρχείο κειμένου.
+        """
+        if include_id:
+            file.write("ID,xmin,ymin,xmax,ymax\n")
+        else:
+            file.write("xmin,ymin,xmax,ymax\n")
+
+        for i in range(1, n + 1):
+            xmin, ymin, xmax, ymax = self._rectangle(max_width, max_height)
+            if include_id:
+                file.write(f"{dataset_label}{i},{xmin},{ymin},{xmax},{ymax}\n")
+            else:
+                file.write(f"{xmin},{ymin},{xmax},{ymax}\n")
 
     def generate_rectangles(self, n, include_id=False, dataset_label='A',
                             max_width=1.0, max_height=1.0):
@@ -37,29 +84,7 @@ class PointGeneratorUnif:
         """
         try:
             with open(self.filename, 'w') as file:
-                if include_id:
-                    file.write("ID,xmin,ymin,xmax,ymax\n")
-                else:
-                    file.write("xmin,ymin,xmax,ymax\n")
-
-                for i in range(1, n + 1):
-                    w = random.uniform(0, max_width)
-                    h = random.uniform(0, max_height)
-
-                    if (self.xU - w) < self.xL or (self.yU - h) < self.yL:
-                        w = max(0, self.xU - self.xL)
-                        h = max(0, self.yU - self.yL)
-
-                    xmin = random.uniform(self.xL, self.xU - w)
-                    ymin = random.uniform(self.yL, self.yU - h)
-                    xmax = xmin + w
-                    ymax = ymin + h
-
-                    if include_id:
-                        obj_id = f"{dataset_label}{i}"
-                        file.write(f"{obj_id},{xmin},{ymin},{xmax},{ymax}\n")
-                    else:
-                        file.write(f"{xmin},{ymin},{xmax},{ymax}\n")
+                self._write_rectangles(file, n, include_id, dataset_label, max_width, max_height)
 
             print(
                 f"Δημιουργήθηκε το αρχείο '{self.filename}' με {n} ορθογώνια εντός "
@@ -86,30 +111,168 @@ class PointGeneratorUnif:
         :return: Ένα string που περιέχει το CSV.
         """
         output = io.StringIO()
+        self._write_rectangles(output, n, include_id, dataset_label, max_width, max_height)
+        return output.getvalue()
 
-        # Επικεφαλίδες
-        if include_id:
-            output.write("ID,xmin,ymin,xmax,ymax\n")
-        else:
-            output.write("xmin,ymin,xmax,ymax\n")
+    def _positions(self, rng, k, distribution, centres, weights, spread):
+        """
+        Παράγει k σχετικές θέσεις (u, v) στο [0, 1]^2 σύμφωνα με την κατανομή.
+        Θέσεις που πέφτουν εκτός [0, 1] ξαναδημιουργούνται (αντί για αποκοπή,
+        που θα συγκέντρωνε σημεία ακριβώς πάνω στα όρια).
 
-        for i in range(1, n + 1):
-            w = random.uniform(0, max_width)
-            h = random.uniform(0, max_height)
+        :return: Tuple (u, v) με πίνακες μήκους k.
+        """
+        if distribution == 'uniform':
+            return rng.random(k), rng.random(k)
 
-            if (self.xU - w) < self.xL or (self.yU - h) < self.yL:
-                w = max(0, self.xU - self.xL)
-                h = max(0, self.yU - self.yL)
+        u = np.empty(k)
+        v = np.empty(k)
+        pending = np.arange(k)
+        while len(pending):
+            r = len(pending)
+            if distribution in ('gaussian', 'zipf'):
+                chosen = centres[rng.choice(len(centres), size=r, p=weights)]
+                u[pending] = chosen[:, 0] + rng.normal(0, spread, r)
+                v[pending] = chosen[:, 1] + rng.normal(0, spread, r)
+            elif distribution == 'correlated':
+                t = rng.random(r)
+                u[pending] = t + rng.normal(0, spread, r)
+                v[pending] = t + rng.normal(0, spread, r)
+            else:  # 'anticorrelated': κοντά στη διαγώνιο u + v = 1
+                t = rng.random(r)
+                u[pending] = t + rng.normal(0, spread, r)
+                v[pending] = 1 - t + rng.normal(0, spread, r)
+            outside = (u[pending] < 0) | (u[pending] > 1) | (v[pending] < 0) | (v[pending] > 1)
+            pending = pending[outside]
 
-            xmin = random.uniform(self.xL, self.xU - w)
-            ymin = random.uniform(self.yL, self.yU - h)
-            xmax = xmin + w
-            ymax = ymin + h
+        return u, v
 
-            if include_id:
-                obj_id = f"{dataset_label}{i}"
-                output.write(f"{obj_id},{xmin},{ymin},{xmax},{ymax}\n")
+    def rectangle_chunks(self, n, max_width=1.0, max_height=1.0, chunk_size=1_000_000,
+                         distribution='uniform', clusters=8, spread=0.05, zipf_s=1.0,
+                         size_mix=None):
+        """
+        Generator που παράγει n τυχαία ορθογώνια σε κομμάτια με NumPy.
+
+        Κατανομές θέσης (της κάτω-αριστερής γωνίας):
+          - 'uniform':        ομοιόμορφα στο πλαίσιο.
+          - 'gaussian':       Gaussian συστάδες γύρω από clusters τυχαία κέντρα, ισοπίθανες.
+          - 'zipf':           όπως η 'gaussian', αλλά η συστάδα r επιλέγεται με βάρος 1 / r^zipf_s
+                              (λίγα "hotspots" συγκεντρώνουν τα περισσότερα ορθογώνια).
+          - 'correlated':     κοντά στη διαγώνιο x = y (λίγα Skyline σημεία).
+          - 'anticorrelated': κοντά στη διαγώνιο x + y = 1 (πολλά Skyline σημεία).
+
+        :param n: Πλήθος ορθογωνίων.
+        :param max_width: Μέγιστο τυχαίο πλάτος.
+        :param max_height: Μέγιστο τυχαίο ύψος.
+        :param chunk_size: Μέγιστο πλήθος ορθογωνίων ανά κομμάτι.
+        :param distribution: Μία από τις self.DISTRIBUTIONS.
+        :param clusters: Πλήθος συστάδων για 'gaussian' / 'zipf'.
+        :param spread: Τυπική απόκλιση του θορύβου, ως ποσοστό του πλαισίου.
+        :param zipf_s: Εκθέτης Zipf για την 'zipf'.
+        :param size_mix: (Προαιρετικά) λίστα (βάρος, max_width, max_height): κάθε ορθογώνιο
+                         παίρνει μέγεθος από μία κλάση, επιλεγμένη με πιθανότητα ανάλογη του βάρους.
+                         Αν δοθεί, αγνοούνται τα max_width / max_height.
+        :return: Generator από πίνακες (k x 4) με στήλες xmin, ymin, xmax, ymax.
+        """
+        if distribution not in self.DISTRIBUTIONS:
+            raise ValueError(f"Άγνωστη κατανομή '{distribution}'. Επιτρεπτές: {self.DISTRIBUTIONS}")
+
+        rng = np.random.default_rng(self.seed)
+        span_x = self.xU - self.xL
+        span_y = self.yU - self.yL
+
+        # Κέντρα και βάρη συστάδων, κοινά για όλα τα κομμάτια
+        centres = weights = None
+        if distribution in ('gaussian', 'zipf'):
+            centres = rng.random((max(1, clusters), 2))
+            ranks = np.arange(1, len(centres) + 1)
+            weights = 1.0 / ranks ** (zipf_s if distribution == 'zipf' else 0)
+            weights /= weights.sum()
+
+        if size_mix:
+            mix = np.array(size_mix, dtype=float)
+            mix_weights = mix[:, 0] / mix[:, 0].sum()
+
+        for start in range(0, n, chunk_size):
+            k = min(chunk_size, n - start)
+            if size_mix:
+                size_class = rng.choice(len(mix), size=k, p=mix_weights)
+                w = rng.random(k) * mix[size_class, 1]
+                h = rng.random(k) * mix[size_class, 2]
             else:
-                output.write(f"{xmin},{ymin},{xmax},{ymax}\n")
+                w = rng.uniform(0, max_width, k)
+                h = rng.uniform(0, max_height, k)
 
-        return output.getvalue()
+            # Όπως στη _rectangle: αν το ορθογώνιο δεν χωράει, καλύπτει όλο το πλαίσιο
+            too_big = (w > span_x) | (h > span_y)
+            w[too_big] = max(0, span_x)
+            h[too_big] = max(0, span_y)
+
+            u, v = self._positions(rng, k, distribution, centres, weights, spread)
+            chunk = np.empty((k, 4))
+            chunk[:, 0] = self.xL + u * (span_x - w)
+            chunk[:, 1] = self.yL + v * (span_y - h)
+            chunk[:, 2] = chunk[:, 0] + w
+            chunk[:, 3] = chunk[:, 1] + h
+            yield chunk
+
+    def generate_rectangles_chunked(self, n, target=None, include_id=True, dataset_label='A',
+                                    max_width=1.0, max_height=1.0, chunk_size=1_000_000,
+                                    binary=False, distribution='uniform', clusters=8, spread=0.05,
+                                    zipf_s=1.0, size_mix=None):
+        """
+        Δημιουργεί n τυχαία ορθογώνια σε κομμάτια (NumPy) και τα γράφει μαζικά, με μνήμη
+        ανάλογη του chunk_size και όχι του n. Με το ίδιο seed και chunk_size παράγονται
+        ακριβώς τα ίδια ορθογώνια, είτε σε CSV είτε σε binary.
+
+        - CSV: ίδια μορφή με τη generate_rectangles (ID = dataset_label + αύξων αριθμός).
+        - binary=True: 4 little-endian float64 ανά ορθογώνιο, χωρίς επικεφαλίδα και IDs
+          (τα IDs προκύπτουν από τη σειρά, βλ. Grid.load_binary).
+
+        :param n: Πλήθος ορθογωνίων.
+        :param target: Όνομα αρχείου ή ανοιχτό file-like αντικείμενο (κειμένου για CSV,
+                       δυαδικό για binary). Προεπιλογή: self.filename.
+        :param include_id: Αν True, περιλαμβάνεται στήλη ID (μόνο για CSV).
+        :param dataset_label: Πρόθεμα των IDs.
+        :param max_width: Μέγιστο τυχαίο πλάτος.
+        :param max_height: Μέγιστο τυχαίο ύψος.
+        :param chunk_size: Πλήθος ορθογωνίων ανά κομμάτι.
+        :param binary: Αν True, γράφεται δυαδικό αρχείο αντί για CSV.
+        :param distribution: Κατανομή θέσεων (βλ. rectangle_chunks).
+        :param clusters: Πλήθος συστάδων για 'gaussian' / 'zipf'.
+        :param spread: Τυπική απόκλιση του θορύβου, ως ποσοστό του πλαισίου.
+        :param zipf_s: Εκθέτης Zipf για την 'zipf'.
+        :param size_mix: (Προαιρετικά) λίστα (βάρος, max_width, max_height) με κλάσεις μεγεθών.
+        """
+        target = target if target is not None else self.filename
+        opened = isinstance(target, str)
+        file = open(target, 'wb' if binary else 'w') if opened else target
+
+        try:
+            if not binary:
+                file.write("ID,xmin,ymin,xmax,ymax\n" if include_id else "xmin,ymin,xmax,ymax\n")
+
+            written = 0
+            chunks = self.rectangle_chunks(n, max_width, max_height, chunk_size, distribution,
+                                           clusters, spread, zipf_s, size_mix)
+            for chunk in chunks:
+                if binary:
+                    file.write(chunk.astype(self.BINARY_DTYPE).tobytes())
+                elif include_id:
+                    ids = np.arange(written + 1, written + len(chunk) + 1)
+                    # Το label μπαίνει στο fmt της στήλης ID: τα '%' του γίνονται '%%'
+                    # (fmt ανά στήλη, ώστε το savetxt να μη μετρά τα '%' του label)
+                    np.savetxt(file, np.column_stack((ids, chunk)), delimiter=",",
+                               fmt=[f"{dataset_label.replace('%', '%%')}%d"] + ["%.17g"] * 4)
+                else:
+                    np.savetxt(file, chunk, fmt="%.17g,%.17g,%.17g,%.17g")
+                written += len(chunk)
+        finally:
+            if opened:
+                file.close()
+
+        print(
+            f"Δημιουργήθηκαν {n} ορθογώνια ({'binary' if binary else 'CSV'}, {distribution}) εντός "
+            f"x=[{self.xL}, {self.xU}], y=[{self.yL}, {self.yU}], "
+            f"max_width={max_width}, max_height={max_height}, seed={self.seed}"
+        )
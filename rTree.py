@@ -0,0 +1,339 @@
+# rTree.py
+
+import heapq
+import itertools
+import math
+import time
+from MBR import MBR
+from utils import Utils
+from joinSink import ListSink
+
+class RTreeNode:
+    """
+    Κόμβος ενός R-tree. Ένας κόμβος φύλλο (leaf) περιέχει αντικείμενα MBR,
+    ενώ ένας εσωτερικός κόμβος περιέχει άλλους κόμβους. Το self.mbr είναι
+    το ελάχιστο ορθογώνιο που περικλείει όλα τα παιδιά.
+    """
+
+    def __init__(self, children, is_leaf):
+        """
+        :param children: Λίστα από MBRs (αν is_leaf) ή από RTreeNode.
+        :param is_leaf: True αν ο κόμβος είναι φύλλο.
+        """
+        self.children = children
+        self.is_leaf = is_leaf
+        boxes = children if is_leaf else [child.mbr for child in children]
+        self.mbr = MBR(
+            None,
+            min(b.xmin for b in boxes),
+            min(b.ymin for b in boxes),
+            max(b.xmax for b in boxes),
+            max(b.ymax for b in boxes)
+        )
+
+    def __repr__(self):
+        kind = "leaf" if self.is_leaf else "node"
+        return f"RTreeNode({kind}, mbr={self.mbr}, children={len(self.children)})"
+
+
+class RTree:
+    """
+    Packed R-tree με bulk loading Sort-Tile-Recursive (STR), ως εναλλακτικό ευρετήριο
+    του Grid. Σε αντίθεση με το ομοιόμορφο Grid, κάθε αντικείμενο αποθηκεύεται μία
+    μόνο φορά (χωρίς αντίγραφα σε πολλά κελιά) και οι κόμβοι προσαρμόζονται στην
+    κατανομή και στο μέγεθος των ορθογωνίων.
+
+    Προσφέρει τα ίδια ερωτήματα με τις κλάσεις του Grid, επιστρέφοντας πάντα
+    (results, stats_str):
+      - knn(qx, qy, k)             (όπως kNN.knn)
+      - range_query(...)           (όπως RangeQuery.range_query)
+      - spatial_join('A', 'B')     (όπως SpatialJoinPBSM.execute_join)
+      - sky_query()                (όπως SkylineQuery.sky_query)
+    """
+
+    def __init__(self, node_capacity=16):
+        """
+        :param node_capacity: Μέγιστο πλήθος παιδιών ανά κόμβο.
+        """
+        self.node_capacity = node_capacity
+        self.datasets = {}
+        self.roots = {}
+
+    def load(self, filename, dataset_label='default'):
+        """
+        Φορτώνει ένα dataset από CSV (ID,xmin,ymin,xmax,ymax) και χτίζει το R-tree του.
+
+        :param filename: Όνομα του αρχείου CSV, ή bytes / file-like με το ίδιο περιεχόμενο.
+        :param dataset_label: Ετικέτα (string) για το συγκεκριμένο dataset.
+        """
+        data, _ = Utils.read_mbrs(filename)
+        self.add_dataset(data, dataset_label)
+        print(f"[RTree] Φορτώθηκε το dataset '{dataset_label}' από το αρχείο "
+              f"'{Utils.source_name(filename)}' με {len(data)} ορθογώνια.")
+
+    def add_dataset(self, data, dataset_label='default'):
+        """
+        Καταχωρεί μια λίστα MBRs ως dataset και χτίζει το R-tree της με STR.
+
+        :param data: Λίστα με MBR αντικείμενα.
+        :param dataset_label: Ετικέτα (string) για το συγκεκριμένο dataset.
+        """
+        self.datasets[dataset_label] = data
+        self.roots[dataset_label] = self.bulk_load(data)
+
+    def get_dataset(self, dataset_label):
+        """
+        :return: Λίστα από MBR αντικείμενα του dataset (ή κενή λίστα).
+        """
+        return self.datasets.get(dataset_label, [])
+
+    def bulk_load(self, entries, is_leaf=True):
+        """
+        Sort-Tile-Recursive bulk loading:
+          1. Ταξινομούμε τα entries κατά x του κέντρου και τα χωρίζουμε σε S κατακόρυφες
+             "λωρίδες", όπου S = ceil(sqrt(P)) και P = ceil(n / capacity) οι κόμβοι.
+          2. Κάθε λωρίδα ταξινομείται κατά y και χωρίζεται σε κόμβους των capacity στοιχείων.
+          3. Επαναλαμβάνουμε στο επόμενο επίπεδο με τους κόμβους που φτιάξαμε, μέχρι τη ρίζα.
+
+        :param entries: Λίστα από MBRs (φύλλα) ή RTreeNode (εσωτερικά επίπεδα).
+        :param is_leaf: True αν τα entries είναι αντικείμενα MBR.
+        :return: Η ρίζα (RTreeNode) ή None αν δεν υπάρχουν entries.
+        """
+        if not entries:
+            return None
+
+        capacity = self.node_capacity
+
+        def box(entry):
+            return entry if is_leaf else entry.mbr
+
+        num_nodes = math.ceil(len(entries) / capacity)
+        num_slices = math.ceil(math.sqrt(num_nodes))
+        slice_size = num_slices * capacity
+
+        by_x = sorted(entries, key=lambda e: box(e).xmin + box(e).xmax)
+        nodes = []
+        for s in range(0, len(by_x), slice_size):
+            vertical_slice = sorted(by_x[s:s + slice_size], key=lambda e: box(e).ymin + box(e).ymax)
+            for n in range(0, len(vertical_slice), capacity):
+                nodes.append(RTreeNode(vertical_slice[n:n + capacity], is_leaf))
+
+        if len(nodes) == 1:
+            return nodes[0]
+        return self.bulk_load(nodes, is_leaf=False)
+
+    def knn(self, qx, qy, k, dataset_label='default'):
+        """
+        Best-first k-NN στο R-tree. Χρησιμοποιεί την ίδια απόσταση με το kNN.knn
+        (τετραγωνική απόσταση από το (xmin, ymin) κάθε MBR), ώστε τα αποτελέσματα
+        να είναι συγκρίσιμα με το Grid.
+
+        :param qx: Η x-συντεταγμένη του query point.
+        :param qy: Η y-συντεταγμένη του query point.
+        :param k: Πλήθος γειτόνων.
+        :param dataset_label: Ετικέτα του συνόλου.
+        :return: (results, stats_str), όπου results λίστα (απόσταση, MBR) κατά αύξουσα απόσταση.
+        """
+        start_time = time.time()
+        root = self.roots.get(dataset_label)
+
+        results = []
+        visited_nodes = 0
+        processed_objects = 0
+        counter = itertools.count()
+
+        if root is not None:
+            # Ουρά προτεραιότητας με κόμβους (mindist) και αντικείμενα (απόσταση)
+            pq = [(Utils.mindist_squared(qx, qy, root.mbr), next(counter), root, False)]
+            while pq and len(results) < k:
+                dist_sq, _, entry, is_object = heapq.heappop(pq)
+                if is_object:
+                    results.append((dist_sq, entry))
+                    continue
+
+                visited_nodes += 1
+                for child in entry.children:
+                    if entry.is_leaf:
+                        processed_objects += 1
+                        d = Utils.squared_distance(qx, qy, child.xmin, child.ymin)
+                        heapq.heappush(pq, (d, next(counter), child, True))
+                    else:
+                        d = Utils.mindist_squared(qx, qy, child.mbr)
+                        heapq.heappush(pq, (d, next(counter), child, False))
+
+        elapsed_time = time.time() - start_time
+
+        stats_str = (
+            "[RTree kNN] Στατιστικά:\n"
+            f" • Κόμβοι που επισκεφθήκαμε: {visited_nodes}\n"
+            f" • Συνολικά αντικείμενα εξετάστηκαν: {processed_objects}\n"
+            f" • Τελικός αριθμός γειτόνων (<=k): {len(results)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return results, stats_str
+
+    def range_query(self, xmin, ymin, xmax, ymax, dataset_label='default'):
+        """
+        Επιστρέφει όλα τα MBRs που τέμνουν το παράθυρο [xmin, xmax] x [ymin, ymax].
+
+        :return: (results, stats_str), όπου results λίστα MBRs.
+        """
+        start_time = time.time()
+        window = MBR(None, xmin, ymin, xmax, ymax)
+
+        results = []
+        visited_nodes = 0
+        stack = [self.roots[dataset_label]] if self.roots.get(dataset_label) else []
+        while stack:
+            node = stack.pop()
+            visited_nodes += 1
+            for child in node.children:
+                if node.is_leaf:
+                    if child.intersects(window):
+                        results.append(child)
+                elif child.mbr.intersects(window):
+                    stack.append(child)
+
+        elapsed_time = time.time() - start_time
+
+        stats_str = (
+            "[RTree RangeQuery] Στατιστικά:\n"
+            f" • Κόμβοι που επισκεφθήκαμε: {visited_nodes}\n"
+            f" • Αποτελέσματα: {len(results)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return results, stats_str
+
+    def spatial_join(self, label_A='A', label_B='B', sink=None):
+        """
+        Spatial Join με ταυτόχρονη διάσχιση (synchronized traversal) των δύο R-trees:
+        κατεβαίνουμε μόνο σε ζεύγη κόμβων των οποίων τα MBRs τέμνονται. Κάθε αντικείμενο
+        υπάρχει μία φορά στο δέντρο, οπότε δεν προκύπτουν διπλότυπα ζεύγη.
+
+        :param label_A: Ετικέτα του πρώτου συνόλου.
+        :param label_B: Ετικέτα του δεύτερου συνόλου.
+        :param sink: (Προαιρετικά) ένα JoinSink. Αν δεν δοθεί, τα ζεύγη επιστρέφονται σε λίστα.
+        :return: (results, stats_str), όπως ο SpatialJoinPBSM.execute_join.
+        """
+        root_A = self.roots.get(label_A)
+        root_B = self.roots.get(label_B)
+        if label_A not in self.datasets or label_B not in self.datasets:
+            msg = f"[RTree Join] Τα σύνολα '{label_A}' και '{label_B}' πρέπει να φορτωθούν πριν εκτελεστεί ο Spatial Join."
+            print(msg)
+            if sink is not None:
+                sink.close()
+                return sink.result(), msg
+            return [], msg
+
+        if sink is None:
+            sink = ListSink()
+
+        start_time = time.time()
+        node_pairs = 0
+        pairs_checked = 0
+
+        stack = [(root_A, root_B)] if root_A and root_B else []
+        while stack:
+            node_a, node_b = stack.pop()
+            node_pairs += 1
+
+            if node_a.is_leaf and node_b.is_leaf:
+                for a in node_a.children:
+                    for b in node_b.children:
+                        pairs_checked += 1
+                        if a.intersects(b):
+                            sink.emit(a, b)
+            elif node_a.is_leaf:
+                for child_b in node_b.children:
+                    if node_a.mbr.intersects(child_b.mbr):
+                        stack.append((node_a, child_b))
+            elif node_b.is_leaf:
+                for child_a in node_a.children:
+                    if child_a.mbr.intersects(node_b.mbr):
+                        stack.append((child_a, node_b))
+            else:
+                for child_a in node_a.children:
+                    for child_b in node_b.children:
+                        if child_a.mbr.intersects(child_b.mbr):
+                            stack.append((child_a, child_b))
+        sink.close()
+
+        elapsed = time.time() - start_time
+
+        stats_str = (
+            "[RTree Join] Στατιστικά:\n"
+            f" • Ζεύγη κόμβων εξετάστηκαν: {node_pairs}\n"
+            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {pairs_checked}\n"
+            f" • Τελικά ζεύγη που τέμνονται: {sink.count}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return sink.result(), stats_str
+
+    def sky_query(self, dataset_label='default'):
+        """
+        Skyline με Branch-and-Bound (BBS) πάνω στο R-tree, στις 2 διαστάσεις (xmin, ymin)
+        όπως το SkylineQuery. Οι κόμβοι και τα αντικείμενα επισκέπτονται κατά αύξουσα
+        απόσταση L1 της κάτω-αριστερής γωνίας τους, και παραλείπονται όσοι κυριαρχούνται
+        από ήδη γνωστό Skyline σημείο.
+
+        :param dataset_label: Ετικέτα του συνόλου.
+        :return: (skyline_points, stats_str).
+        """
+        start_time = time.perf_counter()
+
+        def dominated(x, y):
+            for sp in skyline_points:
+                if sp.xmin <= x and sp.ymin <= y and (sp.xmin < x or sp.ymin < y):
+                    return True
+            return False
+
+        skyline_points = []
+        skipped_nodes = 0
+        visited_nodes = 0
+        processed_points = 0
+        counter = itertools.count()
+
+        root = self.roots.get(dataset_label)
+        # Στοιχεία ουράς: (L1, x, y, is_object, counter, entry). Οι x, y πριν από τον counter
+        # ώστε, σε ίσο (στρογγυλεμένο) L1, ο κυρίαρχος να βγαίνει πάντα πριν από όσους κυριαρχεί.
+        pq = []
+        if root:
+            pq.append((root.mbr.xmin + root.mbr.ymin, root.mbr.xmin, root.mbr.ymin,
+                       False, next(counter), root))
+        while pq:
+            _, _, _, is_object, _, entry = heapq.heappop(pq)
+            if is_object:
+                processed_points += 1
+                if not dominated(entry.xmin, entry.ymin):
+                    skyline_points.append(entry)
+                continue
+
+            if dominated(entry.mbr.xmin, entry.mbr.ymin):
+                skipped_nodes += 1
+                continue
+
+            visited_nodes += 1
+            for child in entry.children:
+                box = child if entry.is_leaf else child.mbr
+                if not dominated(box.xmin, box.ymin):
+                    heapq.heappush(pq, (box.xmin + box.ymin, box.xmin, box.ymin, entry.is_leaf,
+                                        next(counter), child))
+
+        elapsed_time = time.perf_counter() - start_time
+
+        stats_str = (
+            "[RTree Skyline] Στατιστικά:\n"
+            f" • Κόμβοι που επισκεφθήκαμε: {visited_nodes}\n"
+            f" • Παραλείφθηκαν (skipped) κόμβοι: {skipped_nodes}\n"
+            f" • Συνολικά αντικείμενα εξετάστηκαν: {processed_points}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+
+        print(stats_str)
+        return skyline_points, stats_str
@@ -0,0 +1,55 @@
+# rangeQuery.py
+
+import time
+
+class RangeQuery:
+    """
+    Κλάση που υλοποιεί ερώτημα περιοχής (range / window query) σε ένα Grid:
+    επιστρέφει όλα τα MBRs ενός συνόλου που τέμνουν ένα παράθυρο
+    [xmin, xmax] x [ymin, ymax].
+    """
+
+    @staticmethod
+    def range_query(grid, xmin, ymin, xmax, ymax, dataset_label='default'):
+        """
+        Εκτελεί το ερώτημα περιοχής εξετάζοντας μόνο τα κελιά που τέμνουν το παράθυρο.
+        Ένα MBR που ανήκει σε πολλά κελιά αναφέρεται μόνο στο κελί που περιέχει την
+        κάτω-αριστερή γωνία της τομής του με το παράθυρο (reference point).
+
+        :param grid: Αντικείμενο Grid με φορτωμένο το σύνολο dataset_label.
+        :param xmin: Ελάχιστο x του παραθύρου.
+        :param ymin: Ελάχιστο y του παραθύρου.
+        :param xmax: Μέγιστο x του παραθύρου.
+        :param ymax: Μέγιστο y του παραθύρου.
+        :param dataset_label: Ετικέτα του συνόλου (π.χ. 'default').
+        :return: Ένα tuple (results, stats_str), όπου results είναι λίστα MBRs.
+        """
+        start_time = time.time()
+
+        results = []
+        processed_cells = 0
+        processed_objects = 0
+
+        i_min, i_max, j_min, j_max = grid.cell_range(xmin, ymin, xmax, ymax)
+        for i in range(i_min, i_max + 1):
+            for j in range(j_min, j_max + 1):
+                processed_cells += 1
+                for obj in grid.cells[i][j].objects.get(dataset_label, []):
+                    processed_objects += 1
+                    if obj.xmax < xmin or obj.xmin > xmax or obj.ymax < ymin or obj.ymin > ymax:
+                        continue
+                    if grid.cell_index(max(obj.xmin, xmin), max(obj.ymin, ymin)) == (i, j):
+                        results.append(obj)
+
+        elapsed_time = time.time() - start_time
+
+        stats_str = (
+            "[RangeQuery] Στατιστικά:\n"
+            f" • Κελιά εξετάστηκαν: {processed_cells}\n"
+            f" • Αντικείμενα εξετάστηκαν: {processed_objects}\n"
+            f" • Αποτελέσματα: {len(results)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return results, stats_str
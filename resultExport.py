@@ -0,0 +1,210 @@
+# resultExport.py
+
+import csv
+import gzip
+import itertools
+
+class ResultExport:
+    """
+    Εξαγωγή αποτελεσμάτων αλγορίθμων (join, k-NN, Skyline κ.λπ.) σε αρχείο, γραμμή-γραμμή
+    σε κομμάτια (chunks), χωρίς να χτίζεται ολόκληρο το κείμενο στη μνήμη.
+
+    Υποστηριζόμενες μορφές:
+      - 'txt':    στατιστικά + tab-separated γραμμές (η αρχική μορφή της εφαρμογής).
+      - 'csv.gz': CSV με επικεφαλίδα, συμπιεσμένο με gzip.
+      - 'parquet': στηλοθετημένο δυαδικό αρχείο (Parquet), γραμμένο σε row groups μέσω
+                   pyarrow (εισάγεται μόνο όταν ζητηθεί αυτή η μορφή). Τα στατιστικά
+                   αποθηκεύονται στα metadata του αρχείου.
+    """
+
+    FORMATS = ('txt', 'csv.gz', 'parquet')
+    MIME_TYPES = {'txt': 'text/plain', 'csv.gz': 'application/gzip',
+                  'parquet': 'application/vnd.apache.parquet'}
+
+    PAIR_ALGORITHMS = ('PBSM', 'Naive', 'Distance Join', 'Auto Join', 'Self Join')
+    KNN_ALGORITHMS = ('k-NN', 'Linear Scan')
+
+    def __init__(self, algorithm_name, fmt='txt', chunk_size=100_000):
+        """
+        :param algorithm_name: Το όνομα του αλγορίθμου (καθορίζει τις στήλες).
+        :param fmt: Μία από τις ResultExport.FORMATS.
+        :param chunk_size: Πλήθος γραμμών που γράφονται ανά κομμάτι (ή row group στο Parquet).
+        """
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Άγνωστη μορφή '{fmt}'. Επιτρεπτές: {self.FORMATS}")
+        self.algorithm_name = algorithm_name
+        self.fmt = fmt
+        self.chunk_size = chunk_size
+
+    @property
+    def file_name(self):
+        """
+        :return: Προτεινόμενο όνομα αρχείου, π.χ. "results_PBSM.csv.gz".
+        """
+        return f"results_{self.algorithm_name}.{self.fmt}"
+
+    @property
+    def mime(self):
+        """
+        :return: Ο MIME τύπος της μορφής.
+        """
+        return self.MIME_TYPES[self.fmt]
+
+    def columns(self, results):
+        """
+        :param results: Τα αποτελέσματα (για το πλήθος στηλών του Multi-way).
+        :return: Λίστα (όνομα στήλης, τύπος) με τύπο 'str', 'float' ή 'int'.
+        """
+        name = self.algorithm_name
+        if name in self.PAIR_ALGORITHMS:
+            return [('Dataset_A_ID', 'str'), ('Dataset_B_ID', 'str')]
+        if name in self.KNN_ALGORITHMS:
+            return [('Dataset_ID', 'str'), ('Distance', 'float')]
+        if name == 'k-NN Batch':
+            return [('Query', 'int'), ('Dataset_ID', 'str'), ('Distance', 'float')]
+        if name == 'Skyline':
+            return [('ID', 'str'), ('xmin', 'float'), ('ymin', 'float'), ('xmax', 'float'), ('ymax', 'float')]
+        if name == 'Join Aggregate':
+            return [('Dataset_A_ID', 'str'), ('Count', 'int'), ('Intersection_Area', 'float')]
+        if name == 'Multi-way':
+            width = len(results[0]) if results else 0
+            return [(f"Set_{k + 1}_ID", 'str') for k in range(width)]
+        if name == 'k-skyband':
+            return [('Dataset_ID', 'str'), ('Dominated_By', 'int')]
+        if name == 'Top-k Dominating':
+            return [('Dataset_ID', 'str'), ('Dominates', 'int')]
+        raise ValueError(f"Άγνωστος αλγόριθμος '{name}' για εξαγωγή.")
+
+    def rows(self, results):
+        """
+        Generator με μία tuple τιμών (σύμφωνα με τις columns) ανά αποτέλεσμα.
+        """
+        name = self.algorithm_name
+        for item in results:
+            if name in self.PAIR_ALGORITHMS:
+                a, b = item
+                yield str(a.id), str(b.id)
+            elif name in self.KNN_ALGORITHMS:
+                dist, obj = item
+                yield str(obj.id), dist
+            elif name == 'k-NN Batch':
+                query, dist, obj = item
+                yield query, str(obj.id), dist
+            elif name == 'Skyline':
+                yield str(item.id), item.xmin, item.ymin, item.xmax, item.ymax
+            elif name == 'Join Aggregate':
+                obj_id, (count, area) = item
+                yield str(obj_id), count, area
+            elif name == 'Multi-way':
+                yield tuple(str(obj.id) for obj in item)
+            else:  # k-skyband / Top-k Dominating
+                count, obj = item
+                yield str(obj.id), count
+
+    def text_header(self):
+        """
+        :return: Η γραμμή επικεφαλίδας της μορφής 'txt'.
+        """
+        name = self.algorithm_name
+        if name in self.PAIR_ALGORITHMS:
+            return "Dataset_A_ID\tDataset_B_ID\n"
+        if name in self.KNN_ALGORITHMS:
+            return "Dataset_ID\tDistance\n"
+        if name == 'k-NN Batch':
+            return "Query\tDataset_ID\tDistance\n"
+        if name == 'Skyline':
+            return "Skyline Points (ID, xmin, ymin, xmax, ymax):\n"
+        if name == 'Join Aggregate':
+            return "Dataset_A_ID\tCount\tIntersection_Area\n"
+        if name == 'Multi-way':
+            return "IDs ανά σύνολο (tab-separated)\n"
+        if name == 'k-skyband':
+            return "Dataset_ID\tDominated_By\n"
+        return "Dataset_ID\tDominates\n"
+
+    def text_line(self, row):
+        """
+        :return: Μία γραμμή της μορφής 'txt' για μια tuple της rows().
+        """
+        name = self.algorithm_name
+        if name in self.KNN_ALGORITHMS:
+            return f"{row[0]}\t{row[1]:.4f}\n"
+        if name == 'k-NN Batch':
+            return f"{row[0]}\t{row[1]}\t{row[2]:.4f}\n"
+        if name == 'Skyline':
+            return ", ".join(map(str, row)) + "\n"
+        if name == 'Join Aggregate':
+            return f"{row[0]}\t{row[1]}\t{row[2]:.6f}\n"
+        return "\t".join(map(str, row)) + "\n"
+
+    def chunks(self, results):
+        """
+        Generator που χωρίζει τις γραμμές σε λίστες το πολύ chunk_size στοιχείων.
+        """
+        rows = self.rows(results)
+        while True:
+            chunk = list(itertools.islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def write(self, results, path, stats=None):
+        """
+        Γράφει τα αποτελέσματα στο αρχείο path, στη μορφή self.fmt.
+
+        :param results: Τα αποτελέσματα του αλγορίθμου (λίστα).
+        :param path: Όνομα του αρχείου εξόδου.
+        :param stats: (Προαιρετικά) συμβολοσειρά στατιστικών.
+        :return: Πλήθος γραμμών που γράφτηκαν.
+        """
+        written = 0
+        if self.fmt == 'txt':
+            with open(path, 'w', encoding='utf-8') as file:
+                if stats:
+                    file.write(stats)
+                    file.write("\n")
+                file.write(self.text_header())
+                for chunk in self.chunks(results):
+                    file.writelines(self.text_line(row) for row in chunk)
+                    written += len(chunk)
+
+        elif self.fmt == 'csv.gz':
+            with gzip.open(path, 'wt', encoding='utf-8', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow([column for column, _ in self.columns(results)])
+                for chunk in self.chunks(results):
+                    writer.writerows(chunk)
+                    written += len(chunk)
+
+        else:
+            written = self.write_parquet(results, path, stats)
+
+        return written
+
+    def write_parquet(self, results, path, stats=None):
+        """
+        Γράφει τα αποτελέσματα σε Parquet, ένα row group ανά κομμάτι.
+
+        :return: Πλήθος γραμμών που γράφτηκαν.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Η εξαγωγή σε Parquet απαιτεί το πακέτο pyarrow.") from e
+
+        types = {'str': pa.string(), 'float': pa.float64(), 'int': pa.int64()}
+        columns = self.columns(results)
+        metadata = {'algorithm': self.algorithm_name}
+        if stats:
+            metadata['stats'] = stats
+        schema = pa.schema([(column, types[kind]) for column, kind in columns], metadata=metadata)
+
+        written = 0
+        with pq.ParquetWriter(path, schema) as writer:
+            for chunk in self.chunks(results):
+                arrays = [pa.array(values, type=field.type)
+                          for values, field in zip(zip(*chunk), schema)]
+                writer.write_batch(pa.record_batch(arrays, schema=schema))
+                written += len(chunk)
+        return written
@@ -0,0 +1,105 @@
+# selfSpatialJoin.py
+
+import time
+from joinSink import ListSink
+
+class SelfSpatialJoin:
+    """
+    Υλοποιεί Self Spatial Join πάνω σε ένα σύνολο του Grid: βρίσκει όλα τα ζεύγη
+    αντικειμένων του ίδιου συνόλου που επικαλύπτονται (π.χ. ανίχνευση επικαλύψεων).
+
+    Σε αντίθεση με τη φόρτωση του ίδιου αρχείου ως 'A' και 'B':
+      - το σύνολο φορτώνεται μία φορά,
+      - κάθε μη διατεταγμένο ζεύγος {a, b} αναφέρεται μία μόνο φορά (όχι και (b, a)),
+      - ένα αντικείμενο δεν συγκρίνεται ποτέ με τον εαυτό του (όχι (a, a)).
+
+    Ανά κελί συγκρίνουμε μόνο ζεύγη (L[x], L[y]) με x < y, και κρατάμε το ζεύγος
+    μόνο στο κελί που περιέχει την κάτω-αριστερή γωνία της τομής (reference point).
+    """
+
+    def __init__(self, grid, dataset_label='default'):
+        """
+        Αρχικοποιεί τον Self Join.
+
+        :param grid: Ένα αντικείμενο Grid με φορτωμένο το σύνολο dataset_label.
+        :param dataset_label: Η ετικέτα του συνόλου (π.χ. 'default').
+        """
+        self.grid = grid
+        self.dataset_label = dataset_label
+        self.results = []
+        self.skipped_cells = 0
+        self.processed_cells = 0
+        self.pairs_checked = 0
+
+    def iter_join(self):
+        """
+        Generator που επιστρέφει ένα-ένα τα ζεύγη (a, b) που επικαλύπτονται,
+        με κάθε μη διατεταγμένο ζεύγος μία φορά.
+
+        :return: Generator από tuples (a, b).
+        """
+        self.skipped_cells = 0
+        self.processed_cells = 0
+        self.pairs_checked = 0
+
+        for i, j, cell in self.grid.iter_cells():
+            objects = cell.objects.get(self.dataset_label, [])
+
+            # Χρειάζονται τουλάχιστον 2 αντικείμενα για να υπάρξει ζεύγος
+            if len(objects) < 2:
+                self.skipped_cells += 1
+                continue
+
+            self.processed_cells += 1
+
+            for x in range(len(objects) - 1):
+                a = objects[x]
+                for y in range(x + 1, len(objects)):
+                    b = objects[y]
+                    self.pairs_checked += 1
+                    if a.intersects(b) and self.grid.cell_index(
+                            max(a.xmin, b.xmin), max(a.ymin, b.ymin)) == (i, j):
+                        yield (a, b)
+
+    def execute_join(self, sink=None):
+        """
+        Εκτελεί τον Self Spatial Join και στέλνει τα ζεύγη στο sink.
+
+        :param sink: (Προαιρετικά) ένα JoinSink (π.χ. CSVPairSink, CountSink, AggregateSink).
+                     Αν δεν δοθεί, τα ζεύγη κρατούνται σε λίστα (self.results).
+        :return: Ένα tuple (results, stats_str), όπου results είναι λίστα ζευγών (a, b)
+                 ή το sink.result(), και stats_str κείμενο με στατιστικά.
+        """
+        if self.dataset_label not in self.grid.datasets:
+            msg = f"[SelfSpatialJoin] Το σύνολο '{self.dataset_label}' πρέπει να φορτωθεί πριν εκτελεστεί ο Self Join."
+            print(msg)
+            if sink is not None:
+                sink.close()
+                return sink.result(), msg
+            return [], msg
+
+        if sink is None:
+            self.results = []
+            sink = ListSink(self.results)
+
+        start_time = time.time()
+
+        for a, b in self.iter_join():
+            sink.emit(a, b)
+        sink.close()
+
+        elapsed = time.time() - start_time
+
+        stats_str = (
+            "[SelfSpatialJoin] Στατιστικά:\n"
+            f" • Σύνολο: {self.dataset_label}\n"
+            f" • Συνολικά κελιά στο grid: {self.grid.m * self.grid.m}\n"
+            f" • Παραλείφθηκαν (skipped) κελιά: {self.skipped_cells}\n"
+            f" • Επεξεργαστήκαμε κελιά: {self.processed_cells}\n"
+            f" • Συνολικά ζεύγη εξετάστηκαν: {self.pairs_checked}\n"
+            f" • Ζεύγη που επικαλύπτονται: {sink.count}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
+        )
+
+        print(stats_str)
+        return sink.result(), stats_str
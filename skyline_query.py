@@ -1,6 +1,8 @@
 # skyline_query.py
 
 import time
+import heapq
+import itertools
 from utils import Utils
 
 class SkylineQuery:
@@ -18,9 +20,10 @@ class SkylineQuery:
         από κάποιο Skyline σημείο.
       - Αυτό μειώνει τις περιττές συγκρίσεις και επιταχύνει τη διαδικασία.
 
-    * Μπορεί να επεκταθεί σε πολυδιάστατα δεδομένα, αρκεί να προσαρμόσουμε
-      τη συνάρτηση get_coords() και τον έλεγχο dominates_cell() / dominates_point()
-      ώστε να λαμβάνει υπόψη περισσότερες από 2 διαστάσεις.
+    * Πολυδιάστατα δεδομένα (dims > 2): χρησιμοποιούνται οι πρώτες dims τιμές του
+      obj.attrs = (xmin, ymin, attr_1, ...), που συμπληρώνει το Grid.load από τις
+      επιπλέον στήλες του CSV. Η sky_query_vectorised υπολογίζει την κυριαρχία
+      σε μπλοκ με NumPy, πάνω στον πίνακα χαρακτηριστικών του Grid.
     """
 
     def __init__(self, grid, dims=2):
@@ -33,9 +36,19 @@ class SkylineQuery:
         :param dims: Πλήθος διαστάσεων. Αν dims=2, χειριζόμαστε (xmin, ymin) ως 2D.
                      Αν dims>2, υποθέτουμε ότι τα αντικείμενα έχουν obj.attrs
                      και η κυριαρχία ελέγχεται σε όλες τις συνιστώσες του attrs.
+        :raises ValueError: Αν dims ξεπερνά τα χαρακτηριστικά των αντικειμένων του
+                            dataset 'default' (βλ. Grid.attribute_matrix).
         """
+        if dims > 2 and grid.get_dataset('default'):
+            _, width = grid.attribute_matrix('default')
+            if dims > width:
+                raise ValueError(f"[SkylineQuery] Ζητήθηκαν {dims} διαστάσεις, αλλά τα αντικείμενα "
+                                 f"του dataset 'default' έχουν μόνο {width}.")
+
         self.grid = grid
         self.dims = dims
+        self.stats_str = ""
+        self.cell_corners = {}
 
     def get_coords(self, obj):
         """
@@ -52,8 +65,8 @@ class SkylineQuery:
         if self.dims == 2:
             return (obj.xmin, obj.ymin)
         else:
-            # Παράδειγμα πολυδιάστατου: θεωρούμε ότι obj.attrs διατίθεται
-            return obj.attrs
+            # Πολυδιάστατο: οι πρώτες dims τιμές του obj.attrs (βλ. Grid.load)
+            return obj.attrs[:self.dims]
 
     def dominates_point(self, p, q):
         """
@@ -77,23 +90,31 @@ class SkylineQuery:
         p_coords = self.get_coords(p)
         q_coords = self.get_coords(q)
 
-        all_less_equal = True
-        strictly_less_in_one = False
+        # Όλες <= και τουλάχιστον μία < ισοδυναμεί με: όλες <= και p != q
+        return p_coords != q_coords and all(a <= b for a, b in zip(p_coords, q_coords))
 
-        for i in range(len(p_coords)):
-            if p_coords[i] > q_coords[i]:
-                all_less_equal = False
-                break
-            if p_coords[i] < q_coords[i]:
-                strictly_less_in_one = True
+    def cell_corner(self, cell):
+        """
+        Επιστρέφει την "κάτω" γωνία ενός κελιού στον χώρο των dims διαστάσεων: τις
+        ελάχιστες τιμές κάθε διάστασης ανάμεσα στα αντικείμενα του κελιού. Για τις
+        επιπλέον διαστάσεις δεν υπάρχουν όρια κελιού, οπότε χρησιμοποιούμε τα ελάχιστα
+        των ίδιων των δεδομένων (υπολογίζονται μία φορά ανά κελί).
 
-        return all_less_equal and strictly_less_in_one
+        :param cell: Ένα κελί (Cell) του Grid.
+        :return: Tuple συντεταγμένων.
+        """
+        key = id(cell)
+        if key not in self.cell_corners:
+            coords = [self.get_coords(obj) for obj in cell.objects.get('default', [])]
+            self.cell_corners[key] = tuple(map(min, zip(*coords)))
+        return self.cell_corners[key]
 
     def dominates_cell(self, sky_points, cell):
         """
         Ελέγχει αν ένα ολόκληρο κελί (cell) κυριαρχείται από κάποιο ήδη γνωστό Skyline point.
         - Για 2D, παίρνουμε το "κατώτατο άκρο" (cell.mbr.xmin, cell.mbr.ymin).
-        - Αν κάποιος p στο sky_points κυριαρχεί αυτό το (xmin, ymin), τότε
+        - Για nD, την κάτω γωνία των αντικειμένων του κελιού (cell_corner).
+        - Αν κάποιος p στο sky_points κυριαρχεί αυτό το σημείο, τότε
           ολόκληρο το κελί κυριαρχείται.
 
         :param sky_points: Η λίστα των ήδη γνωστών Skyline points.
@@ -103,30 +124,17 @@ class SkylineQuery:
         if self.dims == 2:
             cell_coords = (cell.mbr.xmin, cell.mbr.ymin)
         else:
-            # Για nD περίπτωση, θα θέλαμε π.χ. cell.mbr.attrs κ.λπ.
-            cell_coords = (cell.mbr.xmin, cell.mbr.ymin)
+            cell_coords = self.cell_corner(cell)
 
         for p in sky_points:
-            p_coords = self.get_coords(p)
-
-            all_less_equal = True
-            strictly_less_in_one = False
-
-            # Συνεχίζουμε να θεωρούμε len(cell_coords)=2 για απλοποίηση
-            for i in range(len(cell_coords)):
-                if p_coords[i] > cell_coords[i]:
-                    all_less_equal = False
-                    break
-                if p_coords[i] < cell_coords[i]:
-                    strictly_less_in_one = True
-
-            if all_less_equal and strictly_less_in_one:
+            p_coords = tuple(self.get_coords(p))
+            if p_coords != cell_coords and all(a <= b for a, b in zip(p_coords, cell_coords)):
                 # Μία φορά αρκεί για να συμπεράνουμε ότι το κελί κυριαρχείται
                 return True
 
         return False
 
-    def sky_query(self):
+    def sky_query(self, progress=None):
         """
         Εκτελεί το Skyline Query πάνω στο Grid, ακολουθώντας τα εξής βήματα:
 
@@ -146,6 +154,8 @@ class SkylineQuery:
            που περιγράφει διάφορα στατιστικά (π.χ. πόσα κελιά εξετάστηκαν / παραλείφθηκαν,
            χρόνος εκτέλεσης κ.λπ.).
 
+        :param progress: (Προαιρετικά) callback progress(done, total) με τα ενεργά κελιά
+                         που εξετάστηκαν / συνολικά (βλ. jobRunner.Job.report).
         :return: (skyline_points, stats_str)
           - skyline_points: Λίστα αντικειμένων (συνήθως MBRs) που βρέθηκαν να μην κυριαρχούνται.
           - stats_str: Συμβολοσειρά με στατιστικά εκτέλεσης (π.χ. #κελιών, #αντικειμένων, χρόνος).
@@ -165,9 +175,13 @@ class SkylineQuery:
         skipped_cells = 0
         processed_cells = 0
         processed_points = 0
+        processed_ids = set()  # Ένα MBR μπορεί να ανήκει σε πολλά κελιά
 
         # 3. Εξετάζουμε κάθε κελί
-        for cell in sorted_cells:
+        for done, cell in enumerate(sorted_cells):
+            if progress:
+                progress(done, len(sorted_cells))
+
             # Εάν το κελί κυριαρχείται πλήρως, το παραλείπουμε
             if self.dominates_cell(skyline_points, cell):
                 skipped_cells += 1
@@ -177,6 +191,9 @@ class SkylineQuery:
             points_in_cell = cell.objects.get('default', [])
 
             for point in points_in_cell:
+                if id(point) in processed_ids:
+                    continue
+                processed_ids.add(id(point))
                 processed_points += 1
                 dominated = False
 
@@ -210,3 +227,281 @@ class SkylineQuery:
 
         print(stats_str)
         return skyline_points, stats_str
+
+    def sky_query_sorted(self):
+        """
+        Skyline με προ-ταξινόμηση (sort-first), O(n log n) στις 2 διαστάσεις:
+
+        * 2D: ταξινομούμε τα αντικείμενα κατά (xmin, ymin) και τα σαρώνουμε μία φορά,
+          κρατώντας το τρέχον ελάχιστο ymin. Ένα αντικείμενο ανήκει στο Skyline αν το
+          ymin του είναι μικρότερο από το τρέχον ελάχιστο (ή ίσο με το τελευταίο Skyline
+          σημείο που έχει και το ίδιο xmin, δηλ. πρόκειται για ίδιο σημείο).
+        * nD (dims > 2): Sort-Filter-Skyline (SFS). Ταξινομούμε κατά το άθροισμα των
+          συντεταγμένων· ένα σημείο μπορεί να κυριαρχηθεί μόνο από σημεία που προηγούνται,
+          οπότε το συγκρίνουμε μόνο με τα ήδη γνωστά Skyline points και δεν χρειάζεται
+          ποτέ να αφαιρέσουμε σημεία από τη λίστα.
+
+        Επιστρέφει τα ίδια σημεία με τη sky_query (ταξινομημένα).
+
+        :return: (skyline_points, stats_str)
+        """
+        start_time = time.perf_counter()
+
+        data = self.grid.get_dataset('default')
+        skyline_points = []
+        dominance_checks = 0
+
+        if self.dims == 2:
+            min_y = float('inf')
+            for point in sorted(data, key=lambda o: (o.xmin, o.ymin)):
+                dominance_checks += 1
+                if point.ymin < min_y:
+                    min_y = point.ymin
+                    skyline_points.append(point)
+                elif (point.ymin == min_y
+                      and skyline_points[-1].xmin == point.xmin
+                      and skyline_points[-1].ymin == point.ymin):
+                    skyline_points.append(point)
+        else:
+            for point in sorted(data, key=lambda o: (sum(self.get_coords(o)), tuple(self.get_coords(o)))):
+                dominated = False
+                for sp in skyline_points:
+                    dominance_checks += 1
+                    if self.dominates_point(sp, point):
+                        dominated = True
+                        break
+                if not dominated:
+                    skyline_points.append(point)
+
+        elapsed_time = time.perf_counter() - start_time
+
+        stats_str = (
+            "[SkylineQuery Sort-based] Στατιστικά:\n"
+            f" • Συνολικά αντικείμενα: {len(data)}\n"
+            f" • Έλεγχοι κυριαρχίας: {dominance_checks}\n"
+            f" • Σημεία Skyline: {len(skyline_points)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+
+        print(stats_str)
+        return skyline_points, stats_str
+
+    def iter_sky_query(self, window=None):
+        """
+        Progressive Skyline (Branch-and-Bound πάνω στα κελιά του Grid): generator που
+        επιστρέφει κάθε Skyline point μόλις επιβεβαιωθεί, χωρίς να περιμένει το τέλος.
+
+        1. Μια ουρά προτεραιότητας περιέχει κελιά και αντικείμενα, με κλειδί την
+           απόσταση L1 από την αρχή (mindist) της κάτω-αριστερής γωνίας τους.
+        2. Όταν βγαίνει ένα κελί: αν η γωνία του κυριαρχείται από κάποιο ήδη βρεθέν
+           Skyline point, απορρίπτεται ολόκληρο· αλλιώς τα αντικείμενά του μπαίνουν στην ουρά.
+        3. Όταν βγαίνει ένα αντικείμενο που δεν κυριαρχείται, είναι σίγουρα Skyline point:
+           όποιο σημείο θα μπορούσε να το κυριαρχεί έχει μικρότερο κλειδί και έχει ήδη εξεταστεί.
+
+        Τα ακριανά κελιά (i = 0 ή j = 0) θεωρούνται ανοιχτά προς τα κάτω/αριστερά, ώστε να
+        καλύπτουν και αντικείμενα εκτός των ορίων του Grid. Για dims > 2 τα σημεία
+        επιστρέφονται προοδευτικά με Sort-Filter-Skyline. Μετά το τέλος, τα στατιστικά
+        είναι διαθέσιμα στο self.stats_str.
+
+        Αν δοθεί window, υπολογίζεται το constrained Skyline: μόνο ανάμεσα στα αντικείμενα
+        με (xmin, ymin) μέσα στο παράθυρο. Εξετάζονται μόνο τα κελιά που τέμνουν το παράθυρο
+        και, μέσα σε αυτά, κάθε αντικείμενο ελέγχεται αν ανήκει στο παράθυρο (ένα κελί μπορεί
+        να περιέχει και αντίγραφα αντικειμένων που ξεκινούν έξω από αυτό).
+
+        :param window: (Προαιρετικά) tuple (xmin, ymin, xmax, ymax) του παραθύρου.
+        :return: Generator από Skyline points (MBRs).
+        """
+        start_time = time.perf_counter()
+
+        skyline_points = []
+        skipped_cells = 0
+        processed_cells = 0
+        processed_points = 0
+        inf = float('inf')
+
+        if window is None:
+            w_xmin, w_ymin, w_xmax, w_ymax = -inf, -inf, inf, inf
+            i_min, i_max, j_min, j_max = 0, self.grid.m - 1, 0, self.grid.m - 1
+        else:
+            w_xmin, w_ymin, w_xmax, w_ymax = window
+            i_min, i_max, j_min, j_max = self.grid.cell_range(w_xmin, w_ymin, w_xmax, w_ymax)
+
+        def window_cells():
+            # Τα μη κενά κελιά που τέμνουν το παράθυρο, ως (i, j, cell)
+            for i in range(i_min, i_max + 1):
+                for j in range(j_min, j_max + 1):
+                    cell = self.grid.cells[i][j]
+                    if cell.objects.get('default'):
+                        yield i, j, cell
+
+        def in_window(point):
+            return w_xmin <= point.xmin <= w_xmax and w_ymin <= point.ymin <= w_ymax
+
+        total_active_cells = 0
+        if self.dims != 2:
+            if window is None:
+                data = self.grid.get_dataset('default')
+            else:
+                data = {}
+                for _, _, cell in window_cells():
+                    total_active_cells += 1
+                    for point in cell.objects['default']:
+                        if in_window(point):
+                            data[id(point)] = point
+                data = list(data.values())
+            for point in sorted(data, key=lambda o: (sum(self.get_coords(o)), tuple(self.get_coords(o)))):
+                processed_points += 1
+                if not any(self.dominates_point(sp, point) for sp in skyline_points):
+                    skyline_points.append(point)
+                    yield point
+        else:
+            def dominated(x, y):
+                for sp in skyline_points:
+                    if sp.xmin <= x and sp.ymin <= y and (sp.xmin < x or sp.ymin < y):
+                        return True
+                return False
+
+            # Στοιχεία ουράς: (L1, x, y, 0=κελί / 1=αντικείμενο, counter, entry).
+            # Σε ισοπαλία τα κελιά προηγούνται, ώστε ένα αντικείμενο να μην επιβεβαιωθεί
+            # πριν ανοιχτεί κελί που μπορεί να περιέχει σημείο που το κυριαρχεί.
+            counter = itertools.count()
+            pq = []
+            for i, j, cell in window_cells():
+                x = max(-inf if i == 0 else cell.mbr.xmin, w_xmin)
+                y = max(-inf if j == 0 else cell.mbr.ymin, w_ymin)
+                pq.append((x + y, x, y, 0, next(counter), cell))
+            heapq.heapify(pq)
+            total_active_cells = len(pq)
+
+            seen = set()  # Ένα MBR μπορεί να ανήκει σε πολλά κελιά
+            while pq:
+                _, x, y, kind, _, entry = heapq.heappop(pq)
+
+                if kind == 0:
+                    if dominated(x, y):
+                        skipped_cells += 1
+                        continue
+                    processed_cells += 1
+                    for point in entry.objects.get('default', []):
+                        if id(point) in seen or dominated(point.xmin, point.ymin):
+                            continue
+                        if window is not None and not in_window(point):
+                            continue
+                        seen.add(id(point))
+                        heapq.heappush(pq, (point.xmin + point.ymin, point.xmin, point.ymin,
+                                            1, next(counter), point))
+                    continue
+
+                processed_points += 1
+                if not dominated(x, y):
+                    skyline_points.append(entry)
+                    yield entry
+
+        elapsed_time = time.perf_counter() - start_time
+
+        if window is None:
+            title = "[SkylineQuery Progressive] Στατιστικά:\n"
+        else:
+            title = f"[SkylineQuery Window] Στατιστικά για το παράθυρο {tuple(window)}:\n"
+        cell_lines = ""
+        if self.dims == 2 or window is not None:
+            cell_lines = f" • Συνολικά ενεργά κελιά: {total_active_cells}\n"
+        if self.dims == 2:
+            cell_lines += (
+                f" • Παραλείφθηκαν (skipped) κελιά: {skipped_cells}\n"
+                f" • Επεξεργαστήκαμε κελιά: {processed_cells}\n"
+            )
+
+        self.stats_str = (
+            title
+            + cell_lines
+            + f" • Συνολικά αντικείμενα εξετάστηκαν: {processed_points}\n"
+            f" • Σημεία Skyline: {len(skyline_points)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+        print(self.stats_str)
+
+    def sky_query_window(self, xmin, ymin, xmax, ymax):
+        """
+        Constrained Skyline: το Skyline μόνο ανάμεσα στα αντικείμενα των οποίων το
+        (xmin, ymin) βρίσκεται μέσα στο παράθυρο [xmin, xmax] x [ymin, ymax]
+        (π.χ. το τρέχον viewport του χάρτη). Το κόστος εξαρτάται από τα κελιά που
+        τέμνουν το παράθυρο και όχι από όλο το dataset.
+
+        :return: (skyline_points, stats_str)
+        """
+        skyline_points = list(self.iter_sky_query(window=(xmin, ymin, xmax, ymax)))
+        return skyline_points, self.stats_str
+
+    def sky_query_vectorised(self, block_size=1024):
+        """
+        Skyline σε dims διαστάσεις με Sort-Filter-Skyline κατά μπλοκ, με NumPy:
+
+        1. Παίρνουμε τον συμπαγή πίνακα χαρακτηριστικών του Grid (n x dims) και
+           ταξινομούμε τις γραμμές κατά άθροισμα συντεταγμένων.
+        2. Για κάθε μπλοκ block_size σημείων, ελέγχουμε με broadcasting αν κάθε σημείο
+           κυριαρχείται από κάποιο ήδη γνωστό Skyline σημείο ή από σημείο του ίδιου μπλοκ.
+           Ό,τι επιζεί είναι Skyline (ένα σημείο κυριαρχείται μόνο από σημεία με μικρότερο
+           άθροισμα, δηλαδή από προηγούμενα μπλοκ ή από το ίδιο μπλοκ).
+
+        :param block_size: Πλήθος σημείων ανά μπλοκ σύγκρισης (ελέγχει τη μνήμη).
+        :return: (skyline_points, stats_str)
+        """
+        import numpy as np  # μόνο εδώ, ώστε οι υπόλοιπες μέθοδοι να μη φορτώνουν το NumPy
+
+        start_time = time.perf_counter()
+
+        data = self.grid.get_dataset('default')
+        values, width = self.grid.attribute_matrix('default')
+        dims = self.dims
+        matrix = np.frombuffer(values, dtype=np.float64).reshape(len(data), width)[:, :dims]
+
+        order = np.argsort(matrix.sum(axis=1), kind='stable')
+        sorted_matrix = matrix[order]
+
+        skyline_idx = []
+        skyline_matrix = np.empty((0, dims))
+
+        def undominated(block, others):
+            # Δείκτες των γραμμών του block που δεν κυριαρχούνται από καμία γραμμή του others.
+            # Τα others εξετάζονται σε μικρά κομμάτια (τα πρώτα έχουν το μικρότερο άθροισμα
+            # και κυριαρχούν τα περισσότερα) και μετά από κάθε κομμάτι συνεχίζουμε μόνο
+            # με όσα σημεία παραμένουν αδιευκρίνιστα, όπως το πρόωρο break της sky_query_sorted.
+            alive = np.arange(len(block))
+            for start in range(0, len(others), 64):
+                if not len(alive):
+                    break
+                chunk = others[start:start + 64]
+                rows = block[alive]
+                le = (chunk[None, :, :] <= rows[:, None, :]).all(axis=2)
+                lt = (chunk[None, :, :] < rows[:, None, :]).any(axis=2)
+                alive = alive[~(le & lt).any(axis=1)]
+            return alive
+
+        for start in range(0, len(sorted_matrix), block_size):
+            block = sorted_matrix[start:start + block_size]
+            block_idx = order[start:start + block_size]
+
+            # Πρώτα φιλτράρουμε με το ήδη γνωστό Skyline, μετά συγκρίνουμε μόνο όσα επέζησαν
+            keep = undominated(block, skyline_matrix)
+            block, block_idx = block[keep], block_idx[keep]
+
+            keep = undominated(block, block)
+            skyline_idx.extend(block_idx[keep].tolist())
+            skyline_matrix = np.vstack([skyline_matrix, block[keep]])
+
+        skyline_points = [data[idx] for idx in skyline_idx]
+
+        elapsed_time = time.perf_counter() - start_time
+
+        stats_str = (
+            "[SkylineQuery Vectorised] Στατιστικά:\n"
+            f" • Διαστάσεις: {dims}\n"
+            f" • Συνολικά αντικείμενα: {len(data)}\n"
+            f" • Μέγεθος μπλοκ: {block_size}\n"
+            f" • Σημεία Skyline: {len(skyline_points)}\n"
+            f" • Χρόνος εκτέλεσης: {elapsed_time:.6f} δευτερόλεπτα."
+        )
+
+        print(stats_str)
+        return skyline_points, stats_str
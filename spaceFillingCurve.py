@@ -0,0 +1,88 @@
+# spaceFillingCurve.py
+
+class SpaceFillingCurve:
+    """
+    Καμπύλες πλήρωσης χώρου (space-filling curves) για τη διάταξη κελιών και αντικειμένων
+    του Grid. Μια καμπύλη αντιστοιχίζει κάθε κελί (i, j) ενός πλέγματος 2^bits x 2^bits
+    σε έναν ακέραιο (key). Ταξινομώντας κατά key, κελιά (και αντικείμενα) που είναι
+    κοντά στον χώρο βρίσκονται συνήθως κοντά και στη σειρά επεξεργασίας / αποθήκευσης.
+
+    Υποστηριζόμενες καμπύλες:
+      - 'row':     γραμμή-προς-γραμμή (i, j), η αρχική σειρά του Grid.
+      - 'z':       Z-order (Morton), με εναλλαγή (interleaving) των bits των i, j.
+      - 'hilbert': καμπύλη Hilbert, που διατηρεί καλύτερα τη γειτνίαση (χωρίς "άλματα").
+    """
+
+    CURVES = ('row', 'z', 'hilbert')
+
+    @staticmethod
+    def row_key(i, j, bits):
+        """
+        :return: Το key της γραμμή-προς-γραμμή διάταξης.
+        """
+        return (i << bits) | j
+
+    @staticmethod
+    def z_key(i, j, bits):
+        """
+        Υπολογίζει το Z-order (Morton) key, εναλλάσσοντας τα bits των i και j.
+
+        :param i: Δείκτης στον άξονα x (0 .. 2^bits - 1).
+        :param j: Δείκτης στον άξονα y (0 .. 2^bits - 1).
+        :param bits: Πλήθος bits ανά άξονα.
+        :return: Ακέραιο key.
+        """
+        key = 0
+        for b in range(bits):
+            key |= ((i >> b) & 1) << (2 * b + 1)
+            key |= ((j >> b) & 1) << (2 * b)
+        return key
+
+    @staticmethod
+    def hilbert_key(i, j, bits):
+        """
+        Υπολογίζει τη θέση του (i, j) πάνω στην καμπύλη Hilbert τάξης bits
+        (κλασικός αλγόριθμος xy2d με περιστροφές ανά τεταρτημόριο).
+
+        :param i: Δείκτης στον άξονα x (0 .. 2^bits - 1).
+        :param j: Δείκτης στον άξονα y (0 .. 2^bits - 1).
+        :param bits: Πλήθος bits ανά άξονα.
+        :return: Ακέραιο key.
+        """
+        n = 1 << bits
+        key = 0
+        s = n >> 1
+        while s > 0:
+            rx = 1 if i & s else 0
+            ry = 1 if j & s else 0
+            key += s * s * ((3 * rx) ^ ry)
+            # Περιστροφή του τεταρτημορίου ώστε η υπο-καμπύλη να έχει τον σωστό προσανατολισμό
+            if ry == 0:
+                if rx == 1:
+                    i = n - 1 - i
+                    j = n - 1 - j
+                i, j = j, i
+            s >>= 1
+        return key
+
+    @staticmethod
+    def key_function(curve):
+        """
+        :param curve: Όνομα καμπύλης ('row', 'z' ή 'hilbert').
+        :return: Συνάρτηση key(i, j, bits).
+        """
+        if curve == 'z':
+            return SpaceFillingCurve.z_key
+        if curve == 'hilbert':
+            return SpaceFillingCurve.hilbert_key
+        if curve == 'row':
+            return SpaceFillingCurve.row_key
+        raise ValueError(f"Άγνωστη καμπύλη '{curve}'. Επιτρεπτές: {SpaceFillingCurve.CURVES}")
+
+    @staticmethod
+    def bits_for(m):
+        """
+        :param m: Πλήθος κελιών ανά άξονα.
+        :return: Το ελάχιστο πλήθος bits ώστε 2^bits >= m (τουλάχιστον 1).
+        """
+        return max(1, (m - 1).bit_length())
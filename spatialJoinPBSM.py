@@ -3,6 +3,7 @@
 import time
 from grid import Grid
 from MBR import MBR
+from joinSink import ListSink
 
 class SpatialJoinPBSM:
     """
@@ -22,18 +23,92 @@ class SpatialJoinPBSM:
                      στο grid.datasets (π.χ. μετά από grid.load(...)).
         """
         self.grid = grid
-        self.results = set()  # Αποθηκεύουμε ζεύγη (a,b) σε set για να αποφύγουμε διπλοτύπους
+        self.results = []
+        self.skipped_cells = 0
+        self.processed_cells = 0
+        self.pairs_checked = 0
 
-    def execute_join(self):
+    def active_cells(self):
+        """
+        Generator που επιστρέφει τα κελιά με αντικείμενα και από τα δύο σύνολα,
+        ως (i, j, objects_A, objects_B), ενημερώνοντας τους μετρητές
+        self.skipped_cells και self.processed_cells.
+
+        :return: Generator από tuples (i, j, objects_A, objects_B).
+        """
+        self.skipped_cells = 0
+        self.processed_cells = 0
+
+        for i, j, cell in self.grid.iter_cells():
+            objects_A = cell.objects.get('A', [])
+            objects_B = cell.objects.get('B', [])
+
+            # Αν δεν υπάρχουν αντικείμενα A ή B στο κελί, το παραλείπουμε
+            if not objects_A or not objects_B:
+                self.skipped_cells += 1
+                continue
+
+            self.processed_cells += 1
+            yield i, j, objects_A, objects_B
+
+    def join_cell(self, i, j, objects_A, objects_B, emit):
+        """
+        Ελέγχει όλα τα ζεύγη (a, b) ενός κελιού και καλεί emit(a, b) για όσα τέμνονται.
+        Κοινός πυρήνας των iter_join και execute_join.
+
+        Επειδή ένα MBR μπορεί να ανήκει σε πολλά κελιά, το ίδιο ζεύγος μπορεί να
+        εντοπιστεί σε περισσότερα από ένα κελιά. Αντί για set διπλοτύπων (που θα
+        κρατούσε όλα τα ζεύγη στη μνήμη), εφαρμόζουμε τον κανόνα του reference point:
+        το ζεύγος δίνεται μόνο στο κελί (i, j) που περιέχει την κάτω-αριστερή γωνία
+        της τομής τους. Ο έλεγχος γίνεται με δύο συγκρίσεις ακεραίων δεικτών, χωρίς tuples.
+
+        :param i: Δείκτης στήλης του κελιού.
+        :param j: Δείκτης γραμμής του κελιού.
+        :param objects_A: Τα αντικείμενα A του κελιού.
+        :param objects_B: Τα αντικείμενα B του κελιού.
+        :param emit: Συνάρτηση emit(a, b) (π.χ. JoinSink.emit).
+        """
+        axis_index = Grid.axis_index
+        xL, yL, xU, yU, m = self.grid.xL, self.grid.yL, self.grid.xU, self.grid.yU, self.grid.m
+        for a in objects_A:
+            for b in objects_B:
+                if (a.intersects(b)
+                        and axis_index(max(a.xmin, b.xmin), xL, xU, m) == i
+                        and axis_index(max(a.ymin, b.ymin), yL, yU, m) == j):
+                    emit(a, b)
+        self.pairs_checked += len(objects_A) * len(objects_B)
+
+    def iter_join(self):
+        """
+        Generator που επιστρέφει ένα-ένα τα ζεύγη (a, b) που τέμνονται (βλ. join_cell).
+        Στη μνήμη κρατούνται μόνο τα ζεύγη ενός κελιού κάθε φορά. Οι μετρητές
+        στατιστικών ενημερώνονται στα self.skipped_cells, self.processed_cells
+        και self.pairs_checked.
+
+        :return: Generator από tuples (a, b).
+        """
+        self.pairs_checked = 0
+
+        pairs = []
+
+        def emit(a, b):
+            pairs.append((a, b))
+
+        for i, j, objects_A, objects_B in self.active_cells():
+            self.join_cell(i, j, objects_A, objects_B, emit)
+            yield from pairs
+            pairs.clear()
+
+    def execute_join(self, sink=None, progress=None):
         """
         Εκτελεί τον Spatial Join με τον αλγόριθμο PBSM, ακολουθώντας τα εξής βήματα:
 
         1. Ελέγχουμε αν υπάρχουν τα datasets 'A' και 'B' στο self.grid (αλλιώς δε μπορούμε να προχωρήσουμε).
-        2. Διατρέχουμε κάθε κελί (Cell) του πλέγματος (grid):
+        2. Διατρέχουμε κάθε κελί (Cell) του πλέγματος (grid) μέσω της active_cells():
            - Λαμβάνουμε τα αντικείμενα A (π.χ. cell.objects['A']) και τα αντικείμενα B (cell.objects['B']).
            - Αν ένα από τα δύο σύνολα είναι άδειο, παρακάμπτουμε το κελί (skipped cells).
-           - Αλλιώς, με έναν διπλό βρόχο ελέγχουμε για κάθε (a, b) αν a.intersects(b). 
-             Αν ναι, καταχωρίζουμε το ζεύγος (a, b) στη λίστα αποτελεσμάτων.
+           - Αλλιώς, η join_cell ελέγχει με διπλό βρόχο κάθε (a, b) αν a.intersects(b).
+             Αν ναι (και το κελί είναι το reference cell του ζεύγους), στέλνουμε το (a, b) στο sink.
         3. Υπολογίζουμε τον χρόνο εκτέλεσης και δημιουργούμε μια συμβολοσειρά στατιστικών (stats_str)
            που περιλαμβάνει:
              - #συνολικών κελιών
@@ -43,64 +118,66 @@ class SpatialJoinPBSM:
              - #ζευγών που βρέθηκαν να τέμνονται
              - χρόνο εκτέλεσης
         4. Επιστρέφουμε:
-            - Μια λίστα από μοναδικά ζεύγη (a, b) (αφού έχουμε χρησιμοποιήσει set στο self.results)
+            - Μια λίστα από μοναδικά ζεύγη (a, b), ή ό,τι επιστρέφει το sink.result()
             - Τη συμβολοσειρά stats_str με την αναφορά στατιστικών.
 
-        :return: Ένα tuple (results_list, stats_str), όπου:
-            results_list: λίστα ζευγών (a, b) που τέμνονται
+        :param sink: (Προαιρετικά) ένα JoinSink που δέχεται τα ζεύγη, π.χ. CSVPairSink
+                     (εγγραφή σε αρχείο), CountSink (μόνο πλήθος) ή AggregateSink
+                     (πλήθος/εμβαδόν ανά αντικείμενο A). Αν δεν δοθεί, τα ζεύγη
+                     κρατούνται σε λίστα (self.results).
+        :param progress: (Προαιρετικά) callback progress(done, total) με τα ενεργά κελιά
+                         (με αντικείμενα A και B) που εξετάστηκαν / συνολικά ενεργά κελιά
+                         (βλ. jobRunner.Job.report).
+        :return: Ένα tuple (results, stats_str), όπου:
+            results: λίστα ζευγών (a, b) που τέμνονται (ή το sink.result())
             stats_str: κείμενο με τις μετρήσεις και το χρόνο εκτέλεσης
         """
         # 0. Έλεγχος για την ύπαρξη των datasets 'A', 'B'
         if 'A' not in self.grid.datasets or 'B' not in self.grid.datasets:
             msg = "[SpatialJoinPBSM] Τα σύνολα 'A' και 'B' πρέπει να φορτωθούν πριν εκτελεστεί ο Spatial Join."
             print(msg)
+            if sink is not None:
+                sink.close()
+                return sink.result(), msg
             return [], msg
 
+        if sink is None:
+            self.results = []
+            sink = ListSink(self.results)
+
         start_time = time.time()  # Έναρξη μέτρησης χρόνου
 
-        # Προετοιμάζουμε μετρητές στατιστικών
+        # Η join_cell καλεί απευθείας το sink.emit (χωρίς το generator της iter_join),
+        # ώστε σε λειτουργίες μέτρησης (CountSink, AggregateSink) να μη δημιουργούνται
+        # tuples ζευγών.
         total_cells = self.grid.m * self.grid.m
-        skipped_cells = 0
-        processed_cells = 0
-        pairs_checked = 0
-
-        # Διατρέχουμε όλα τα κελιά στο grid
-        for i in range(self.grid.m):
-            for j in range(self.grid.m):
-                cell = self.grid.cells[i][j]
-
-                objects_A = cell.objects.get('A', [])
-                objects_B = cell.objects.get('B', [])
-
-                # Αν δεν υπάρχουν αντικείμενα A ή B στο κελί, το παραλείπουμε
-                if not objects_A or not objects_B:
-                    skipped_cells += 1
-                    continue
-
-                # Διαφορετικά, επεξεργαζόμαστε το κελί
-                processed_cells += 1
-
-                # Διπλός βρόχος για κάθε ζεύγος (a, b)
-                for a in objects_A:
-                    for b in objects_B:
-                        pairs_checked += 1
-                        if a.intersects(b):
-                            self.results.add((a, b))
+        active_total = 0
+        if progress:
+            active_total = sum(1 for _, _, cell in self.grid.iter_cells()
+                               if cell.objects.get('A') and cell.objects.get('B'))
+        self.pairs_checked = 0
+        for done, (i, j, objects_A, objects_B) in enumerate(self.active_cells()):
+            if progress:
+                progress(done, active_total)
+            self.join_cell(i, j, objects_A, objects_B, sink.emit)
+        sink.close()
+        if progress:
+            progress(active_total, active_total)
 
         # Υπολογισμός χρόνου εκτέλεσης
         elapsed = time.time() - start_time
 
         # Δημιουργία αναφοράς στατιστικών
-        join_count = len(self.results)
+        join_count = sink.count
         stats_str = (
             "[SpatialJoinPBSM] Στατιστικά:\n"
             f" • Συνολικά κελιά στο grid: {total_cells}\n"
-            f" • Παραλείφθηκαν (skipped) κελιά: {skipped_cells}\n"
-            f" • Επεξεργαστήκαμε κελιά: {processed_cells}\n"
-            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {pairs_checked}\n"
+            f" • Παραλείφθηκαν (skipped) κελιά: {self.skipped_cells}\n"
+            f" • Επεξεργαστήκαμε κελιά: {self.processed_cells}\n"
+            f" • Συνολικά ζεύγη (A,B) εξετάστηκαν: {self.pairs_checked}\n"
             f" • Τελικά ζεύγη που τέμνονται: {join_count}\n"
             f" • Χρόνος εκτέλεσης: {elapsed:.4f} δευτερόλεπτα.\n"
         )
 
         print(stats_str)
-        return list(self.results), stats_str
+        return sink.result(), stats_str
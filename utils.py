@@ -1,14 +1,99 @@
 # utils.py
 
+import io
 import math
+import os
+from MBR import MBR
 
 class Utils:
     """
     Κλάση με στατικές βοηθητικές συναρτήσεις για γεωμετρικές/μαθηματικές πράξεις,
     όπως υπολογισμός τετραγωνικής απόστασης μεταξύ σημείων και ελάχιστης
-    απόστασης σημείου-MBR.
+    απόστασης σημείου-MBR, καθώς και για την ανάγνωση MBRs από CSV.
     """
 
+    @staticmethod
+    def read_mbrs(source):
+        """
+        Διαβάζει MBRs από CSV (ID,xmin,ymin,xmax,ymax[,attr_1,...]) με επικεφαλίδα.
+        Η πηγή μπορεί να είναι:
+          - όνομα αρχείου (str / os.PathLike),
+          - bytes / bytearray / memoryview (π.χ. το περιεχόμενο ενός upload),
+          - ανοιχτό file-like αντικείμενο, κειμένου ή δυαδικό (διαβάζεται από την τρέχουσα θέση).
+        Έτσι ένα upload αναλύεται απευθείας από τη μνήμη, χωρίς προσωρινό αρχείο.
+
+        - Παραλείπει γραμμές με διαφορετικό πλήθος πεδίων από την επικεφαλίδα.
+        - Αγνοεί γραμμές όπου xmin>xmax ή ymin>ymax, ή εφόσον δεν
+          μπορούν να μετατραπούν σε float.
+        - Αν η επικεφαλίδα έχει επιπλέον στήλες (π.χ. price,rating), κάθε MBR
+          παίρνει attrs = (xmin, ymin, price, rating, ...).
+
+        :param source: Η πηγή του CSV.
+        :return: Tuple (data, extra_names): λίστα MBR και τα ονόματα των επιπλέον στηλών.
+        :raises FileNotFoundError: Αν δόθηκε όνομα αρχείου που δεν υπάρχει.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'r') as file:
+                return Utils.parse_mbr_lines(file)
+
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = io.BytesIO(source)
+        if isinstance(source.read(0), str):
+            return Utils.parse_mbr_lines(source)
+
+        # Δυαδικό file-like: αποκωδικοποίηση γραμμή-γραμμή, χωρίς αντίγραφο όλου του περιεχομένου
+        text = io.TextIOWrapper(source, encoding='utf-8', newline=None)
+        try:
+            return Utils.parse_mbr_lines(text)
+        finally:
+            text.detach()  # Να μην κλείσει το αρχικό αντικείμενο (π.χ. upload του Streamlit)
+
+    @staticmethod
+    def source_name(source):
+        """
+        :return: Όνομα της πηγής της read_mbrs για μηνύματα (όνομα αρχείου ή περιγραφή buffer).
+        """
+        if isinstance(source, (str, os.PathLike)):
+            return str(source)
+        return getattr(source, 'name', f"<{type(source).__name__}>")
+
+    @staticmethod
+    def parse_mbr_lines(lines):
+        """
+        Αναλύει τις γραμμές ενός CSV MBRs (βλ. read_mbrs).
+
+        :param lines: Iterable από γραμμές κειμένου (η πρώτη είναι η επικεφαλίδα).
+        :return: Tuple (data, extra_names).
+        """
+        lines = iter(lines)
+        header = next(lines, None)  # Παράκαμψη επικεφαλίδας, αν υπάρχει
+        header_parts = header.strip().split(',') if header else []
+        columns = max(5, len(header_parts))
+        extra_names = header_parts[5:]
+
+        data = []
+        for line in lines:
+            parts = line.strip().split(',')
+            if len(parts) != columns:
+                continue  # Αγνόηση μη έγκυρων γραμμών
+
+            id_str, xmin_str, ymin_str, xmax_str, ymax_str = parts[:5]
+            try:
+                xmin = float(xmin_str)
+                ymin = float(ymin_str)
+                xmax = float(xmax_str)
+                ymax = float(ymax_str)
+
+                if xmin > xmax or ymin > ymax:
+                    continue
+                attrs = (xmin, ymin, *map(float, parts[5:])) if extra_names else None
+                data.append(MBR(id_str, xmin, ymin, xmax, ymax, attrs))
+            except ValueError:
+                # Αγνοούμε γραμμή αν δεν μετατρέπεται σε float
+                continue
+
+        return data, extra_names
+
     @staticmethod
     def squared_distance(x1, y1, x2, y2):
         """
@@ -50,3 +135,21 @@ class Utils:
         dx = max(mbr.xmin - x, 0, x - mbr.xmax)
         dy = max(mbr.ymin - y, 0, y - mbr.ymax)
         return dx**2 + dy**2
+
+    @staticmethod
+    def mindist_mbr_squared(r, s):
+        """
+        Υπολογίζει την ελάχιστη τετραγωνική απόσταση μεταξύ δύο MBRs, δηλαδή
+        το τετράγωνο της απόστασης των πλησιέστερων σημείων τους.
+
+        * Αν τα MBRs τέμνονται, η απόσταση είναι 0.
+        * Σε κάθε άξονα, η απόσταση είναι το κενό ανάμεσα στα δύο διαστήματα
+          (ή 0 αν επικαλύπτονται).
+
+        :param r: Το πρώτο MBR.
+        :param s: Το δεύτερο MBR.
+        :return: Η ελάχιστη τετραγωνική απόσταση (float).
+        """
+        dx = max(s.xmin - r.xmax, 0, r.xmin - s.xmax)
+        dy = max(s.ymin - r.ymax, 0, r.ymin - s.ymax)
+        return dx**2 + dy**2